@@ -0,0 +1,88 @@
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from data_structures import DroneMission
+from recurring import RecurringMission
+
+# (t_start, t_end, x_min, x_max, y_min, y_max) of a mission
+MissionExtent = Tuple[float, float, float, float, float, float]
+
+# Called as listener(event, mission, version) with event "added" or "removed"
+ScheduleListener = Callable[[str, DroneMission, int], None]
+
+
+def mission_extent(mission: DroneMission) -> MissionExtent:
+    """
+    Time span and horizontal bounding box of a mission's waypoints (and so of its whole
+    path). A RecurringMission spans all its repetitions, which share one route.
+    """
+    if isinstance(mission, RecurringMission):
+        _, xs, ys, _ = mission.track
+        return mission.get_start_time(), mission.get_end_time(), xs.min(), xs.max(), ys.min(), ys.max()
+    xs = [wp.x for wp in mission.waypoints]
+    ys = [wp.y for wp in mission.waypoints]
+    return mission.get_start_time(), mission.get_end_time(), min(xs), max(xs), min(ys), max(ys)
+
+
+def extents_overlap(a: MissionExtent, b: MissionExtent, margin: float = 0.0, time_margin: float = 1e-6) -> bool:
+    """True if two extents come within `margin` horizontally and `time_margin` in time."""
+    return (a[0] <= b[1] + time_margin and b[0] <= a[1] + time_margin and
+            a[2] <= b[3] + margin and b[2] <= a[3] + margin and
+            a[4] <= b[5] + margin and b[4] <= a[5] + margin)
+
+
+class AirspaceSchedule:
+    """
+    The set of accepted missions, keyed by drone id, with a version counter that
+    increases on every change. Listeners are told about each added or removed mission.
+    """
+    def __init__(self, missions: Optional[List[DroneMission]] = None):
+        self._missions: Dict[str, DroneMission] = {}
+        self._listeners: List[ScheduleListener] = []
+        self.version = 0
+        for mission in missions or []:
+            self.add(mission)
+
+    def __len__(self) -> int:
+        return len(self._missions)
+
+    def __iter__(self) -> Iterator[DroneMission]:
+        return iter(list(self._missions.values()))
+
+    def __contains__(self, drone_id: str) -> bool:
+        return drone_id in self._missions
+
+    @property
+    def missions(self) -> List[DroneMission]:
+        """The accepted missions, in acceptance order."""
+        return list(self._missions.values())
+
+    def get(self, drone_id: str) -> Optional[DroneMission]:
+        return self._missions.get(drone_id)
+
+    def add(self, mission: DroneMission) -> int:
+        """Accepts a mission, replacing any earlier one of the same drone. Returns the new version."""
+        if mission.drone_id in self._missions:
+            self.remove(mission.drone_id)
+        self._missions[mission.drone_id] = mission
+        self.version += 1
+        self._notify("added", mission)
+        return self.version
+
+    def remove(self, drone_id: str) -> DroneMission:
+        """Withdraws a drone's mission and returns it."""
+        if drone_id not in self._missions:
+            raise KeyError(f"No mission scheduled for drone '{drone_id}'.")
+        mission = self._missions.pop(drone_id)
+        self.version += 1
+        self._notify("removed", mission)
+        return mission
+
+    def subscribe(self, listener: ScheduleListener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: ScheduleListener) -> None:
+        self._listeners.remove(listener)
+
+    def _notify(self, event: str, mission: DroneMission) -> None:
+        for listener in list(self._listeners):
+            listener(event, mission, self.version)
@@ -0,0 +1,179 @@
+import numpy as np
+from typing import List, Optional, Sequence, Tuple, Dict, Union
+
+from data_structures import DroneMission
+from recurring import RecurringMission
+
+# (t_start, t_end, z_min, z_max) arrays, one entry per mission segment
+AltitudeBounds = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def segment_altitude_bounds(mission: DroneMission) -> Optional[AltitudeBounds]:
+    """
+    Returns the time span and altitude range of every segment of a mission.
+    Returns None if any waypoint lacks an altitude: such missions can get a
+    "2D proximity" conflict at any altitude, so they can never be pruned.
+    A RecurringMission is one span over all its repetitions with the template's altitude range.
+    """
+    if isinstance(mission, RecurringMission):
+        zs = mission.track[3]
+        if np.isnan(zs).any():
+            return None
+        return (np.array([mission.get_start_time()]), np.array([mission.get_end_time()]),
+                np.array([zs.min()]), np.array([zs.max()]))
+    wps = mission.waypoints
+    if any(wp.z is None for wp in wps):
+        return None
+    ts = np.fromiter((wp.timestamp for wp in wps), dtype=float, count=len(wps))
+    zs = np.fromiter((wp.z for wp in wps), dtype=float, count=len(wps))
+    if len(wps) == 1:
+        return ts, ts, zs, zs
+    return ts[:-1], ts[1:], np.minimum(zs[:-1], zs[1:]), np.maximum(zs[:-1], zs[1:])
+
+
+def is_altitude_separated(primary_bounds: AltitudeBounds, other_bounds: AltitudeBounds, min_vertical_gap: float) -> bool:
+    """
+    True if, whenever the two missions fly at the same time, their altitude ranges are
+    at least `min_vertical_gap` apart. Compares every pair of time-overlapping segments.
+    """
+    p_t0, p_t1, p_zlo, p_zhi = (b[:, None] for b in primary_bounds)
+    o_t0, o_t1, o_zlo, o_zhi = (b[None, :] for b in other_bounds)
+    overlapping = (p_t0 <= o_t1 + 1e-6) & (o_t0 <= p_t1 + 1e-6)
+    vertical_gap = np.maximum(o_zlo - p_zhi, p_zlo - o_zhi)
+    return not np.any(overlapping & (vertical_gap < min_vertical_gap))
+
+
+def _altitude_track(mission: DroneMission) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    (timestamps, altitudes) of a mission's waypoints, or None if any lacks an altitude.
+    A RecurringMission is a ramp from its lowest to its highest altitude over all its
+    repetitions, which callers must not interpolate.
+    """
+    if isinstance(mission, RecurringMission):
+        zs = mission.track[3]
+        if np.isnan(zs).any():
+            return None
+        return np.array([mission.get_start_time(), mission.get_end_time()]), np.array([zs.min(), zs.max()])
+    wps = mission.waypoints
+    if any(wp.z is None for wp in wps):
+        return None
+    return (np.fromiter((wp.timestamp for wp in wps), dtype=float, count=len(wps)),
+            np.fromiter((wp.z for wp in wps), dtype=float, count=len(wps)))
+
+
+def filter_altitude_separated(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    min_vertical_gap: Union[float, Sequence[float]]
+) -> List[DroneMission]:
+    """
+    Drops the missions that stay at least `min_vertical_gap` above or below the primary
+    for as long as both are flying. The gap may also be given per mission.
+    Keeps the order of `other_drone_schedules`.
+    Each mission's altitude range over the primary's flight time (its segments clipped
+    to that window) is compared with the primary's altitude range, in one vectorized
+    pass over all segments.
+    """
+    primary_bounds = segment_altitude_bounds(primary_mission)
+    if primary_bounds is None or not other_drone_schedules:
+        return list(other_drone_schedules)
+    window_start, window_end = primary_bounds[0].min() - 1e-6, primary_bounds[1].max() + 1e-6
+    primary_low, primary_high = primary_bounds[2].min(), primary_bounds[3].max()
+
+    tracks = [_altitude_track(m) for m in other_drone_schedules]
+    prunable = np.array([track is not None for track in tracks])
+    owner, t0, t1, z0, z1, ramp = [], [], [], [], [], []
+    for idx, track in enumerate(tracks):
+        if track is None:
+            continue
+        ts, zs = track
+        first, last = (slice(None, -1), slice(1, None)) if len(ts) > 1 else (slice(None), slice(None))
+        owner.append(np.full(len(ts[first]), idx))
+        t0.append(ts[first])
+        t1.append(ts[last])
+        z0.append(zs[first])
+        z1.append(zs[last])
+        ramp.append(np.full(len(ts[first]), isinstance(other_drone_schedules[idx], RecurringMission)))
+    low = np.full(len(tracks), np.inf)
+    high = np.full(len(tracks), -np.inf)
+    if owner:
+        owner, t0, t1, z0, z1, ramp = map(np.concatenate, (owner, t0, t1, z0, z1, ramp))
+        overlapping = (t0 <= window_end) & (window_start <= t1)
+        owner, t0, t1, z0, z1, ramp = (a[overlapping] for a in (owner, t0, t1, z0, z1, ramp))
+        # Altitudes at the ends of each segment's part inside the primary's window
+        duration = t1 - t0
+        safe_duration = np.where(duration > 0, duration, 1.0)
+        interpolate = (duration > 0) & ~ramp
+        clipped = []
+        for t in (np.maximum(t0, window_start), np.minimum(t1, window_end)):
+            fraction = np.clip((t - t0) / safe_duration, 0.0, 1.0)
+            clipped.append(np.where(interpolate, z0 + fraction * (z1 - z0), np.nan))
+        seg_low = np.where(interpolate, np.minimum(*clipped), np.minimum(z0, z1))
+        seg_high = np.where(interpolate, np.maximum(*clipped), np.maximum(z0, z1))
+        np.minimum.at(low, owner, seg_low)
+        np.maximum.at(high, owner, seg_high)
+
+    # Missions never flying with the primary have an empty range and are always separated
+    gaps = np.broadcast_to(np.asarray(min_vertical_gap, dtype=float), (len(tracks),))
+    separated = prunable & ((low - primary_high >= gaps) | (primary_low - high >= gaps))
+    return [m for m, drop in zip(other_drone_schedules, separated.tolist()) if not drop]
+
+
+class AltitudeBandIndex:
+    """
+    Indexes missions by the altitude bands they occupy, for repeated queries against
+    the same schedule set. A query only looks at missions in the bands within
+    `min_vertical_gap` of the primary's altitude range, then confirms separation
+    segment by segment. Missions without full altitude data are always returned.
+    """
+    def __init__(self, missions: List[DroneMission], band_height: float):
+        if band_height <= 0:
+            raise ValueError("Altitude band height must be positive.")
+        self.band_height = float(band_height)
+        self.missions = list(missions)
+        self._bounds: List[Optional[AltitudeBounds]] = []
+        self._bands: Dict[int, List[int]] = {}
+        self._unbanded: List[int] = [] # Missions with 2D waypoints: never prunable
+
+        for idx, mission in enumerate(self.missions):
+            bounds = segment_altitude_bounds(mission)
+            self._bounds.append(bounds)
+            if bounds is None:
+                self._unbanded.append(idx)
+                continue
+            for band in range(self._band_of(bounds[2].min()), self._band_of(bounds[3].max()) + 1):
+                self._bands.setdefault(band, []).append(idx)
+
+    def _band_of(self, z: float) -> int:
+        return int(np.floor(z / self.band_height))
+
+    @property
+    def band_count(self) -> int:
+        return len(self._bands)
+
+    def candidates(self, primary_mission: DroneMission, min_vertical_gap: float) -> List[DroneMission]:
+        """
+        Returns the indexed missions that may come within `min_vertical_gap` of the primary
+        vertically, in index order. The primary's own drone id is not filtered out.
+        """
+        primary_bounds = segment_altitude_bounds(primary_mission)
+        if primary_bounds is None:
+            return list(self.missions)
+
+        low_band = self._band_of(primary_bounds[2].min() - min_vertical_gap)
+        high_band = self._band_of(primary_bounds[3].max() + min_vertical_gap)
+        if high_band - low_band < len(self._bands):
+            bands = range(low_band, high_band + 1)
+        else:
+            bands = [band for band in self._bands if low_band <= band <= high_band]
+
+        nearby = set(self._unbanded)
+        seen = set()
+        for band in bands:
+            for idx in self._bands.get(band, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                if not is_altitude_separated(primary_bounds, self._bounds[idx], min_vertical_gap):
+                    nearby.add(idx)
+        return [self.missions[idx] for idx in sorted(nearby)]
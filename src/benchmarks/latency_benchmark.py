@@ -0,0 +1,137 @@
+"""
+Rejection latency benchmark: time until a conflicting mission is rejected, with the
+full check (find_conflicts) and with find_first_conflict in schedule and likelihood
+order, as a latency distribution over random rejected queries.
+
+Run from src/:
+    python -m benchmarks.latency_benchmark                 # print the table
+    python -m benchmarks.latency_benchmark --save          # also write the baseline
+    python -m benchmarks.latency_benchmark --compare       # compare against the baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts
+from first_conflict import find_first_conflict
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "latency.json")
+DEFAULT_FLEET_SIZE = 500
+DEFAULT_QUERIES = 40
+AREA_SIZE = 3000.0 # Side of the square the fleet flies in (m)
+TIME_SPAN = 1800.0 # Window in which missions start (s)
+PERCENTILES = (50, 90, 99, 100)
+REGRESSION_TOLERANCE = 0.5 # Relative growth of a percentile reported as a regression by --compare
+
+
+def random_fleet(rng: random.Random, size: int) -> List[DroneMission]:
+    """Short multi-leg missions at random places and times, with altitudes between 30 and 90 m."""
+    fleet = []
+    for i in range(size):
+        t, x, y = rng.uniform(0.0, TIME_SPAN), rng.uniform(0.0, AREA_SIZE), rng.uniform(0.0, AREA_SIZE)
+        waypoints = [Waypoint(x, y, t, rng.uniform(30.0, 90.0))]
+        for _ in range(rng.randint(1, 4)):
+            x, y, t = x + rng.uniform(-500.0, 500.0), y + rng.uniform(-500.0, 500.0), t + rng.uniform(30.0, 120.0)
+            waypoints.append(Waypoint(x, y, t, rng.uniform(30.0, 90.0)))
+        fleet.append(DroneMission(waypoints, f"D{i}"))
+    return fleet
+
+
+def random_primary(rng: random.Random) -> PrimaryDroneMission:
+    start = rng.uniform(0.0, TIME_SPAN)
+    coords = [(rng.uniform(0.0, AREA_SIZE), rng.uniform(0.0, AREA_SIZE), rng.uniform(30.0, 90.0)) for _ in range(4)]
+    return PrimaryDroneMission(coords, start, start + 600.0, "Primary")
+
+
+def _timed(check: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    check()
+    return time.perf_counter() - started
+
+
+def run_benchmark(fleet_size: int = DEFAULT_FLEET_SIZE, num_queries: int = DEFAULT_QUERIES,
+                  seed: int = 0) -> Dict[str, Any]:
+    """Rejection latencies (seconds) of each method over `num_queries` conflicting primaries."""
+    rng = random.Random(seed)
+    fleet = random_fleet(rng, fleet_size)
+    methods = {
+        "full_check": lambda primary: find_conflicts(primary, fleet),
+        "first_conflict_schedule": lambda primary: find_first_conflict(primary, fleet, ordering="schedule"),
+        "first_conflict_likelihood": lambda primary: find_first_conflict(primary, fleet, ordering="likelihood"),
+    }
+    latencies: Dict[str, List[float]] = {name: [] for name in methods}
+    attempts = 0
+    while len(latencies["full_check"]) < num_queries and attempts < 50 * num_queries:
+        attempts += 1
+        primary = random_primary(rng)
+        if not find_conflicts(primary, fleet): # Only rejected missions count
+            continue
+        for name, method in methods.items():
+            latencies[name].append(_timed(lambda: method(primary)))
+    return {
+        "fleet_size": fleet_size,
+        "rejected_queries": len(latencies["full_check"]),
+        "queries_tried": attempts,
+        "latency_ms": {name: {f"p{q}": float(np.percentile(values, q)) * 1000.0 if values else None
+                              for q in PERCENTILES}
+                       for name, values in latencies.items()},
+    }
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    print(f"Python {report['python']}, NumPy {report['numpy']}: {report['fleet_size']} drones, "
+          f"{report['rejected_queries']} rejected queries of {report['queries_tried']}")
+    print(f"{'method':>28} | " + " | ".join(f"{'p' + str(q) + ' (ms)':>10}" for q in PERCENTILES))
+    for name, stats in report["latency_ms"].items():
+        print(f"{name:>28} | " + " | ".join(f"{stats[f'p{q}'] or float('nan'):>10.2f}" for q in PERCENTILES))
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                          tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+    """Latency percentiles that grew by more than `tolerance` relative to the baseline."""
+    regressions = []
+    for name, stats in report["latency_ms"].items():
+        base = baseline["latency_ms"].get(name, {})
+        for key, value in stats.items():
+            if value is not None and base.get(key) and value > base[key] * (1 + tolerance):
+                regressions.append(f"{name} {key}: {base[key]:.2f} ms -> {value:.2f} ms")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fleet-size", type=int, default=DEFAULT_FLEET_SIZE, help="Number of scheduled drones")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="Rejected queries to time")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail on latency growth over the baseline")
+    args = parser.parse_args(argv)
+
+    report = dict(python=platform.python_version(), numpy=np.__version__,
+                  **run_benchmark(args.fleet_size, args.queries, args.seed))
+    print_results(report)
+
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(report, json.load(f))
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""
+Memory footprint benchmark: bytes per waypoint, per mission and per conflict across
+fleet sizes, measured with tracemalloc, plus the process RSS after each stage.
+A ConflictSet row is the record size alone; the rest of the retained result (the
+ConflictSet object and its drone id table) is reported as a fixed overhead.
+
+Run from src/:
+    python -m benchmarks.memory_benchmark                  # print the table
+    python -m benchmarks.memory_benchmark --save           # also write the baseline
+    python -m benchmarks.memory_benchmark --compare        # compare against the baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+
+from data_structures import Waypoint, DroneMission
+from conflict_checker import find_conflicts, get_mission_arrays
+from kernels import pack_tracks
+from diagnostics import current_rss_bytes, peak_rss_bytes, measure_allocation
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "memory.json")
+DEFAULT_FLEET_SIZES = (10, 100, 1000)
+DEFAULT_WAYPOINTS = 20
+AREA_SIZE = 2000.0 # Side of the square the fleet flies in (m)
+MISSION_DURATION = 600.0 # Seconds per mission
+REGRESSION_TOLERANCE = 0.25 # Relative growth reported as a regression by --compare
+
+
+def random_waypoint_coords(rng: random.Random, num_waypoints: int) -> List[tuple]:
+    """(x, y, t, z) tuples of a random walk through the area, at evenly spaced times."""
+    times = np.linspace(0.0, MISSION_DURATION, num_waypoints) + rng.uniform(0.0, MISSION_DURATION)
+    return [(rng.uniform(0.0, AREA_SIZE), rng.uniform(0.0, AREA_SIZE), float(t), rng.uniform(30.0, 120.0))
+            for t in times]
+
+
+def benchmark_fleet(num_missions: int, num_waypoints: int = DEFAULT_WAYPOINTS, seed: int = 0) -> Dict[str, Any]:
+    """Builds one fleet stage by stage and returns the retained bytes of each stage."""
+    rng = random.Random(seed)
+    coords = [random_waypoint_coords(rng, num_waypoints) for _ in range(num_missions)]
+    total_waypoints = num_missions * num_waypoints
+
+    waypoint_lists, waypoint_bytes, _ = measure_allocation(
+        lambda: [[Waypoint(x, y, t, z) for x, y, t, z in mission_coords] for mission_coords in coords])
+    # DroneMission keeps a sorted copy of the list: only the copy and the object are new
+    missions, mission_bytes, _ = measure_allocation(
+        lambda: [DroneMission(wps, f"D{i}") for i, wps in enumerate(waypoint_lists)])
+    packed, packed_bytes, _ = measure_allocation(
+        lambda: pack_tracks([get_mission_arrays(m) for m in missions]))
+
+    # The primary crosses the area diagonally through the whole fleet window
+    primary = DroneMission([Waypoint(0.0, 0.0, 0.0, 75.0),
+                            Waypoint(AREA_SIZE, AREA_SIZE, 2 * MISSION_DURATION, 75.0)], "Primary")
+    conflicts, conflict_set_bytes, query_peak_bytes = measure_allocation(lambda: find_conflicts(primary, missions))
+    conflict_dicts, conflict_dict_bytes, _ = measure_allocation(conflicts.to_list)
+    num_conflicts = len(conflicts)
+    record_bytes = conflicts.records.nbytes
+
+    rss = current_rss_bytes()
+    result = {
+        "missions": num_missions,
+        "waypoints_per_mission": num_waypoints,
+        "conflicts": num_conflicts,
+        "bytes_per_waypoint": waypoint_bytes / total_waypoints,
+        "bytes_per_mission": mission_bytes / num_missions,
+        "packed_bytes_per_waypoint": packed_bytes / total_waypoints,
+        "bytes_per_conflict_set_row": record_bytes / num_conflicts if num_conflicts else None,
+        "conflict_set_overhead_bytes": conflict_set_bytes - record_bytes,
+        "bytes_per_conflict_dict": conflict_dict_bytes / num_conflicts if num_conflicts else None,
+        "query_peak_bytes": query_peak_bytes,
+        "rss_bytes": rss,
+    }
+    del waypoint_lists, missions, packed, conflicts, conflict_dicts
+    gc.collect()
+    return result
+
+
+def run_benchmarks(fleet_sizes: Sequence[int] = DEFAULT_FLEET_SIZES,
+                   num_waypoints: int = DEFAULT_WAYPOINTS) -> Dict[str, Any]:
+    results = [benchmark_fleet(size, num_waypoints, seed=size) for size in fleet_sizes]
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "results": results,
+    }
+
+
+def _format(value: Optional[float], unit: str = "") -> str:
+    return "n/a" if value is None else f"{value:,.0f}{unit}"
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    print(f"Python {report['python']}, NumPy {report['numpy']}")
+    header = ("missions", "B/waypoint", "B/mission", "packed B/wp", "conflicts", "B/conflict row",
+              "set overhead", "B/conflict dict", "query peak", "RSS")
+    print(" | ".join(f"{h:>15}" for h in header))
+    for r in report["results"]:
+        row = (str(r["missions"]), _format(r["bytes_per_waypoint"]), _format(r["bytes_per_mission"]),
+               _format(r["packed_bytes_per_waypoint"]), str(r["conflicts"]),
+               _format(r["bytes_per_conflict_set_row"]), _format(r["conflict_set_overhead_bytes"]),
+               _format(r["bytes_per_conflict_dict"]),
+               _format(r["query_peak_bytes"]), _format(r["rss_bytes"]))
+        print(" | ".join(f"{cell:>15}" for cell in row))
+    print(f"Peak RSS: {_format(report['peak_rss_bytes'])} bytes")
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                          tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+    """Per-object figures that grew by more than `tolerance` relative to the baseline run of the same fleet size."""
+    keys = ("bytes_per_waypoint", "bytes_per_mission", "packed_bytes_per_waypoint",
+            "bytes_per_conflict_set_row", "bytes_per_conflict_dict")
+    baseline_by_size = {r["missions"]: r for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        base = baseline_by_size.get(r["missions"])
+        if base is None:
+            continue
+        for key in keys:
+            if r[key] is not None and base.get(key) and r[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{r['missions']} missions: {key} {base[key]:,.0f} -> {r[key]:,.0f}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_FLEET_SIZES), help="Fleet sizes")
+    parser.add_argument("--waypoints", type=int, default=DEFAULT_WAYPOINTS, help="Waypoints per mission")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail on per-object growth over the baseline")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.waypoints)
+    print_results(report)
+
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(report, json.load(f))
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
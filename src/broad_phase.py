@@ -0,0 +1,200 @@
+"""
+Segment-level broad phase of the conflict checker.
+
+Every waypoint-to-waypoint segment is a space-time box. A sweep over the boxes' start
+and end times pairs each primary segment with the other segments it overlaps in time,
+the boxes' spatial extents drop pairs that stay apart, and a closest-approach test on
+the two straight-line motions gives the time window (if any) in which the pair comes
+within separation minima. Only the check times inside those windows need an exact
+evaluation, so the work follows the number of overlapping segment pairs instead of
+mission lengths.
+"""
+import numpy as np
+from typing import Iterator, Tuple
+
+from kernels import PackedTracks, Track, pack_tracks
+
+# The checker treats a drone as active (and as sitting on a waypoint) within 1e-6 s of a
+# waypoint time; boxes and windows are padded by this much
+TIME_TOLERANCE = 1e-6
+# Extra distance on every radius, for round-off between the closed form and the kernel
+DISTANCE_TOLERANCE = 1e-6
+
+
+class SegmentBoxes:
+    """
+    The waypoint-to-waypoint segments of packed tracks with their space-time boxes.
+    A single-waypoint track is one segment of zero duration. A segment without an
+    altitude at both ends has an unbounded vertical extent.
+    """
+    def __init__(self, packed: PackedTracks):
+        offsets, ts, xs, ys, zs = packed
+        lengths = np.diff(offsets)
+        starts = np.ones(len(ts), dtype=bool)
+        starts[offsets[1:][lengths > 0] - 1] = False # Last waypoint of each track...
+        starts[offsets[:-1][lengths == 1]] = True # ...unless it is the only one
+        first = np.flatnonzero(starts)
+        track_of = np.repeat(np.arange(len(lengths)), lengths)
+        last = np.where(lengths[track_of[first]] == 1, first, first + 1)
+
+        self.track = track_of[first]
+        self.t0, self.t1 = ts[first], ts[last]
+        self.p0 = np.column_stack((xs[first], ys[first], zs[first]))
+        self.p1 = np.column_stack((xs[last], ys[last], zs[last]))
+        z_missing_0, z_missing_1 = np.isnan(self.p0[:, 2]), np.isnan(self.p1[:, 2])
+        self.full_z = ~z_missing_0 & ~z_missing_1
+        self.no_z = z_missing_0 & z_missing_1
+        self.moving = self.t1 - self.t0 >= TIME_TOLERANCE
+
+        duration = np.where(self.moving, self.t1 - self.t0, 1.0)
+        self.velocity = np.where(self.moving[:, None], (self.p1 - self.p0) / duration[:, None], 0.0)
+        self.velocity[~self.full_z, 2] = 0.0
+
+        self.start = self.t0 - TIME_TOLERANCE
+        self.end = self.t1 + TIME_TOLERANCE
+        self.low = np.minimum(self.p0, self.p1)
+        self.high = np.maximum(self.p0, self.p1)
+        self.low[~self.full_z, 2] = -np.inf
+        self.high[~self.full_z, 2] = np.inf
+
+    def __len__(self) -> int:
+        return len(self.track)
+
+
+def expand_ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Flattens the index ranges [lo[i], hi[i]) into (i, index) pairs."""
+    counts = np.maximum(hi - lo, 0)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    index = np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, index
+
+
+def sweep_and_prune(starts_a: np.ndarray, ends_a: np.ndarray,
+                    starts_b: np.ndarray, ends_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All pairs (i, j) of overlapping closed intervals [starts_a[i], ends_a[i]] and
+    [starts_b[j], ends_b[j]], as two index arrays.
+    Two intervals overlap exactly when one starts inside the other, so sorting both sets
+    by start and looking up each interval's [start, end] in the other set finds every
+    pair once, in O((n + m) log(n + m) + pairs).
+    """
+    order_b = np.argsort(starts_b, kind='stable')
+    sorted_b = starts_b[order_b]
+    a_first, position = expand_ranges(np.searchsorted(sorted_b, starts_a, side='left'),
+                                       np.searchsorted(sorted_b, ends_a, side='right'))
+    b_first = order_b[position]
+
+    # The b intervals that started strictly before an a interval and are still open
+    order_a = np.argsort(starts_a, kind='stable')
+    sorted_a = starts_a[order_a]
+    b_second, position = expand_ranges(np.searchsorted(sorted_a, starts_b, side='right'),
+                                        np.searchsorted(sorted_a, ends_b, side='right'))
+    a_second = order_a[position]
+    return np.concatenate((a_first, a_second)), np.concatenate((b_first, b_second))
+
+
+def closest_approach(offset: np.ndarray, velocity: np.ndarray,
+                     duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Closest approach of the relative motions offset + velocity * u, u in [0, duration].
+    Returns (u at the closest approach, distance there).
+    """
+    speed2 = (velocity**2).sum(axis=1)
+    safe_speed2 = np.where(speed2 > 0, speed2, 1.0)
+    u = np.where(speed2 > 0, np.clip(-(offset * velocity).sum(axis=1) / safe_speed2, 0.0, duration), 0.0)
+    return u, np.sqrt(((offset + velocity * u[:, None])**2).sum(axis=1))
+
+
+def _within_radius(offset: np.ndarray, velocity: np.ndarray, radius: np.ndarray,
+                   duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    [u_start, u_end] within [0, duration] where |offset + velocity * u| < radius.
+    An empty span has u_start > u_end.
+    """
+    a = (velocity**2).sum(axis=1)
+    b = 2 * (offset * velocity).sum(axis=1)
+    c = (offset**2).sum(axis=1) - radius**2
+    moving = a > 0
+    safe_a = np.where(moving, a, 1.0)
+    disc = b * b - 4 * a * c
+    root = np.sqrt(np.maximum(disc, 0.0))
+    u_start = np.where(moving, np.maximum((-b - root) / (2 * safe_a), 0.0), 0.0)
+    u_end = np.where(moving, np.minimum((-b + root) / (2 * safe_a), duration), duration)
+    u_start[np.where(moving, disc <= 0, c >= 0)] = np.inf
+    return u_start, u_end
+
+
+def candidate_windows(primary_track: Track,
+                      packed: PackedTracks,
+                      buf2: np.ndarray,
+                      buf3: np.ndarray,
+                      vsep: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Time windows in which the primary may conflict with each packed track, as
+    (track index, window start, window end) arrays; thresholds are per-track arrays.
+    Windows are conservative: a conflict at any time outside every window of a track
+    is impossible. They may overlap and are not merged.
+    """
+    primary = SegmentBoxes(pack_tracks([primary_track]))
+    others = SegmentBoxes(packed)
+    seg_p, seg_o = sweep_and_prune(primary.start, primary.end, others.start, others.end)
+    drone = others.track[seg_o]
+
+    # Horizontal reach: any rule needs the drones within the larger buffer, and only the
+    # 2D buffer applies when either segment has no altitude at all. Vertically, both
+    # 3D rules need the drones closer than the larger of the 3D buffer and separation.
+    either_2d = primary.no_z[seg_p] | others.no_z[seg_o]
+    radius = np.where(either_2d, buf2[drone], np.maximum(buf2, buf3)[drone])
+    half_height = np.maximum(buf3, vsep)[drone]
+    # Moving segments are extrapolated up to TIME_TOLERANCE past their ends
+    slack = TIME_TOLERANCE * (np.hypot(primary.velocity[seg_p, 0], primary.velocity[seg_p, 1]) +
+                              np.hypot(others.velocity[seg_o, 0], others.velocity[seg_o, 1])) + DISTANCE_TOLERANCE
+    slack_z = TIME_TOLERANCE * (np.abs(primary.velocity[seg_p, 2]) + np.abs(others.velocity[seg_o, 2])) + DISTANCE_TOLERANCE
+    radius, half_height = radius + slack, half_height + slack_z
+
+    # Space part of the boxes
+    gap = np.maximum(others.low[seg_o] - primary.high[seg_p], primary.low[seg_p] - others.high[seg_o])
+    with np.errstate(invalid='ignore'):
+        near = (gap[:, 0] < radius) & (gap[:, 1] < radius) & ~(gap[:, 2] >= half_height)
+    seg_p, seg_o, drone, radius, half_height = seg_p[near], seg_o[near], drone[near], radius[near], half_height[near]
+
+    # Narrow phase on the common time span of each pair
+    t_start = np.maximum(primary.start[seg_p], others.start[seg_o])
+    t_end = np.minimum(primary.end[seg_p], others.end[seg_o])
+    duration = t_end - t_start
+    offset = (primary.p0[seg_p] + primary.velocity[seg_p] * (t_start - primary.t0[seg_p])[:, None]) - \
+             (others.p0[seg_o] + others.velocity[seg_o] * (t_start - others.t0[seg_o])[:, None])
+    velocity = primary.velocity[seg_p] - others.velocity[seg_o]
+    _, distance = closest_approach(offset[:, :2], velocity[:, :2], duration)
+    u_start, u_end = _within_radius(offset[:, :2], velocity[:, :2], radius, duration)
+
+    # Vertically: the span in which the altitude difference is below the reach
+    vertical = primary.full_z[seg_p] & others.full_z[seg_o]
+    dz, vz = np.nan_to_num(offset[:, 2]), velocity[:, 2]
+    z_start, z_end = _within_radius(dz[:, None], vz[:, None], half_height, duration)
+    u_start = np.where(vertical, np.maximum(u_start, z_start), u_start)
+    u_end = np.where(vertical, np.minimum(u_end, z_end), u_end)
+
+    # A jump between same-time waypoints has no straight-line motion: keep its whole span
+    jump = ~primary.moving[seg_p] | ~others.moving[seg_o]
+    keep = jump | ((distance < radius) & (u_start <= u_end))
+    u_start, u_end = np.where(jump, 0.0, u_start), np.where(jump, duration, u_end)
+    return (drone[keep], t_start[keep] + u_start[keep] - TIME_TOLERANCE,
+            t_start[keep] + u_end[keep] + TIME_TOLERANCE)
+
+
+def window_time_indices(drone: np.ndarray, window_start: np.ndarray, window_end: np.ndarray,
+                        times: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Groups the check times (indices into the increasing `times`) falling inside the
+    windows by drone. Yields (drone index, sorted unique time indices), drones ascending.
+    """
+    owner, k = expand_ranges(np.searchsorted(times, window_start, side='left'),
+                              np.searchsorted(times, window_end, side='right'))
+    if not len(k):
+        return
+    cells = np.unique(drone[owner].astype(np.int64) * len(times) + k)
+    cell_drone, cell_time = np.divmod(cells, len(times))
+    bounds = np.flatnonzero(np.diff(cell_drone)) + 1
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(cells)]))):
+        yield int(cell_drone[start]), cell_time[start:end]
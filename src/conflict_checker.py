@@ -1,6 +1,17 @@
+import math
 import numpy as np
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, TYPE_CHECKING
 from data_structures import DroneMission, Waypoint
+from conflict_set import ConflictSet, TYPE_CODES
+from altitude_index import filter_altitude_separated
+from kernels import interpolate_track, pack_tracks, max_track_speeds, conflict_codes, NO_CONFLICT
+from broad_phase import candidate_windows, window_time_indices
+from recurring import RecurringMission, repetition_conflicts
+from simplification import simplify_missions
+
+if TYPE_CHECKING:
+    from separation import SeparationTable
+    from zones import ZoneIndex
 
 # --- Constants ---
 MINIMUM_DISTANCE_THRESHOLD_2D = 10.0  # meters, for 2D separation
@@ -90,115 +101,445 @@ def calculate_distance(wp1: Waypoint, wp2: Waypoint) -> Tuple[float, Optional[fl
     """
     dx = wp1.x - wp2.x
     dy = wp1.y - wp2.y
-    dist_2d = np.sqrt(dx**2 + dy**2)
+    dist_2d = math.sqrt(dx**2 + dy**2)
     
     dist_3d: Optional[float] = None
     if wp1.z is not None and wp2.z is not None:
         dz = wp1.z - wp2.z
-        dist_3d = np.sqrt(dx**2 + dy**2 + dz**2)
+        dist_3d = math.sqrt(dx**2 + dy**2 + dz**2)
         return dist_2d, dist_3d
     
     return dist_2d, None
 
 
+def get_mission_arrays(mission: DroneMission) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the mission's waypoints as (timestamps, xs, ys, zs) arrays.
+    Missing altitudes are stored as NaN.
+    """
+    wps = mission.waypoints
+    ts = np.fromiter((wp.timestamp for wp in wps), dtype=float, count=len(wps))
+    xs = np.fromiter((wp.x for wp in wps), dtype=float, count=len(wps))
+    ys = np.fromiter((wp.y for wp in wps), dtype=float, count=len(wps))
+    zs = np.fromiter((wp.z if wp.z is not None else np.nan for wp in wps), dtype=float, count=len(wps))
+    return ts, xs, ys, zs
+
+
+def get_positions_at_times(mission: DroneMission, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized counterpart of get_drone_position_at_time.
+    Returns (xs, ys, zs, active) arrays aligned with `times`. Positions where the
+    drone is not active are undefined; missing altitudes are NaN.
+    """
+    return interpolate_track(*get_mission_arrays(mission), np.asarray(times, dtype=float))
+
+
+def get_check_window(primary_mission: DroneMission) -> Tuple[float, float]:
+    """Returns the (start, end) time window over which a primary mission is checked."""
+    if hasattr(primary_mission, 'mission_overall_start_time'):
+        # pylint: disable=no-member
+        return primary_mission.mission_overall_start_time, primary_mission.mission_overall_end_time
+    return primary_mission.get_start_time(), primary_mission.get_end_time()
+
+
+def get_check_times(primary_mission: DroneMission, time_resolution: float = TIME_STEP_RESOLUTION) -> np.ndarray:
+    """
+    Returns the sample times checked for this primary mission: its check window stepped
+    at `time_resolution`, always including the exact end time. An instantaneous
+    mission is checked at its single time point.
+    """
+    check_start_time, check_end_time = get_check_window(primary_mission)
+    if check_start_time == check_end_time:
+        if time_resolution == 0:
+            time_resolution = 0.1
+        check_end_time = check_start_time + time_resolution/2
+    if time_resolution <= 0:
+        raise ValueError("Time resolution must be positive.")
+
+    # Accumulate steps exactly like `current_time += time_resolution` would
+    num_steps = int(np.floor((check_end_time - check_start_time) / time_resolution)) + 3
+    accumulated = np.add.accumulate(np.concatenate(([check_start_time], np.full(num_steps, time_resolution))))
+    inside = int(np.searchsorted(accumulated, check_end_time, side='right'))
+    times: List[float] = accumulated[:inside].tolist()
+
+    # Past the end time: the overshooting step is clamped onto the exact end time
+    current_time = float(accumulated[inside])
+    while True:
+        if current_time > check_end_time and current_time - time_resolution < check_end_time:
+            if times[-1] == check_end_time: # Float round-off would revisit the end time forever
+                break
+            current_time = check_end_time
+        if current_time > check_end_time + 1e-6:
+            break
+        times.append(current_time)
+        current_time += time_resolution
+    return np.array(times, dtype=float)
+
+
 # --- Main Conflict Checking Logic ---
-def check_for_conflicts(
-    primary_mission: DroneMission, # Can be PrimaryDroneMission
+def find_conflicts(
+    primary_mission: DroneMission,
     other_drone_schedules: List[DroneMission],
     safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
     safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
     vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
-    time_resolution: float = TIME_STEP_RESOLUTION
-) -> List[ConflictInfo]:
-    
-    conflicts: List[ConflictInfo] = []
-    
-    # Determine overall time window for checking based on primary mission
-    # For PrimaryDroneMission, this uses its overall mission window
-    # For a generic DroneMission, it's based on its first and last waypoint
-    if hasattr(primary_mission, 'mission_overall_start_time'):
-        # This check ensures we are dealing with a PrimaryDroneMission instance
-        # that has the specific overall time window attributes.
-        # pylint: disable=no-member 
-        # (Pylint might complain if primary_mission is typed as DroneMission and not PrimaryDroneMission here)
-        check_start_time = primary_mission.mission_overall_start_time
-        check_end_time = primary_mission.mission_overall_end_time
+    time_resolution: float = TIME_STEP_RESOLUTION,
+    times: Optional[np.ndarray] = None,
+    coarse_time_step: Optional[float] = None,
+    broad_phase: bool = False,
+    separation: Optional["SeparationTable"] = None,
+    zones: Optional["ZoneIndex"] = None,
+    lod_tolerance: Optional[float] = None
+) -> ConflictSet:
+    """
+    Same check as check_for_conflicts, returned as a ConflictSet.
+    All drones are evaluated over the time grid in a single kernel call (see kernels.py);
+    `times` overrides the primary's default check times and must be increasing.
+    With `coarse_time_step`, a conservative coarse sweep first picks the drones and time
+    windows worth checking (see _coarse_refine_mask); the result is unchanged.
+    With `broad_phase`, segment-level sweep-and-prune with a closest-approach test picks
+    them instead (see broad_phase.py), so long multi-leg missions are only evaluated
+    where their segments come close; the result is unchanged too. A `lod_tolerance` (m)
+    runs the altitude prefilter and that broad phase on missions simplified to within
+    the tolerance (see simplification.py), with each pair's simplification errors added
+    to its buffers; the exact check still uses the original waypoints.
+    A `separation` table replaces the three thresholds with per-pair minima looked up
+    from the aircraft categories of the primary and of each other drone; every pruning
+    step then uses each drone's own minima.
+    With a `zones` index, the primary's no-fly zone violations are merged into the
+    result as "No-fly zone violation" records (see zones.ZoneIndex.violations).
+    RecurringMission schedules are checked without expanding them: all repetitions of a
+    template are evaluated in one pass over their start times (see recurring.py), and
+    their conflicts are reported as if each repetition were in the schedule in its place.
+    """
+    if broad_phase and coarse_time_step is not None:
+        raise ValueError("Choose either the coarse time step or the segment broad phase.")
+    if lod_tolerance is not None and not broad_phase:
+        raise ValueError("A level-of-detail tolerance only applies to the segment broad phase.")
+    if times is None:
+        times = get_check_times(primary_mission, time_resolution)
+    times = np.asarray(times, dtype=float)
+
+    # Drones that stay vertically clear of a 3D primary (by more than both the 3D buffer
+    # and the vertical separation) can never conflict with it: skip their distance checks
+    others = [m for m in other_drone_schedules if m.drone_id != primary_mission.drone_id]
+    recurring = [m for m in others if isinstance(m, RecurringMission)]
+    if recurring:
+        schedule_order = {id(m): position for position, m in enumerate(others)}
+        others = [m for m in others if not isinstance(m, RecurringMission)]
+    lod = None
+    if lod_tolerance is not None:
+        # Level-of-detail missions for the pruning steps: id(mission) -> (simplified mission, error)
+        missions = [primary_mission] + others
+        lod = dict(zip(map(id, missions), zip(*simplify_missions(missions, lod_tolerance))))
+    if separation is None:
+        others = _drop_altitude_separated(primary_mission, others, max(safety_buffer_3d, vertical_sep_threshold), lod)
+        buf2 = np.full(len(others), safety_buffer_2d)
+        buf3 = np.full(len(others), safety_buffer_3d)
+        vsep = np.full(len(others), vertical_sep_threshold)
     else:
-        check_start_time = primary_mission.get_start_time()
-        check_end_time = primary_mission.get_end_time()
-
-    if check_start_time == check_end_time : # If mission is instantaneous or stationary
-        # For an instantaneous primary mission, check only at that single time point
-        # If it's stationary over a duration, the loop below will handle it if resolution is small
-        # Let's ensure at least one check if start and end are same
-        # or make check_end_time slightly larger to ensure one iteration.
-        if time_resolution == 0: # Avoid infinite loop
-            time_resolution = 0.1
-        # Ensure the loop runs at least once for an instantaneous primary mission
-        check_end_time = check_start_time + time_resolution/2
+        buf2, buf3, vsep = separation.mission_thresholds(primary_mission, others)
+        others = _drop_altitude_separated(primary_mission, others, np.maximum(buf3, vsep), lod)
+        buf2, buf3, vsep = separation.mission_thresholds(primary_mission, others)
 
+    primary_positions = get_positions_at_times(primary_mission, times)
+    tracks = [get_mission_arrays(m) for m in others]
+    n_others = len(others)
 
-    current_time = check_start_time
-    while current_time <= check_end_time + 1e-6: # Add epsilon for float comparison
-        primary_wp_at_t = get_drone_position_at_time(primary_mission, current_time)
-        
-        if primary_wp_at_t is None: # Primary drone not active or error
-            current_time += time_resolution
-            if current_time > check_end_time and current_time - time_resolution < check_end_time:
-                 current_time = check_end_time # Ensure the exact end time is checked
-            elif current_time > check_end_time and check_start_time == check_end_time: # For instantaneous check
-                 break # Only one check needed
-            continue
+    if broad_phase:
+        codes = np.full((n_others, len(times)), NO_CONFLICT, dtype=np.int8)
+        primary_track, packed, margin = get_mission_arrays(primary_mission), pack_tracks(tracks), 0.0
+        if lod is not None:
+            primary_track = get_mission_arrays(lod[id(primary_mission)][0])
+            packed = pack_tracks([get_mission_arrays(lod[id(m)][0]) for m in others])
+            margin = lod[id(primary_mission)][1] + np.array([lod[id(m)][1] for m in others])
+        windows = candidate_windows(primary_track, packed, buf2 + margin, buf3 + margin, vsep + margin)
+        for d, fine in window_time_indices(*windows, times):
+            codes[d, fine] = conflict_codes(
+                times[fine], tuple(a[fine] for a in primary_positions),
+                pack_tracks([tracks[d]]), buf2[d:d + 1], buf3[d:d + 1], vsep[d:d + 1])[0]
+    elif coarse_time_step is None:
+        codes = conflict_codes(times, primary_positions, pack_tracks(tracks), buf2, buf3, vsep)
+    else:
+        refine = _coarse_refine_mask(primary_mission, tracks, times, buf2, buf3, vsep, coarse_time_step)
+        codes = np.full((n_others, len(times)), NO_CONFLICT, dtype=np.int8)
+        drones = np.flatnonzero(refine.any(axis=1))
+        if len(drones):
+            # Flagged drones are evaluated at the union of their windows: any conflict
+            # outside a drone's own windows was ruled out by the coarse sweep anyway
+            fine = np.flatnonzero(refine[drones].any(axis=0))
+            codes[np.ix_(drones, fine)] = conflict_codes(
+                times[fine], tuple(a[fine] for a in primary_positions),
+                pack_tracks([tracks[d] for d in drones]), buf2[drones], buf3[drones], vsep[drones])
+    other_ids = [m.drone_id for m in others]
+    if recurring:
+        if separation is None:
+            thresholds = [(safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold)] * len(recurring)
+        else:
+            thresholds = zip(*separation.mission_thresholds(primary_mission, recurring))
+        rows = [(schedule_order[id(m)], 0, m.drone_id, track, row) for m, track, row in zip(others, tracks, codes)]
+        rows += _recurring_rows(recurring, thresholds, schedule_order, times, primary_positions)
+        rows.sort(key=lambda row: row[:2])
+        other_ids = [row[2] for row in rows]
+        tracks = [row[3] for row in rows]
+        codes = np.array([row[4] for row in rows], dtype=np.int8).reshape(len(rows), len(times))
+    conflicts = _collect_conflicts(primary_mission, other_ids, tracks, times, primary_positions, codes)
+    if zones is not None:
+        conflicts = zones.add_violations(primary_mission, conflicts)
+    return conflicts
+
+
+def _drop_altitude_separated(
+    primary_mission: DroneMission,
+    others: List[DroneMission],
+    min_vertical_gap,
+    lod: Optional[Dict[int, Tuple[DroneMission, float]]]
+) -> List[DroneMission]:
+    """
+    filter_altitude_separated; with level-of-detail missions (see find_conflicts) the
+    test runs on the simplified missions, with the gaps grown by their errors.
+    """
+    if lod is None:
+        return filter_altitude_separated(primary_mission, others, min_vertical_gap)
+    lod_primary, primary_error = lod[id(primary_mission)]
+    lod_others = [lod[id(m)][0] for m in others]
+    margins = primary_error + np.array([lod[id(m)][1] for m in others])
+    kept = set(map(id, filter_altitude_separated(lod_primary, lod_others, min_vertical_gap + margins)))
+    return [m for m, simplified in zip(others, lod_others) if id(simplified) in kept]
+
+
+def _coarse_refine_mask(
+    primary_mission: DroneMission,
+    tracks: list,
+    times: np.ndarray,
+    buf2: np.ndarray,
+    buf3: np.ndarray,
+    vsep: np.ndarray,
+    coarse_time_step: float
+) -> np.ndarray:
+    """
+    Coarse pass of find_conflicts: returns a (drones x times) mask of the fine check times
+    that may hold a conflict.
+    Every k-th fine time is checked with each pair's thresholds inflated by the distance the
+    two drones can close within half a coarse gap, so a conflict at any fine time shows up
+    at the nearest coarse time; the fine times around flagged coarse times are kept.
+    For this sweep every mission is held at its first/last waypoint for half a gap before
+    and after it, and drones with partly missing altitudes are checked in 2D with the
+    largest buffer.
+    """
+    if coarse_time_step <= 0:
+        raise ValueError("Coarse time step must be positive.")
+    n_times, n_others = len(times), len(tracks)
+    if n_times < 2 or not n_others:
+        return np.ones((n_others, n_times), dtype=bool)
+    stride = max(1, int(round(coarse_time_step / np.median(np.diff(times)))))
+    coarse_idx = np.unique(np.append(np.arange(0, n_times, stride), n_times - 1))
+    coarse_times = times[coarse_idx]
+    hold = np.diff(coarse_times).max() / 2 + 1e-6
+
+    def held(track):
+        return tuple(np.concatenate(([a[0] - hold if i == 0 else a[0]], a, [a[-1] + hold if i == 0 else a[-1]]))
+                     for i, a in enumerate(track))
+
+    packed_primary = pack_tracks([held(get_mission_arrays(primary_mission))])
+    packed = pack_tracks([held(track) for track in tracks])
+    p_h_speed, p_v_speed, p_speed = (v[0] for v in max_track_speeds(packed_primary))
+    h_speed, v_speed, speed = max_track_speeds(packed)
+    reach_h = (p_h_speed + h_speed) * hold
+    reach_v = (p_v_speed + v_speed) * hold
+    reach = (p_speed + speed) * hold
+
+    # Altitude may drop out mid-flight: there the 2D test with the largest buffer covers every rule
+    offsets, zs = packed[0], packed[4]
+    missing_z = np.add.reduceat(np.isnan(zs), offsets[:-1])
+    mixed_z = (missing_z > 0) & (missing_z < np.diff(offsets))
+    p_missing_z = np.isnan(packed_primary[4]).sum()
+    if 0 < p_missing_z < len(packed_primary[4]):
+        mixed_z[:] = True
+    buf2_c = np.where(mixed_z, np.maximum(buf2, buf3) + reach, buf2 + reach_h)
+    if mixed_z.any():
+        zs = zs.copy()
+        zs[np.repeat(mixed_z, np.diff(offsets))] = np.nan
+        packed = packed[:4] + (zs,)
+
+    primary_positions = interpolate_track(*packed_primary[1:], coarse_times)
+    if mixed_z.all():
+        primary_positions = primary_positions[:2] + (np.full(len(coarse_times), np.nan), primary_positions[3])
+    flagged = conflict_codes(coarse_times, primary_positions, packed,
+                             buf2_c, buf3 + reach, vsep + reach_v) != NO_CONFLICT
+
+    # Fine times between the neighbours of a flagged coarse time
+    lo = coarse_idx[np.maximum(np.arange(len(coarse_idx)) - 1, 0)]
+    hi = coarse_idx[np.minimum(np.arange(len(coarse_idx)) + 1, len(coarse_idx) - 1)]
+    delta = np.zeros((n_others, n_times + 1), dtype=np.int32)
+    hit_drone, hit_coarse = np.nonzero(flagged)
+    np.add.at(delta, (hit_drone, lo[hit_coarse]), 1)
+    np.add.at(delta, (hit_drone, hi[hit_coarse] + 1), -1)
+    return np.cumsum(delta[:, :-1], axis=1) > 0
 
-        for other_drone in other_drone_schedules:
-            if primary_mission.drone_id == other_drone.drone_id:
-                continue # Don't check against self
 
-            other_wp_at_t = get_drone_position_at_time(other_drone, current_time)
-            
-            if other_wp_at_t is None: # Other drone not active at this time
+def _recurring_rows(
+    recurring: List[RecurringMission],
+    thresholds,
+    schedule_order: Dict[int, int],
+    times: np.ndarray,
+    primary_positions: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+) -> list:
+    """
+    (schedule position, repetition, drone id, track, code row) of every repetition of the
+    recurring missions that conflicts with the primary; `thresholds` gives each mission's
+    (buf2, buf3, vsep).
+    """
+    rows = []
+    for mission, (buf2, buf3, vsep) in zip(recurring, thresholds):
+        repetition, time_index, codes, _ = repetition_conflicts(mission, times, primary_positions, buf2, buf3, vsep)
+        bounds = np.flatnonzero(np.diff(repetition)) + 1
+        for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(repetition)]))):
+            if start == end:
                 continue
-            
-            # Both drones are active, check for conflict
-            dist_2d, dist_3d = calculate_distance(primary_wp_at_t, other_wp_at_t)
-            
-            is_conflict = False
-            conflict_type = ""
-
-            if primary_wp_at_t.is_3d and other_wp_at_t.is_3d and dist_3d is not None:
-                # Both are 3D: use 3D safety buffer
-                if dist_3d < safety_buffer_3d:
-                    is_conflict = True
-                    conflict_type = "3D proximity"
-                # Check vertical separation if horizontally close but 3D separation is met
-                elif dist_2d < safety_buffer_2d and abs(primary_wp_at_t.z - other_wp_at_t.z) < vertical_sep_threshold:
-                    is_conflict = True
-                    conflict_type = "Insufficient vertical separation"
-            else:
-                # At least one drone is 2D (or z is None), use 2D safety buffer
-                if dist_2d < safety_buffer_2d:
-                    is_conflict = True
-                    conflict_type = "2D proximity"
-            
-            if is_conflict:
-                conflicts.append({
-                    "time": current_time,
-                    "primary_drone_id": primary_mission.drone_id,
-                    "primary_pos": (primary_wp_at_t.x, primary_wp_at_t.y, primary_wp_at_t.z),
-                    "conflicting_drone_id": other_drone.drone_id,
-                    "other_pos": (other_wp_at_t.x, other_wp_at_t.y, other_wp_at_t.z),
-                    "distance_2d": dist_2d,
-                    "distance_3d": dist_3d,
-                    "type": conflict_type
-                })
-        
-        current_time += time_resolution
-        if current_time > check_end_time and current_time - time_resolution < check_end_time:
-             current_time = check_end_time # Ensure the exact end time is checked
-        elif current_time > check_end_time and check_start_time == check_end_time: # For instantaneous check
-             break # Only one check needed
+            k = int(repetition[start])
+            row = np.full(len(times), NO_CONFLICT, dtype=np.int8)
+            row[time_index[start:end]] = codes[start:end]
+            rows.append((schedule_order[id(mission)], k, mission.repetition_id(k), mission.repetition_track(k), row))
+    return rows
+
+
+def _collect_conflicts(
+    primary_mission: DroneMission,
+    other_ids: List[str],
+    tracks: list,
+    times: np.ndarray,
+    primary_positions: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    codes: np.ndarray
+) -> ConflictSet:
+    """Turns a (drones x times) conflict-code matrix into a ConflictSet ordered by time, then schedule order."""
+    id_table = {primary_mission.drone_id: 0}
+    drone_ids = np.array([id_table.setdefault(drone_id, len(id_table)) for drone_id in other_ids], dtype=np.int32)
+    hit_drone, hit_time = np.nonzero(codes != NO_CONFLICT)
+    if not len(hit_time):
+        return ConflictSet(drone_ids=list(id_table))
+
+    # Positions of the other drones are only materialized at their conflict times
+    other_pos = np.empty((len(hit_time), 3))
+    bounds = np.flatnonzero(np.diff(hit_drone)) + 1
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(hit_drone)]))):
+        ox, oy, oz, _ = interpolate_track(*tracks[hit_drone[start]], times[hit_time[start:end]])
+        other_pos[start:end] = np.column_stack((ox, oy, oz))
+
+    order = np.lexsort((hit_drone, hit_time))
+    hit_drone, hit_time, other_pos = hit_drone[order], hit_time[order], other_pos[order]
+    px, py, pz, _ = primary_positions
+    primary_pos = np.column_stack((px[hit_time], py[hit_time], pz[hit_time]))
+    delta = primary_pos - other_pos
+    distance_2d = np.sqrt(delta[:, 0]**2 + delta[:, 1]**2)
+    distance_3d = np.sqrt(delta[:, 0]**2 + delta[:, 1]**2 + delta[:, 2]**2) # NaN unless both drones have an altitude
+
+    return ConflictSet.from_columns(
+        list(id_table),
+        time=times[hit_time],
+        primary_id=0,
+        other_id=drone_ids[hit_drone],
+        primary_pos=primary_pos,
+        other_pos=other_pos,
+        distance_2d=distance_2d,
+        distance_3d=distance_3d,
+        type_code=codes[hit_drone, hit_time]
+    )
+
+
+def check_for_conflicts(
+    primary_mission: DroneMission, # Can be PrimaryDroneMission
+    other_drone_schedules: List[DroneMission],
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+    time_resolution: float = TIME_STEP_RESOLUTION,
+    coarse_time_step: Optional[float] = None,
+    broad_phase: bool = False,
+    separation: Optional["SeparationTable"] = None,
+    zones: Optional["ZoneIndex"] = None,
+    lod_tolerance: Optional[float] = None
+) -> List[ConflictInfo]:
+    """
+    Steps through the primary's check window at `time_resolution` and reports every
+    time step at which another drone violates the 2D, 3D or vertical separation minima.
+    Conflicts are ordered by time, then by order in `other_drone_schedules`.
+    A `coarse_time_step` (e.g. 10x the resolution) enables the two-level sweep of
+    find_conflicts, which gives the same conflicts; so does `broad_phase`, which is meant
+    for long multi-leg missions (on simplified geometry with a `lod_tolerance`). A
+    `separation` table gives per-pair minima by aircraft category instead of the global
+    thresholds, and a `zones` index adds no-fly zone violations.
+    """
+    return find_conflicts(primary_mission, other_drone_schedules, safety_buffer_2d,
+                          safety_buffer_3d, vertical_sep_threshold, time_resolution,
+                          coarse_time_step=coarse_time_step, broad_phase=broad_phase,
+                          separation=separation, zones=zones, lod_tolerance=lod_tolerance).to_list()
+
+
+def check_for_conflicts_2d(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    time_resolution: float = TIME_STEP_RESOLUTION,
+    separation: Optional["SeparationTable"] = None
+) -> ConflictSet:
+    """
+    Fast path of check_for_conflicts for a primary mission without altitude.
+    When the primary is 2D every pair falls into the "2D proximity" branch, so the
+    z-handling can be skipped and each drone is checked over the whole time grid at once.
+    Returns the same conflicts, in the same order, as check_for_conflicts, as a ConflictSet.
+    Recurring missions are checked without expanding them (see recurring.py).
+    """
+    times = get_check_times(primary_mission, time_resolution)
+    px, py, pz, p_active = get_positions_at_times(primary_mission, times)
+    horizontal_positions = (px, py, np.full(len(times), np.nan), p_active)
+    others = [m for m in other_drone_schedules if m.drone_id != primary_mission.drone_id]
+    if separation is None:
+        buffers = np.full(len(others), safety_buffer_2d)
+    else:
+        buffers = separation.mission_thresholds(primary_mission, others)[0]
+
+    id_table = {primary_mission.drone_id: 0}
+    hit_times, hit_drones, other_xyz, distances = [], [], [], []
+    for other_drone, buffer_2d in zip(others, buffers):
+        if isinstance(other_drone, RecurringMission):
+            repetition, hits, _, other = repetition_conflicts(other_drone, times, horizontal_positions,
+                                                              buffer_2d, buffer_2d, buffer_2d)
+            starts = np.flatnonzero(np.diff(repetition, prepend=-1))
+            for start, end in zip(starts, np.append(starts[1:], len(hits))):
+                group = slice(start, end)
+                hit_times.append(hits[group])
+                other_idx = id_table.setdefault(other_drone.repetition_id(int(repetition[start])), len(id_table))
+                hit_drones.append(np.full(end - start, other_idx, dtype=np.int32))
+                other_xyz.append(other[group])
+                distances.append(np.hypot(px[hits[group]] - other[group, 0], py[hits[group]] - other[group, 1]))
+            continue
+        ox, oy, oz, o_active = get_positions_at_times(other_drone, times)
+        dist_2d = np.hypot(px - ox, py - oy)
+        hits = np.nonzero(p_active & o_active & (dist_2d < buffer_2d))[0]
+        if len(hits):
+            hit_times.append(hits)
+            other_idx = id_table.setdefault(other_drone.drone_id, len(id_table))
+            hit_drones.append(np.full(len(hits), other_idx, dtype=np.int32))
+            other_xyz.append(np.column_stack((ox[hits], oy[hits], oz[hits])))
+            distances.append(dist_2d[hits])
 
+    if not hit_times:
+        return ConflictSet(drone_ids=list(id_table))
 
-    # Optional: Post-process conflicts to merge continuous conflicts
-    # For now, returns all discrete time-step conflicts
-    return conflicts
\ No newline at end of file
+    t_idx = np.concatenate(hit_times)
+    other_id = np.concatenate(hit_drones)
+    # check_for_conflicts reports conflicts time step by time step, in schedule order
+    order = np.lexsort((other_id, t_idx))
+    t_idx = t_idx[order]
+    return ConflictSet.from_columns(
+        list(id_table),
+        time=times[t_idx],
+        primary_id=0,
+        other_id=other_id[order],
+        primary_pos=np.column_stack((px[t_idx], py[t_idx], np.full(len(t_idx), np.nan))),
+        other_pos=np.concatenate(other_xyz)[order],
+        distance_2d=np.concatenate(distances)[order],
+        distance_3d=np.nan,
+        type_code=TYPE_CODES["2D proximity"]
+    )
@@ -0,0 +1,207 @@
+import numpy as np
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Sequence, Union
+
+# Conflict types, indexed by the `type_code` column
+CONFLICT_TYPES = (
+    "2D proximity",
+    "3D proximity",
+    "Insufficient vertical separation",
+    "No-fly zone violation", # Static airspace: the conflicting id is a zones.NoFlyZone id
+)
+TYPE_CODES = {name: code for code, name in enumerate(CONFLICT_TYPES)}
+
+# One record per conflict. Drone ids are interned into the set's `drone_ids` table,
+# missing altitudes and 3D distances are stored as NaN.
+CONFLICT_DTYPE = np.dtype([
+    ("time", "f8"),
+    ("primary_id", "i4"),
+    ("other_id", "i4"),
+    ("primary_pos", "f8", (3,)),
+    ("other_pos", "f8", (3,)),
+    ("distance_2d", "f8"),
+    ("distance_3d", "f8"),
+    ("type_code", "i1"),
+])
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+class ConflictSet:
+    """
+    Compact collection of conflicts backed by a NumPy structured array.
+    Behaves like a read-only list of ConflictInfo dicts (len, indexing, iteration),
+    building each dict lazily, while filtering, sorting and grouping work on the columns.
+    """
+    def __init__(self, records: Optional[np.ndarray] = None, drone_ids: Optional[Sequence[str]] = None):
+        self.records = records if records is not None else np.empty(0, dtype=CONFLICT_DTYPE)
+        self.drone_ids: List[str] = list(drone_ids) if drone_ids is not None else []
+
+    # --- Construction ---
+    @classmethod
+    def from_columns(cls,
+                     drone_ids: Sequence[str],
+                     time: np.ndarray,
+                     primary_id: Union[int, np.ndarray],
+                     other_id: Union[int, np.ndarray],
+                     primary_pos: np.ndarray,
+                     other_pos: np.ndarray,
+                     distance_2d: np.ndarray,
+                     distance_3d: Union[float, np.ndarray],
+                     type_code: Union[int, np.ndarray]) -> "ConflictSet":
+        """Builds a set from column arrays (scalars are broadcast). Positions are (N, 3) arrays."""
+        records = np.empty(len(time), dtype=CONFLICT_DTYPE)
+        records["time"] = time
+        records["primary_id"] = primary_id
+        records["other_id"] = other_id
+        records["primary_pos"] = primary_pos
+        records["other_pos"] = other_pos
+        records["distance_2d"] = distance_2d
+        records["distance_3d"] = distance_3d
+        records["type_code"] = type_code
+        return cls(records, drone_ids)
+
+    @classmethod
+    def from_conflicts(cls, conflicts: Iterable[Dict[str, Any]]) -> "ConflictSet":
+        """Builds a set from ConflictInfo dicts, as returned by check_for_conflicts."""
+        if isinstance(conflicts, ConflictSet):
+            return conflicts
+        conflicts = list(conflicts)
+        id_table: Dict[str, int] = {}
+        records = np.empty(len(conflicts), dtype=CONFLICT_DTYPE)
+        for i, c in enumerate(conflicts):
+            p_pos, o_pos = c['primary_pos'], c['other_pos']
+            records[i] = (
+                c['time'],
+                id_table.setdefault(c['primary_drone_id'], len(id_table)),
+                id_table.setdefault(c['conflicting_drone_id'], len(id_table)),
+                [v if v is not None else np.nan for v in p_pos],
+                [v if v is not None else np.nan for v in o_pos],
+                c['distance_2d'],
+                c['distance_3d'] if c['distance_3d'] is not None else np.nan,
+                TYPE_CODES[c['type']],
+            )
+        return cls(records, list(id_table))
+
+    @classmethod
+    def concatenate(cls, sets: Iterable["ConflictSet"]) -> "ConflictSet":
+        """Concatenates sets, merging their drone id tables."""
+        id_table: Dict[str, int] = {}
+        chunks = []
+        for cs in sets:
+            remap = np.array([id_table.setdefault(d, len(id_table)) for d in cs.drone_ids], dtype=np.int32)
+            chunk = cs.records.copy()
+            if len(chunk):
+                chunk["primary_id"] = remap[chunk["primary_id"]]
+                chunk["other_id"] = remap[chunk["other_id"]]
+            chunks.append(chunk)
+        records = np.concatenate(chunks) if chunks else np.empty(0, dtype=CONFLICT_DTYPE)
+        return cls(records, list(id_table))
+
+    # --- List-like access ---
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __bool__(self) -> bool:
+        return len(self.records) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self.records)):
+            yield self._conflict_at(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._conflict_at(int(key) if key >= 0 else len(self) + int(key))
+        return ConflictSet(self.records[key], self.drone_ids)
+
+    def __repr__(self) -> str:
+        return f"ConflictSet(conflicts={len(self)}, drones={len(self.drone_ids)})"
+
+    def _conflict_at(self, i: int) -> Dict[str, Any]:
+        r = self.records[i]
+        p_pos, o_pos = r["primary_pos"], r["other_pos"]
+        return {
+            "time": float(r["time"]),
+            "primary_drone_id": self.drone_ids[r["primary_id"]],
+            "primary_pos": (float(p_pos[0]), float(p_pos[1]), _optional(p_pos[2])),
+            "conflicting_drone_id": self.drone_ids[r["other_id"]],
+            "other_pos": (float(o_pos[0]), float(o_pos[1]), _optional(o_pos[2])),
+            "distance_2d": float(r["distance_2d"]),
+            "distance_3d": _optional(r["distance_3d"]),
+            "type": CONFLICT_TYPES[r["type_code"]],
+        }
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materializes every conflict as a ConflictInfo dict."""
+        return list(self)
+
+    # --- Columns ---
+    @property
+    def times(self) -> np.ndarray:
+        return self.records["time"]
+
+    @property
+    def primary_positions(self) -> np.ndarray:
+        return self.records["primary_pos"]
+
+    @property
+    def conflicting_drone_ids(self) -> List[str]:
+        """Distinct ids of the conflicting drones, in id-table order."""
+        return [self.drone_ids[i] for i in np.unique(self.records["other_id"])]
+
+    # --- Queries ---
+    def filter(self, mask: np.ndarray) -> "ConflictSet":
+        return ConflictSet(self.records[mask], self.drone_ids)
+
+    def of_type(self, conflict_type: str) -> "ConflictSet":
+        return self.filter(self.records["type_code"] == TYPE_CODES[conflict_type])
+
+    def involving(self, drone_id: str) -> "ConflictSet":
+        """Conflicts where `drone_id` is either the primary or the conflicting drone."""
+        if drone_id not in self.drone_ids:
+            return ConflictSet(self.records[:0], self.drone_ids)
+        idx = self.drone_ids.index(drone_id)
+        return self.filter((self.records["primary_id"] == idx) | (self.records["other_id"] == idx))
+
+    def between(self, start_time: float, end_time: float) -> "ConflictSet":
+        """Conflicts whose time lies in [start_time, end_time]."""
+        times = self.records["time"]
+        return self.filter((times >= start_time) & (times <= end_time))
+
+    def sorted(self, by: str = "time") -> "ConflictSet":
+        """Returns a copy sorted by a column; ties keep time order, then conflicting drone."""
+        if by == "time":
+            order = np.lexsort((self.records["other_id"], self.records["time"]))
+        else:
+            order = np.lexsort((self.records["time"], self.records[by]))
+        return ConflictSet(self.records[order], self.drone_ids)
+
+    def group_by_drone(self) -> Dict[str, "ConflictSet"]:
+        """Splits the set per conflicting drone id, keeping time order inside each group."""
+        if not len(self):
+            return {}
+        order = np.lexsort((self.records["time"], self.records["other_id"]))
+        ordered = self.records[order]
+        ids, starts = np.unique(ordered["other_id"], return_index=True)
+        bounds = list(starts[1:]) + [len(ordered)]
+        return {self.drone_ids[drone_idx]: ConflictSet(ordered[start:end], self.drone_ids)
+                for drone_idx, start, end in zip(ids, starts, bounds)}
+
+    # --- Serialization ---
+    def save(self, path: str) -> None:
+        """Saves the set to a compressed .npz file."""
+        np.savez_compressed(path, records=self.records,
+                            drone_ids=np.array(self.drone_ids, dtype=str),
+                            conflict_types=np.array(CONFLICT_TYPES, dtype=str))
+
+    @classmethod
+    def load(cls, path: str) -> "ConflictSet":
+        with np.load(path) as data:
+            saved_types = [str(t) for t in data["conflict_types"]]
+            records = data["records"]
+            if tuple(saved_types) != CONFLICT_TYPES[:len(saved_types)]:
+                # Type codes were saved against a different table: remap by name
+                remap = np.array([TYPE_CODES[t] for t in saved_types], dtype=np.int8)
+                records["type_code"] = remap[records["type_code"]]
+            return cls(records, [str(d) for d in data["drone_ids"]])
@@ -1,4 +1,6 @@
-from typing import List, Optional, Tuple, Union
+import copy
+import numpy as np
+from typing import List, Optional, Sequence, Tuple, Union
 
 class Waypoint:
     """Represents a single point in space and time for a drone's trajectory."""
@@ -24,12 +26,13 @@ class Waypoint:
 
 class DroneMission:
     """Represents a drone's mission defined by a series of waypoints."""
-    def __init__(self, waypoints: List[Waypoint], drone_id: str):
+    def __init__(self, waypoints: List[Waypoint], drone_id: str, category: Optional[str] = None):
         if not waypoints:
             raise ValueError(f"DroneMission for {drone_id} must have at least one waypoint.")
         # Ensure waypoints are sorted by timestamp
         self.waypoints = sorted(waypoints, key=lambda wp: wp.timestamp)
         self.drone_id = drone_id
+        self.category = category # Aircraft category, for separation.SeparationTable lookups
 
     def get_start_time(self) -> float:
         """Returns the timestamp of the first waypoint."""
@@ -43,77 +46,151 @@ class DroneMission:
         """Checks if any waypoint in the mission has a Z coordinate."""
         return any(wp.is_3d for wp in self.waypoints)
 
+    def shifted(self, delay: float) -> "DroneMission":
+        """Returns a copy of the mission flown `delay` seconds later."""
+        shifted_mission = copy.copy(self)
+        shifted_mission.waypoints = [Waypoint(wp.x, wp.y, wp.timestamp + delay, wp.z) for wp in self.waypoints]
+        return shifted_mission
+
     def __repr__(self) -> str:
         return (f"DroneMission(id='{self.drone_id}', "
                 f"waypoints_count={len(self.waypoints)}, "
                 f"start_t={self.get_start_time():.2f}, end_t={self.get_end_time():.2f}, "
                 f"is_3d={self.is_mission_3d()})")
 
+TIMING_MODES = ("equal_time", "constant_speed", "speed_limits")
+
+
+def coords_to_array(waypoint_coords) -> np.ndarray:
+    """
+    Converts (x,y) / (x,y,z) coordinates, or an (N x 2|3) array, into an (N x 3) float array.
+    Missing altitudes are stored as NaN.
+    """
+    try:
+        arr = np.asarray(waypoint_coords, dtype=float)
+    except ValueError: # Mix of 2D and 3D tuples
+        arr = np.array([tuple(c) + (np.nan,) * (3 - len(c)) for c in waypoint_coords], dtype=float)
+    if arr.ndim != 2 or arr.shape[1] not in (2, 3):
+        raise ValueError(f"Waypoint coordinates must have shape (N, 2) or (N, 3), got {arr.shape}.")
+    if arr.shape[1] == 2:
+        arr = np.column_stack((arr, np.full(len(arr), np.nan)))
+    return arr
+
+
+def compute_waypoint_timestamps(coords: np.ndarray,
+                                start_time: float,
+                                end_time: Optional[float] = None,
+                                timing: str = "equal_time",
+                                cruise_speed: Optional[float] = None,
+                                segment_speed_limits: Optional[Union[float, Sequence[float]]] = None) -> np.ndarray:
+    """
+    Computes the timestamps of an (N x 3) coordinate array (N >= 2) in one pass.
+      - "equal_time": every segment takes the same time between start_time and end_time.
+      - "constant_speed": time proportional to cumulative path length; stretched over
+        [start_time, end_time], or flown at `cruise_speed` if no end time is given.
+      - "speed_limits": each segment is flown at its limit from `segment_speed_limits`
+        (one value per segment, or a scalar); with an end time the whole profile is slowed
+        down uniformly to arrive exactly at end_time.
+    """
+    if timing not in TIMING_MODES:
+        raise ValueError(f"Unknown timing mode '{timing}'. Expected one of {TIMING_MODES}.")
+    num_segments = len(coords) - 1
+    deltas = np.diff(coords, axis=0)
+    deltas[:, 2] = np.nan_to_num(deltas[:, 2]) # 2D segments have no vertical component
+    lengths = np.sqrt((deltas**2).sum(axis=1))
+
+    if timing == "equal_time":
+        if end_time is None:
+            raise ValueError("Equal-time timing requires a mission end time.")
+        fractions = np.arange(num_segments + 1) / num_segments
+    elif timing == "constant_speed":
+        cumulative = np.concatenate(([0.0], np.cumsum(lengths)))
+        if end_time is None:
+            if not cruise_speed or cruise_speed <= 0:
+                raise ValueError("Constant-speed timing without an end time requires a positive cruise_speed.")
+            return start_time + cumulative / cruise_speed
+        if cumulative[-1] == 0: # Zero-length path: fall back to equal time
+            fractions = np.arange(num_segments + 1) / num_segments
+        else:
+            fractions = cumulative / cumulative[-1]
+    else:
+        if segment_speed_limits is None:
+            raise ValueError("Speed-limit timing requires segment_speed_limits.")
+        limits = np.broadcast_to(np.asarray(segment_speed_limits, dtype=float), (num_segments,))
+        if np.any(limits <= 0):
+            raise ValueError("Segment speed limits must be positive.")
+        cumulative = np.concatenate(([0.0], np.cumsum(lengths / limits)))
+        if end_time is None:
+            return start_time + cumulative
+        if cumulative[-1] > end_time - start_time + 1e-9:
+            raise ValueError(f"Mission needs at least {cumulative[-1]:.2f}s within its speed limits, "
+                             f"but only {end_time - start_time:.2f}s are available.")
+        if cumulative[-1] == 0:
+            fractions = np.arange(num_segments + 1) / num_segments
+        else:
+            fractions = cumulative / cumulative[-1]
+
+    timestamps = start_time + fractions * (end_time - start_time)
+    timestamps[-1] = end_time # Ensure the last waypoint is exactly at the end time
+    return timestamps
+
+
 class PrimaryDroneMission(DroneMission):
     """
     Represents the primary drone's mission.
-    Timestamps for waypoints are calculated based on an overall mission window.
+    Timestamps for waypoints are calculated based on an overall mission window
+    and a timing mode (see compute_waypoint_timestamps).
     """
     def __init__(self,
-                 # List of (x,y) or (x,y,z) coordinates
-                 waypoint_coords: List[Union[Tuple[float, float], Tuple[float, float, float]]],
+                 # List of (x,y) or (x,y,z) coordinates, or an (N x 2|3) array
+                 waypoint_coords: Union[List[Union[Tuple[float, float], Tuple[float, float, float]]], np.ndarray],
                  mission_overall_start_time: float,
-                 mission_overall_end_time: float,
-                 drone_id: str = "PrimaryDrone"):
-
-        if not waypoint_coords:
+                 mission_overall_end_time: Optional[float],
+                 drone_id: str = "PrimaryDrone",
+                 timing: str = "equal_time",
+                 cruise_speed: Optional[float] = None,
+                 segment_speed_limits: Optional[Union[float, Sequence[float]]] = None,
+                 category: Optional[str] = None):
+
+        if len(waypoint_coords) == 0:
             raise ValueError("Primary mission must have at least one waypoint coordinate.")
-        if mission_overall_end_time < mission_overall_start_time:
+        if mission_overall_end_time is not None and mission_overall_end_time < mission_overall_start_time:
             raise ValueError("Mission overall end time must be after start time.")
 
-        self.mission_overall_start_time = float(mission_overall_start_time)
-        self.mission_overall_end_time = float(mission_overall_end_time)
-        
-        num_coords = len(waypoint_coords)
-        waypoints: List[Waypoint] = []
+        coords = coords_to_array(waypoint_coords)
+        start_time = float(mission_overall_start_time)
 
-        if num_coords == 1:
+        if len(coords) == 1:
             # Single point mission: drone stays at this point for the duration
-            coord = waypoint_coords[0]
-            is_3d_coord = len(coord) == 3
-            alt = coord[2] if is_3d_coord else None
-            # Create two waypoints for a stationary mission: start and end at the same place
-            waypoints.append(Waypoint(coord[0], coord[1], self.mission_overall_start_time, alt))
-            if self.mission_overall_start_time != self.mission_overall_end_time:
-                 waypoints.append(Waypoint(coord[0], coord[1], self.mission_overall_end_time, alt))
-
+            if mission_overall_end_time is None:
+                raise ValueError("A single-point primary mission requires an end time.")
+            end_time = float(mission_overall_end_time)
+            # Two waypoints for a stationary mission: start and end at the same place
+            timestamps = np.array([start_time, end_time] if start_time != end_time else [start_time])
+            coords = np.repeat(coords, len(timestamps), axis=0)
         else:
-            total_mission_duration = self.mission_overall_end_time - self.mission_overall_start_time
-            num_segments = num_coords - 1
-            
-            time_per_segment = total_mission_duration / num_segments if num_segments > 0 else 0
-            
-            current_time = self.mission_overall_start_time
-            for i, coord_tuple in enumerate(waypoint_coords):
-                is_3d_coord = len(coord_tuple) == 3
-                x, y = coord_tuple[0], coord_tuple[1]
-                z = coord_tuple[2] if is_3d_coord else None
-                
-                # For the last waypoint, ensure it's exactly at mission_overall_end_time
-                if i == num_coords - 1:
-                    actual_time = self.mission_overall_end_time
-                else:
-                    actual_time = self.mission_overall_start_time + i * time_per_segment
-                
-                # Prevent duplicate timestamps if time_per_segment is 0 (e.g. start_time == end_time)
-                if waypoints and waypoints[-1].timestamp == actual_time and waypoints[-1].x == x and waypoints[-1].y == y and waypoints[-1].z == z:
-                    continue
-
-                waypoints.append(Waypoint(x, y, actual_time, z))
-        
-        super().__init__(waypoints, drone_id)
-
-        # Final check on generated waypoints for primary mission
-        if self.waypoints[-1].timestamp > self.mission_overall_end_time + 1e-6: # Epsilon for float comparison
-            # This might happen if calculated segment times don't perfectly sum up, adjust last wp
-            self.waypoints[-1].timestamp = self.mission_overall_end_time
-            # Re-sort if the last timestamp adjustment caused an issue (shouldn't usually)
-            self.waypoints = sorted(self.waypoints, key=lambda wp: wp.timestamp)
-
-        if not self.waypoints: # Should be caught earlier, but as a safeguard
-            raise ValueError(f"PrimaryDroneMission for {drone_id} ended up with no waypoints.")
\ No newline at end of file
+            timestamps = compute_waypoint_timestamps(
+                coords, start_time,
+                float(mission_overall_end_time) if mission_overall_end_time is not None else None,
+                timing, cruise_speed, segment_speed_limits)
+            end_time = float(timestamps[-1])
+            # Drop consecutive duplicates (same place at the same time, e.g. zero-duration missions)
+            same_coords = (coords[1:] == coords[:-1]) | (np.isnan(coords[1:]) & np.isnan(coords[:-1]))
+            duplicate = (np.diff(timestamps) == 0) & same_coords.all(axis=1)
+            keep = np.concatenate(([True], ~duplicate))
+            coords, timestamps = coords[keep], timestamps[keep]
+
+        self.mission_overall_start_time = start_time
+        self.mission_overall_end_time = end_time
+        self.timing = timing
+
+        waypoints = [Waypoint(x, y, t, None if z != z else z) # z != z tests for NaN
+                     for (x, y, z), t in zip(coords.tolist(), timestamps.tolist())]
+        super().__init__(waypoints, drone_id, category)
+
+    def shifted(self, delay: float) -> "PrimaryDroneMission":
+        """Returns a copy of the mission, and its overall time window, flown `delay` seconds later."""
+        shifted_mission = super().shifted(delay)
+        shifted_mission.mission_overall_start_time = self.mission_overall_start_time + delay
+        shifted_mission.mission_overall_end_time = self.mission_overall_end_time + delay
+        return shifted_mission
@@ -0,0 +1,232 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from data_structures import DroneMission
+from conflict_checker import get_check_times, get_mission_arrays, get_positions_at_times, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from recurring import expand_recurring
+from separation import SeparationTable
+
+# Forbidden delays are widened by more than the checker's 1e-6 s time tolerance, which
+# covers the moment a drone lingers on its first and last waypoint plus float round-off
+DELAY_TOLERANCE = 2e-6
+
+
+def _segment_table(other_drone_schedules: List[DroneMission]) -> Tuple[np.ndarray, ...]:
+    """
+    Flattens the missions into linear pieces: (drone index, t0, t1, start position (S x 3),
+    velocity (S x 3), missing altitude at start, missing altitude at end). A single-waypoint
+    mission is one piece of zero duration. Where one end of a segment lacks an altitude the
+    drone holds the other end's altitude in between, as in the checker.
+    """
+    drone_idx, t0, t1, p0, p1, z0_missing, z1_missing = [], [], [], [], [], [], []
+    for idx, mission in enumerate(other_drone_schedules):
+        ts, xs, ys, zs = get_mission_arrays(mission)
+        pos = np.column_stack((xs, ys, zs))
+        first, last = (slice(None, -1), slice(1, None)) if len(ts) > 1 else (slice(None), slice(None))
+        z0, z1 = pos[first, 2].copy(), pos[last, 2].copy()
+        z0_missing.append(np.isnan(z0))
+        z1_missing.append(np.isnan(z1))
+        z0, z1 = np.where(np.isnan(z0), z1, z0), np.where(np.isnan(z1), z0, z1)
+        drone_idx.append(np.full(len(z0), idx))
+        t0.append(ts[first])
+        t1.append(ts[last])
+        p0.append(np.column_stack((pos[first, :2], z0)))
+        p1.append(np.column_stack((pos[last, :2], z1)))
+    if not drone_idx:
+        empty, no_flags = np.empty(0), np.empty(0, dtype=bool)
+        return np.empty(0, dtype=int), empty, empty, np.empty((0, 3)), np.empty((0, 3)), no_flags, no_flags
+
+    t0, t1 = np.concatenate(t0), np.concatenate(t1)
+    p0, p1 = np.concatenate(p0), np.concatenate(p1)
+    duration = t1 - t0
+    moving = duration >= 1e-6 # Zero-duration segments: the drone sits on their start waypoint
+    velocity = np.zeros_like(p0)
+    velocity[moving] = (p1[moving] - p0[moving]) / duration[moving, None]
+    velocity[:, 2] = np.nan_to_num(velocity[:, 2])
+    return (np.concatenate(drone_idx), t0, np.where(moving, t1, t0), p0, velocity,
+            np.concatenate(z0_missing), np.concatenate(z1_missing))
+
+
+def _inside_ball(offset: np.ndarray, velocity: np.ndarray, radius: np.ndarray,
+                 duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Solves |offset + velocity * u| < radius for u in [0, duration] (radius per row).
+    Returns (u_start, u_end, found) arrays.
+    """
+    a = (velocity**2).sum(axis=1)
+    b = 2 * (offset * velocity).sum(axis=1)
+    c = (offset**2).sum(axis=1) - radius**2
+    stationary = a < 1e-12
+    safe_a = np.where(stationary, 1.0, a)
+    disc = b * b - 4 * a * c
+    root = np.sqrt(np.maximum(disc, 0.0))
+    u_start = np.where(stationary, 0.0, np.maximum((-b - root) / (2 * safe_a), 0.0))
+    u_end = np.where(stationary, duration, np.minimum((-b + root) / (2 * safe_a), duration))
+    found = np.where(stationary, c < 0, disc > 0) & (u_start <= u_end)
+    return u_start, u_end, found
+
+
+def _inside_slab(offset_z: np.ndarray, velocity_z: np.ndarray, half_height: np.ndarray,
+                 duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Solves |offset_z + velocity_z * u| < half_height for u in [0, duration]."""
+    level = velocity_z == 0
+    safe_v = np.where(level, 1.0, velocity_z)
+    u_a = (-half_height - offset_z) / safe_v
+    u_b = (half_height - offset_z) / safe_v
+    u_start = np.where(level, 0.0, np.maximum(np.minimum(u_a, u_b), 0.0))
+    u_end = np.where(level, duration, np.minimum(np.maximum(u_a, u_b), duration))
+    found = np.where(level, np.abs(offset_z) < half_height, u_start <= u_end)
+    return u_start, u_end, found
+
+
+def _merge_intervals(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Merges overlapping [start, end] intervals into a sorted (N x 2) array."""
+    if not len(starts):
+        return np.empty((0, 2))
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], np.maximum.accumulate(ends[order])
+    new_run = np.concatenate(([True], starts[1:] > ends[:-1]))
+    run_starts = np.flatnonzero(new_run)
+    run_ends = np.concatenate((run_starts[1:], [len(starts)])) - 1
+    return np.column_stack((starts[run_starts], ends[run_ends]))
+
+
+def forbidden_delay_intervals(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    min_delay: float,
+    max_delay: float,
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+    time_resolution: float = TIME_STEP_RESOLUTION,
+    separation: Optional[SeparationTable] = None
+) -> Dict[str, np.ndarray]:
+    """
+    For each other drone, the departure delays in [min_delay, max_delay] that would make the
+    primary conflict with it, as merged (N x 2) [start, end] arrays. Drones that never block
+    the primary are left out.
+    Delaying the primary by d moves its check grid with it, so its k-th sample stays at the
+    same position P_k while meeting the other drone at time s_k + d. For every (sample,
+    segment) pair the times at which the segment is inside P_k's separation volume are
+    solved in closed form, so no check is run per candidate delay.
+    A `separation` table gives per-pair minima by aircraft category instead of the
+    global thresholds, as in find_conflicts.
+    """
+    if max_delay < min_delay:
+        raise ValueError("Maximum delay must not be smaller than the minimum delay.")
+    # Each repetition of a recurring mission is its own set of segments
+    others = [m for m in expand_recurring(other_drone_schedules) if m.drone_id != primary_mission.drone_id]
+
+    times = get_check_times(primary_mission, time_resolution)
+    px, py, pz, p_active = get_positions_at_times(primary_mission, times)
+    times, primary_pos = times[p_active], np.column_stack((px, py, pz))[p_active]
+    drone_idx, t0, t1, p0, velocity, z0_missing, z1_missing = _segment_table(others)
+    if separation is not None:
+        drone_minima = separation.mission_thresholds(primary_mission, others)
+    else:
+        drone_minima = tuple(np.full(len(others), value)
+                             for value in (safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold))
+
+    # Pair each segment with the samples that can meet it for some delay in range
+    first_k = np.searchsorted(times, t0 - max_delay - DELAY_TOLERANCE, side='left')
+    last_k = np.searchsorted(times, t1 - min_delay + DELAY_TOLERANCE, side='right')
+    counts = np.maximum(last_k - first_k, 0)
+    seg = np.repeat(np.arange(len(counts)), counts)
+    k = np.repeat(first_k, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    buf2, buf3, vsep = (minima[drone_idx[seg]] for minima in drone_minima)
+    offset = p0[seg] - primary_pos[k]
+    seg_velocity, duration = velocity[seg], t1[seg] - t0[seg]
+    has_z = ~np.isnan(offset[:, 2])
+    offset_z = np.nan_to_num(offset[:, 2])
+
+    # 2D pairs: inside the horizontal buffer. 3D pairs: inside the 3D ball, or inside the
+    # horizontal buffer while vertically closer than the separation threshold
+    cyl = _inside_ball(offset[:, :2], seg_velocity[:, :2], buf2, duration)
+    ball = _inside_ball(np.column_stack((offset[:, :2], offset_z)), seg_velocity, buf3, duration)
+    slab = _inside_slab(offset_z, seg_velocity[:, 2], vsep, duration)
+    stacked = np.maximum(cyl[0], slab[0]), np.minimum(cyl[1], slab[1])
+    stacked_found = cyl[2] & slab[2] & (stacked[0] <= stacked[1])
+
+    # Sitting exactly on a waypoint without altitude, the other drone is checked in 2D
+    at_start = cyl[2] & has_z & z0_missing[seg] & (cyl[0] <= 0.0)
+    at_end = cyl[2] & has_z & z1_missing[seg] & (cyl[1] >= duration)
+
+    zeros = np.zeros(len(seg))
+    pieces = ((cyl[0], cyl[1], cyl[2] & ~has_z),
+              (ball[0], ball[1], ball[2] & has_z),
+              (stacked[0], stacked[1], stacked_found & has_z),
+              (zeros, zeros, at_start),
+              (duration, duration, at_end))
+    starts = np.concatenate([u_start[found] + (t0[seg] - times[k])[found] for u_start, _, found in pieces])
+    ends = np.concatenate([u_end[found] + (t0[seg] - times[k])[found] for _, u_end, found in pieces])
+    owners = np.concatenate([drone_idx[seg][found] for _, _, found in pieces])
+
+    starts, ends = starts - DELAY_TOLERANCE, ends + DELAY_TOLERANCE
+    in_range = (ends >= min_delay) & (starts <= max_delay)
+    starts, ends, owners = np.maximum(starts[in_range], min_delay), np.minimum(ends[in_range], max_delay), owners[in_range]
+
+    # Several missions may share one drone id: group by id
+    id_table: Dict[str, int] = {}
+    mission_ids = np.array([id_table.setdefault(m.drone_id, len(id_table)) for m in others], dtype=int)
+    owner_ids = mission_ids[owners] if len(owners) else owners
+    drone_names = list(id_table)
+    blocked = {}
+    for idx in np.unique(owner_ids):
+        mask = owner_ids == idx
+        blocked[drone_names[idx]] = _merge_intervals(starts[mask], ends[mask])
+    return blocked
+
+
+def departure_slots(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    min_delay: float,
+    max_delay: float,
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+    time_resolution: float = TIME_STEP_RESOLUTION,
+    separation: Optional[SeparationTable] = None
+) -> List[Tuple[float, float]]:
+    """
+    Returns every conflict-free departure delay in [min_delay, max_delay], as sorted
+    (start, end) intervals: delaying the primary by any value inside them gives a clear
+    deconfliction_query with the same thresholds (or separation table) and time resolution.
+    """
+    blocked = forbidden_delay_intervals(primary_mission, other_drone_schedules, min_delay, max_delay,
+                                        safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold,
+                                        time_resolution, separation)
+    forbidden = np.concatenate(list(blocked.values())) if blocked else np.empty((0, 2))
+    forbidden = _merge_intervals(forbidden[:, 0], forbidden[:, 1])
+
+    slots = []
+    slot_start = min_delay
+    for start, end in forbidden.tolist():
+        if start > slot_start:
+            slots.append((slot_start, start))
+        slot_start = max(slot_start, end)
+    if slot_start < max_delay or not len(forbidden):
+        slots.append((slot_start, max_delay))
+    return slots
+
+
+def earliest_departure_delay(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    min_delay: float,
+    max_delay: float,
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+    time_resolution: float = TIME_STEP_RESOLUTION,
+    separation: Optional[SeparationTable] = None
+) -> Optional[float]:
+    """Returns the smallest conflict-free delay in [min_delay, max_delay], or None if there is none."""
+    slots = departure_slots(primary_mission, other_drone_schedules, min_delay, max_delay,
+                            safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold, time_resolution,
+                            separation)
+    return slots[0][0] if slots else None
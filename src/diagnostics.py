@@ -0,0 +1,100 @@
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from data_structures import Waypoint, DroneMission
+from conflict_set import ConflictSet
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read (non-Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Highest resident set size this process has reached, or None without the resource module."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024 # Bytes on macOS, kilobytes on Linux
+
+
+def open_figure_count() -> Optional[int]:
+    """Number of matplotlib figures still open, or None if pyplot was never imported."""
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    return len(pyplot.get_fignums()) if pyplot is not None else None
+
+
+def live_object_counts() -> Dict[str, int]:
+    """
+    Counts the live waypoints, missions and conflict containers (and the bytes held in
+    ConflictSet records). Walks every object the garbage collector tracks, so it costs
+    time proportional to the heap: meant for diagnostics, not for hot paths.
+    """
+    counts = {"waypoints": 0, "missions": 0, "conflict_sets": 0, "conflict_set_bytes": 0}
+    for obj in gc.get_objects():
+        if isinstance(obj, Waypoint):
+            counts["waypoints"] += 1
+        elif isinstance(obj, DroneMission):
+            counts["missions"] += 1
+        elif isinstance(obj, ConflictSet):
+            counts["conflict_sets"] += 1
+            counts["conflict_set_bytes"] += obj.records.nbytes
+    return counts
+
+
+def memory_report(top: int = 10, count_objects: bool = True) -> Dict[str, Any]:
+    """
+    Snapshot of the process's memory use for live diagnostics:
+    - rss_bytes / peak_rss_bytes: current and peak resident set size
+    - open_figures: matplotlib figures not yet closed (None if pyplot is not loaded)
+    - objects: live_object_counts(), unless count_objects is False
+    - tracemalloc: current and peak traced bytes plus the `top` allocation sites,
+      or None when tracemalloc is not tracing (start it with tracemalloc.start())
+    """
+    report: Dict[str, Any] = {
+        "rss_bytes": current_rss_bytes(),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "open_figures": open_figure_count(),
+        "objects": live_object_counts() if count_objects else None,
+        "tracemalloc": None,
+    }
+    if tracemalloc.is_tracing():
+        traced, peak = tracemalloc.get_traced_memory()
+        statistics = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        report["tracemalloc"] = {
+            "traced_bytes": traced,
+            "peak_traced_bytes": peak,
+            "top_sites": [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+                          for stat in statistics],
+        }
+    return report
+
+
+def measure_allocation(build: Callable[[], Any]) -> Tuple[Any, int, int]:
+    """
+    Runs `build` under tracemalloc and returns (result, bytes still allocated by it,
+    peak bytes allocated while it ran). The result is kept alive so its memory counts.
+    Tracing is started (and stopped again) if it is not already on.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    gc.collect()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        result = build()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+    return result, after - before, peak - before
@@ -0,0 +1,268 @@
+import multiprocessing
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
+
+from data_structures import DroneMission
+from conflict_checker import find_conflicts, get_mission_arrays, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from conflict_set import ConflictSet
+from interface import STATUS_CLEAR, STATUS_CONFLICT
+from recurring import RecurringMission
+from separation import SeparationTable
+
+TileKey = Tuple[int, int]
+
+
+def mission_tiles(mission: DroneMission, tile_size: float, halo: float = 0.0) -> Set[TileKey]:
+    """
+    Tiles touched by the bounding box of any mission segment, grown by `halo`.
+    A single-waypoint mission touches the tiles around its point.
+    """
+    _, xs, ys, _ = get_mission_arrays(mission)
+    if len(xs) > 1:
+        x_lo, x_hi = np.minimum(xs[:-1], xs[1:]), np.maximum(xs[:-1], xs[1:])
+        y_lo, y_hi = np.minimum(ys[:-1], ys[1:]), np.maximum(ys[:-1], ys[1:])
+    else:
+        x_lo = x_hi = xs
+        y_lo = y_hi = ys
+    ix0, ix1 = np.floor((x_lo - halo) / tile_size).astype(int), np.floor((x_hi + halo) / tile_size).astype(int)
+    iy0, iy1 = np.floor((y_lo - halo) / tile_size).astype(int), np.floor((y_hi + halo) / tile_size).astype(int)
+    tiles = set()
+    for a0, a1, b0, b1 in zip(ix0.tolist(), ix1.tolist(), iy0.tolist(), iy1.tolist()):
+        tiles.update((ix, iy) for ix in range(a0, a1 + 1) for iy in range(b0, b1 + 1))
+    return tiles
+
+
+def _worker_loop(conn) -> None:
+    """
+    Tile worker: keeps the missions of its tiles and answers queries against them.
+    Messages are tuples (command, *args); every message gets exactly one reply.
+    "add" stores a mission in some tiles (replacing the drone's mission object);
+    "remove" takes the drone out of some tiles, and drops its mission once it holds none.
+    """
+    missions: Dict[str, DroneMission] = {}
+    tiles: Dict[TileKey, Set[str]] = {}
+    held: Dict[str, Set[TileKey]] = {} # drone_id -> tiles holding it
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        except Exception as exc: # Received but could not be unpickled: still one reply
+            conn.send(("error", repr(exc)))
+            continue
+        command = message[0]
+        try:
+            if command == "add":
+                _, mission, mission_tile_keys = message
+                missions[mission.drone_id] = mission
+                held.setdefault(mission.drone_id, set()).update(mission_tile_keys)
+                for tile in mission_tile_keys:
+                    tiles.setdefault(tile, set()).add(mission.drone_id)
+                conn.send(("ok", None))
+            elif command == "remove":
+                _, drone_id, mission_tile_keys = message
+                remaining = held.get(drone_id, set())
+                remaining.difference_update(mission_tile_keys)
+                if not remaining:
+                    held.pop(drone_id, None)
+                    missions.pop(drone_id, None)
+                for tile in mission_tile_keys:
+                    holders = tiles.get(tile)
+                    if holders is not None:
+                        holders.discard(drone_id)
+                        if not holders:
+                            del tiles[tile]
+                conn.send(("ok", None))
+            elif command == "query":
+                _, primary, query_tiles, thresholds, separation = message
+                drone_ids = set().union(*(tiles.get(tile, ()) for tile in query_tiles))
+                others = [missions[drone_id] for drone_id in sorted(drone_ids)]
+                conn.send(("ok", find_conflicts(primary, others, *thresholds, separation=separation)))
+            elif command == "stats":
+                conn.send(("ok", {"missions": len(missions), "tiles": len(tiles)}))
+            elif command == "stop":
+                conn.send(("ok", None))
+                break
+            else:
+                conn.send(("error", f"Unknown command '{command}'."))
+        except Exception as exc: # Report to the coordinator instead of dying silently
+            conn.send(("error", repr(exc)))
+    conn.close()
+
+
+class DistributedDeconflictor:
+    """
+    Coordinator of a tiled deconfliction service running in local worker processes.
+    The plane is cut into square tiles, each owned by one worker (tiles are dealt out
+    by hash). A mission is stored in every tile its segments come within the halo of,
+    the halo being the largest safety buffer, so the tile holding the primary at any
+    time knows every drone close enough to conflict with it. A query is sent to the
+    workers owning the tiles the primary crosses; their conflicts are merged, drop the
+    duplicates found near tile borders, and come back in check_for_conflicts order.
+    With a `separation` table, workers use its per-pair minima and the halo is the
+    largest minima of any pair (SeparationTable.max_minima).
+    """
+    def __init__(self,
+                 tile_size: float = 500.0,
+                 num_workers: int = 2,
+                 safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+                 safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+                 vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+                 time_resolution: float = TIME_STEP_RESOLUTION,
+                 separation: Optional[SeparationTable] = None):
+        if tile_size <= 0 or num_workers <= 0:
+            raise ValueError("Tile size and number of workers must be positive.")
+        if separation is not None:
+            safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold = separation.max_minima()
+        self.tile_size = float(tile_size)
+        self.num_workers = num_workers
+        self.halo = max(safety_buffer_2d, safety_buffer_3d)
+        self.thresholds = (safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold, time_resolution)
+        self.separation = separation
+        self._connections = []
+        self._processes = []
+        # drone_id -> (acceptance sequence, tiles, mission), the mission kept to restore failed replacements
+        self._missions: Dict[str, Tuple[int, Set[TileKey], DroneMission]] = {}
+        self._next_sequence = 0
+
+    # --- Lifecycle ---
+    def start(self) -> "DistributedDeconflictor":
+        for _ in range(self.num_workers):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+        return self
+
+    def close(self) -> None:
+        for conn in self._connections:
+            try:
+                conn.send(("stop",))
+                conn.recv()
+            except (EOFError, BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections, self._processes = [], []
+
+    def __enter__(self) -> "DistributedDeconflictor":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._missions)
+
+    # --- Routing ---
+    def worker_of(self, tile: TileKey) -> int:
+        return hash(tile) % self.num_workers
+
+    def _by_worker(self, tiles: Set[TileKey]) -> Dict[int, List[TileKey]]:
+        routed: Dict[int, List[TileKey]] = {}
+        for tile in tiles:
+            routed.setdefault(self.worker_of(tile), []).append(tile)
+        return routed
+
+    def _exchange(self, messages: Dict[int, tuple]) -> Tuple[Dict[int, object], Dict[int, str]]:
+        """
+        Sends one message per worker, then collects every reply, so workers run in parallel
+        and no reply is left behind in a pipe. Returns (replies, errors) by worker.
+        """
+        if not self._connections:
+            raise RuntimeError("Distributed deconflictor is not started.")
+        for worker, message in messages.items():
+            self._connections[worker].send(message)
+        replies, errors = {}, {}
+        for worker in messages:
+            status, payload = self._connections[worker].recv()
+            if status == "ok":
+                replies[worker] = payload
+            else:
+                errors[worker] = payload
+        return replies, errors
+
+    @staticmethod
+    def _raise_errors(errors: Dict[int, str]) -> None:
+        if errors:
+            raise RuntimeError("Workers failed: " + "; ".join(f"worker {worker}: {error}"
+                                                               for worker, error in sorted(errors.items())))
+
+    def _fan_out(self, messages: Dict[int, tuple]) -> Dict[int, object]:
+        """_exchange, raising one error for all the workers that failed."""
+        replies, errors = self._exchange(messages)
+        self._raise_errors(errors)
+        return replies
+
+    # --- Schedule ---
+    def add_mission(self, mission: DroneMission) -> None:
+        """
+        Stores an accepted mission in every tile it reaches, replacing an earlier one of the
+        same drone. The new mission is stored before the old one's remaining tiles are
+        released; if any worker fails, the earlier mission (if any) stays scheduled as it was.
+        """
+        if isinstance(mission, RecurringMission):
+            raise ValueError(f"Recurring mission {mission.drone_id} cannot be distributed: add its .repetitions() instead.")
+        previous = self._missions.get(mission.drone_id)
+        tiles = mission_tiles(mission, self.tile_size, self.halo)
+        routed = self._by_worker(tiles)
+        replies, errors = self._exchange({worker: ("add", mission, worker_tiles) for worker, worker_tiles in routed.items()})
+        if errors:
+            # Take the new mission back out of the workers that stored it and put the earlier
+            # one back, so all workers agree on what is scheduled
+            _, rollback_errors = self._exchange({worker: ("remove", mission.drone_id, routed[worker]) for worker in replies})
+            if previous is not None:
+                _, old_tiles, old_mission = previous
+                _, restore_errors = self._exchange({worker: ("add", old_mission, worker_tiles)
+                                                    for worker, worker_tiles in self._by_worker(old_tiles).items()})
+                rollback_errors.update(restore_errors)
+            self._raise_errors({**errors, **rollback_errors})
+        self._missions[mission.drone_id] = (self._next_sequence, tiles, mission)
+        self._next_sequence += 1
+        stale = previous[1] - tiles if previous is not None else set()
+        if stale:
+            self._fan_out({worker: ("remove", mission.drone_id, worker_tiles)
+                           for worker, worker_tiles in self._by_worker(stale).items()})
+
+    def remove_mission(self, drone_id: str) -> None:
+        if drone_id not in self._missions:
+            raise KeyError(f"No mission scheduled for drone '{drone_id}'.")
+        _, tiles, _ = self._missions.pop(drone_id)
+        self._fan_out({worker: ("remove", drone_id, worker_tiles)
+                       for worker, worker_tiles in self._by_worker(tiles).items()})
+
+    def worker_stats(self) -> List[Dict[str, int]]:
+        replies = self._fan_out({worker: ("stats",) for worker in range(len(self._connections))})
+        return [replies[worker] for worker in range(len(self._connections))]
+
+    # --- Queries ---
+    def find_conflicts(self, primary_mission: DroneMission) -> ConflictSet:
+        """Conflicts of the primary with the stored missions, as a single find_conflicts run would return them."""
+        if self.separation is not None and max(self.separation.max_minima()[:2]) > self.halo:
+            raise ValueError("Separation minima grew beyond the tile halo; restart the deconflictor.")
+        tiles = mission_tiles(primary_mission, self.tile_size)
+        replies = self._fan_out({worker: ("query", primary_mission, worker_tiles, self.thresholds, self.separation)
+                                 for worker, worker_tiles in self._by_worker(tiles).items()})
+        merged = ConflictSet.concatenate(replies.values())
+        if not len(merged):
+            return merged
+
+        # A drone stored in tiles of several workers is reported by each of them
+        records = merged.records
+        sequence = np.array([self._missions[d][0] if d in self._missions else -1 for d in merged.drone_ids])
+        order = np.lexsort((sequence[records["other_id"]], records["time"]))
+        ordered = records[order]
+        duplicate = np.zeros(len(ordered), dtype=bool)
+        duplicate[1:] = (ordered["time"][1:] == ordered["time"][:-1]) & \
+                        (ordered["other_id"][1:] == ordered["other_id"][:-1])
+        return ConflictSet(ordered[~duplicate], merged.drone_ids)
+
+    def deconfliction_query(self, primary_mission: DroneMission) -> Tuple[str, ConflictSet]:
+        """Same contract as interface.deconfliction_query, with the thresholds set on the coordinator."""
+        conflicts = self.find_conflicts(primary_mission)
+        return (STATUS_CONFLICT if conflicts else STATUS_CLEAR), conflicts
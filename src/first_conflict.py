@@ -0,0 +1,127 @@
+import numpy as np
+from typing import List, Optional
+
+from data_structures import DroneMission
+from conflict_checker import ConflictInfo, find_conflicts, get_check_times, get_check_window, get_mission_arrays, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from kernels import pack_tracks
+from recurring import RecurringMission
+from separation import SeparationTable
+
+ORDERINGS = ("likelihood", "schedule")
+
+
+def _mission_boxes(missions: List[DroneMission]) -> np.ndarray:
+    """
+    (N x 8) array of t_start, t_end, x_min, x_max, y_min, y_max, z_min, z_max; z is NaN
+    unless every waypoint has one. A recurring mission spans all its repetitions.
+    """
+    offsets, ts, xs, ys, zs = pack_tracks([m.repetition_track(0) if isinstance(m, RecurringMission)
+                                           else get_mission_arrays(m) for m in missions])
+    starts = offsets[:-1]
+    boxes = np.column_stack([reduce.reduceat(values, starts) for values in (ts, xs, ys, zs)
+                             for reduce in (np.minimum, np.maximum)])
+    for i, mission in enumerate(missions):
+        if isinstance(mission, RecurringMission):
+            boxes[i, 1] = mission.get_end_time()
+    return boxes
+
+
+def _flies_within(mission: DroneMission, start: float, end: float) -> bool:
+    """True if the mission (any repetition of a recurring one) flies at some time in [start, end]."""
+    if not isinstance(mission, RecurringMission):
+        return mission.get_start_time() <= end + 1e-6 and start <= mission.get_end_time() + 1e-6
+    first = np.searchsorted(mission.start_times, start - mission.duration - 1e-6, side='left')
+    return first < len(mission) and mission.start_times[first] <= end + 1e-6
+
+
+def conflict_likelihood_order(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+    separation: Optional[SeparationTable] = None
+) -> np.ndarray:
+    """
+    Indices of the other missions that can conflict with the primary, most likely
+    offenders first. Ranks by the distance between the missions' bounding boxes (in
+    units of the pair's horizontal reach), then by how much of the primary's flight
+    time they share. Missions that never fly at the same time as the primary, or whose
+    boxes stay farther apart than the separation minima, are left out.
+    A recurring mission is ranked as a whole, on the box of all its repetitions, and left
+    out if none of them flies during the primary's window.
+    """
+    if not other_drone_schedules:
+        return np.empty(0, dtype=np.int64)
+    if separation is None:
+        n = len(other_drone_schedules)
+        buf2, buf3, vsep = np.full(n, safety_buffer_2d), np.full(n, safety_buffer_3d), np.full(n, vertical_sep_threshold)
+    else:
+        buf2, buf3, vsep = separation.mission_thresholds(primary_mission, other_drone_schedules)
+    reach, reach_z = np.maximum(buf2, buf3), np.maximum(buf3, vsep)
+
+    p = _mission_boxes([primary_mission])[0]
+    window_start, window_end = get_check_window(primary_mission)
+    p[0], p[1] = max(p[0], window_start), min(p[1], window_end)
+    o = _mission_boxes(other_drone_schedules)
+    shared_time = np.minimum(p[1], o[:, 1]) - np.maximum(p[0], o[:, 0])
+    gap_x = np.maximum(0.0, np.maximum(o[:, 2] - p[3], p[2] - o[:, 3]))
+    gap_y = np.maximum(0.0, np.maximum(o[:, 4] - p[5], p[4] - o[:, 5]))
+    gap_z = np.nan_to_num(np.maximum(0.0, np.maximum(o[:, 6] - p[7], p[6] - o[:, 7]))) # 0 unless both are fully 3D
+    gap = np.hypot(gap_x, gap_y)
+
+    possible = (shared_time >= -1e-6) & (gap < reach) & (gap_z < reach_z)
+    possible &= np.array([not isinstance(m, RecurringMission) or _flies_within(m, p[0], p[1])
+                          for m in other_drone_schedules])
+    possible &= np.array([m.drone_id != primary_mission.drone_id for m in other_drone_schedules])
+    candidates = np.flatnonzero(possible)
+    overlap_share = shared_time[candidates] / max(p[1] - p[0], 1e-6)
+    return candidates[np.lexsort((-overlap_share, gap[candidates] / reach[candidates]))]
+
+
+def find_first_conflict(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+    time_resolution: float = TIME_STEP_RESOLUTION,
+    ordering: str = "likelihood",
+    separation: Optional[SeparationTable] = None
+) -> Optional[ConflictInfo]:
+    """
+    Fast reject: returns one confirmed conflict of the primary (the earliest one with the
+    first offending drone found), or None if the mission is clear.
+    Drones are checked in batches of doubling size, most likely offenders first with the
+    default "likelihood" ordering (see conflict_likelihood_order) or in schedule order
+    with "schedule", and checking stops at the first batch holding a conflict. A clear
+    mission is checked completely, so the answer is the same as find_conflicts'.
+    Recurring missions are ranked and checked as a whole, without expanding them; the
+    conflict returned for one is with its earliest conflicting repetition.
+    """
+    if ordering not in ORDERINGS:
+        raise ValueError(f"Unknown ordering '{ordering}'. Valid orderings: {ORDERINGS}")
+    if ordering == "likelihood":
+        order = conflict_likelihood_order(primary_mission, other_drone_schedules, safety_buffer_2d,
+                                          safety_buffer_3d, vertical_sep_threshold, separation)
+    else:
+        order = np.arange(len(other_drone_schedules))
+
+    times = get_check_times(primary_mission, time_resolution)
+    start, batch_size = 0, 1
+    while start < len(order):
+        batch = [other_drone_schedules[i] for i in order[start:start + batch_size]]
+        conflicts = find_conflicts(primary_mission, batch, safety_buffer_2d, safety_buffer_3d,
+                                   vertical_sep_threshold, time_resolution, times=times, separation=separation)
+        if conflicts:
+            # The earliest conflict of the highest-ranked offender in the batch; repetitions
+            # ("<id>#<k>") of a recurring mission share its rank
+            rank = {m.drone_id: position for position, m in reversed(list(enumerate(batch)))}
+            id_rank = np.array([rank.get(d, rank.get(d.rsplit("#", 1)[0], len(batch))) for d in conflicts.drone_ids])
+            row_rank = id_rank[conflicts.records["other_id"]]
+            return conflicts.filter(row_rank == row_rank.min())[0]
+        start += batch_size
+        batch_size *= 2
+    return None
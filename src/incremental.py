@@ -0,0 +1,92 @@
+import numpy as np
+from typing import List, Optional, Tuple, Union
+
+from data_structures import DroneMission
+from conflict_checker import find_conflicts, get_check_times, get_check_window, ConflictInfo, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from conflict_set import ConflictSet
+
+
+def _waypoint_key(wp) -> Tuple[float, float, Optional[float], float]:
+    return (wp.x, wp.y, wp.z, wp.timestamp)
+
+
+def amended_time_window(old_mission: DroneMission, new_mission: DroneMission) -> Optional[Tuple[float, float]]:
+    """
+    Returns the (start, end) time span in which the two versions of a mission can put the
+    drone in different places, or None if they are identical. Waypoints shared as a common
+    prefix or suffix (same position and timestamp) bound the span; an end of -inf/inf means
+    the change reaches the start/end of the mission.
+    """
+    old_keys = [_waypoint_key(wp) for wp in old_mission.waypoints]
+    new_keys = [_waypoint_key(wp) for wp in new_mission.waypoints]
+    if old_keys == new_keys and get_check_window(old_mission) == get_check_window(new_mission):
+        return None
+
+    max_common = min(len(old_keys), len(new_keys))
+    prefix = 0
+    while prefix < max_common and old_keys[prefix] == new_keys[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < max_common - prefix and old_keys[-1 - suffix] == new_keys[-1 - suffix]:
+        suffix += 1
+
+    # The segment leaving the last shared waypoint (and entering the first shared one) changed
+    window_start = old_keys[prefix - 1][3] if prefix > 0 else -np.inf
+    window_end = old_keys[len(old_keys) - suffix][3] if suffix > 0 else np.inf
+    if get_check_window(old_mission)[1] != get_check_window(new_mission)[1]:
+        window_end = np.inf # The final clamped sample time moves with the end of the window
+    return window_start, window_end
+
+
+def recheck_amended_mission(
+    old_mission: DroneMission,
+    new_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    previous_conflicts: Union[List[ConflictInfo], ConflictSet],
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+    time_resolution: float = TIME_STEP_RESOLUTION
+) -> ConflictSet:
+    """
+    Re-checks an amended mission against an unchanged fleet, given the conflicts found
+    for the old version with the same thresholds and time resolution.
+    Only the check times inside the amended window are re-evaluated (against the drones
+    flying then); conflicts outside it are reused. The result equals a full find_conflicts
+    run on `new_mission`.
+    """
+    previous = ConflictSet.from_conflicts(previous_conflicts)
+    same_grid = (old_mission.drone_id == new_mission.drone_id and
+                 get_check_window(old_mission)[0] == get_check_window(new_mission)[0])
+    if not same_grid:
+        return find_conflicts(new_mission, other_drone_schedules, safety_buffer_2d,
+                              safety_buffer_3d, vertical_sep_threshold, time_resolution)
+
+    window = amended_time_window(old_mission, new_mission)
+    if window is None:
+        return previous
+    window_start, window_end = window
+
+    times = get_check_times(new_mission, time_resolution)
+    times = times[(times >= window_start) & (times <= window_end)]
+    active_others = [m for m in other_drone_schedules
+                     if len(times) and m.get_start_time() <= times[-1] + 1e-6 and m.get_end_time() >= times[0] - 1e-6]
+    rechecked = find_conflicts(new_mission, active_others, safety_buffer_2d, safety_buffer_3d,
+                               vertical_sep_threshold, time_resolution, times=times)
+
+    reused = previous.filter((previous.times < window_start) | (previous.times > window_end))
+    merged = ConflictSet.concatenate([reused, rechecked])
+    if not len(merged):
+        return merged
+
+    # Restore check_for_conflicts ordering: by time, then by position in the schedule list.
+    # Repetition "<id>#<k>" of a RecurringMission ranks at its template's position; the
+    # stable sort keeps repetitions of one template in find_conflicts order
+    schedule_rank = {}
+    for rank, mission in enumerate(other_drone_schedules):
+        schedule_rank.setdefault(mission.drone_id, rank)
+    id_rank = np.array([schedule_rank.get(d, schedule_rank.get(d.rsplit("#", 1)[0], -1)) for d in merged.drone_ids])
+    order = np.lexsort((id_rank[merged.records["other_id"]], merged.times))
+    return merged[order]
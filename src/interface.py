@@ -1,15 +1,199 @@
-# src/interface.py
+import time
+import numpy as np
+from typing import List, Optional, Tuple, Dict, Any
 
-from src.data_structures import Mission2D
-from src.conflict_checker import detect_conflicts_2d, ConflictReport2D
+from data_structures import PrimaryDroneMission, DroneMission
+from conflict_checker import find_conflicts, check_for_conflicts_2d, get_check_times, \
+                             get_positions_at_times, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from conflict_set import ConflictSet
+from separation import SeparationTable
+from zones import ZoneIndex
+from first_conflict import find_first_conflict
+from recurring import RecurringMission, repetition_min_separation
 
-def check_mission(primary: Mission2D, simulated_flights: List[Mission2D], safety_buffer: float = 5.0, dt: float = 0.1) -> ConflictReport2D:
+STATUS_CLEAR = "clear"
+STATUS_CONFLICT = "conflict detected"
+
+# (conflicting_drone_id, first conflict time, last conflict time)
+ConflictInterval = Tuple[str, float, float]
+
+
+class ConflictReport:
+    """Structured result of a deconfliction query."""
+    def __init__(self,
+                 conflicts: ConflictSet,
+                 intervals: List[ConflictInterval],
+                 min_separation: Optional[float],
+                 stats: Dict[str, Any]):
+        self.conflicts = conflicts
+        self.intervals = intervals
+        self.min_separation = min_separation # None if the primary never shares airspace time with another drone
+        self.stats = stats
+
+    @property
+    def status(self) -> str:
+        return STATUS_CONFLICT if self.conflicts else STATUS_CLEAR
+
+    @property
+    def is_clear(self) -> bool:
+        return not self.conflicts
+
+    @property
+    def conflicting_drone_ids(self) -> List[str]:
+        """Ids of the drones in conflict with the primary, in order of first conflict."""
+        return list(dict.fromkeys(drone_id for drone_id, _, _ in self.intervals))
+
+    def __repr__(self) -> str:
+        min_sep_str = f"{self.min_separation:.2f}" if self.min_separation is not None else "N/A"
+        return (f"ConflictReport(status='{self.status}', "
+                f"conflicts={len(self.conflicts)}, intervals={len(self.intervals)}, "
+                f"min_separation={min_sep_str})")
+
+
+def merge_conflict_intervals(conflicts: ConflictSet, time_res: float) -> List[ConflictInterval]:
+    """
+    Merges per-time-step conflicts into contiguous intervals per conflicting drone.
+    Two conflicts are contiguous when they are at most one time step apart.
+    """
+    intervals: List[ConflictInterval] = []
+    for drone_id, drone_conflicts in ConflictSet.from_conflicts(conflicts).group_by_drone().items():
+        times = drone_conflicts.times
+        breaks = np.nonzero(np.diff(times) > time_res + 1e-6)[0]
+        starts = np.concatenate(([0], breaks + 1))
+        ends = np.concatenate((breaks, [len(times) - 1]))
+        intervals.extend((drone_id, float(times[s]), float(times[e])) for s, e in zip(starts, ends))
+    intervals.sort(key=lambda interval: (interval[1], interval[0]))
+    return intervals
+
+
+def compute_min_separation(
+    primary_mission: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    time_res: float = TIME_STEP_RESOLUTION
+) -> Optional[float]:
+    """
+    Smallest separation between the primary and any other drone over the check times.
+    Uses the 3D distance when both drones have an altitude, the horizontal distance otherwise.
+    """
+    times = get_check_times(primary_mission, time_res)
+    px, py, pz, p_active = get_positions_at_times(primary_mission, times)
+
+    min_sep = np.inf
+    for other_drone in other_drone_schedules:
+        if other_drone.drone_id == primary_mission.drone_id:
+            continue
+        if isinstance(other_drone, RecurringMission):
+            min_sep = min(min_sep, repetition_min_separation(other_drone, times, (px, py, pz, p_active)))
+            continue
+        ox, oy, oz, o_active = get_positions_at_times(other_drone, times)
+        both_active = p_active & o_active
+        if not both_active.any():
+            continue
+        dz = np.where(np.isnan(pz) | np.isnan(oz), 0.0, pz - oz)
+        separation = np.sqrt((px - ox)**2 + (py - oy)**2 + dz**2)
+        min_sep = min(min_sep, float(separation[both_active].min()))
+
+    return None if np.isinf(min_sep) else min_sep
+
+
+def _run_conflict_check(
+    primary: DroneMission,
+    other_drone_schedules: List[DroneMission],
+    safety_buffer_2d: float,
+    safety_buffer_3d: float,
+    vertical_sep: float,
+    time_res: float,
+    separation: Optional[SeparationTable] = None,
+    zones: Optional[ZoneIndex] = None
+) -> Tuple[ConflictSet, str]:
+    """Dispatches to the fastest checker valid for the primary. Returns (conflicts, check path name)."""
+    if primary.is_mission_3d():
+        return find_conflicts(primary, other_drone_schedules, safety_buffer_2d, safety_buffer_3d,
+                              vertical_sep, time_res, separation=separation, zones=zones), "generic"
+    conflicts = check_for_conflicts_2d(primary, other_drone_schedules, safety_buffer_2d, time_res,
+                                       separation=separation)
+    if zones is not None:
+        conflicts = zones.add_violations(primary, conflicts)
+    return conflicts, "2d-vectorized"
+
+
+def check_mission(
+    primary: DroneMission,
+    simulated_flights: List[DroneMission],
+    safety_buffer: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    dt: float = TIME_STEP_RESOLUTION,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep: float = VERTICAL_SEPARATION_THRESHOLD,
+    separation: Optional[SeparationTable] = None,
+    zones: Optional[ZoneIndex] = None
+) -> ConflictReport:
     """
     Query interface for external users:
-      - primary: Mission2D for the primary drone
-      - simulated_flights: list of Mission2D for other drones
-      - safety_buffer: minimum allowed separation (default 5.0 m)
-      - dt: time resolution for sampling (default 0.1 s)
-    Returns a ConflictReport2D with status and details.
+      - primary: mission of the primary drone (2D or 3D)
+      - simulated_flights: list of DroneMission (or RecurringMission) for other drones
+      - safety_buffer: minimum allowed horizontal separation (meters)
+      - dt: time resolution for sampling (seconds)
+      - safety_buffer_3d, vertical_sep: thresholds used when both drones are 3D
+      - separation: optional SeparationTable of per-category minima replacing the thresholds
+      - zones: optional ZoneIndex of no-fly zones the primary must stay out of
+    Pure-2D primaries are dispatched to the vectorized check_for_conflicts_2d path.
+    Returns a ConflictReport with status, conflict intervals, minimum separation and stats.
     """
-    return detect_conflicts_2d(primary, simulated_flights, safety_buffer, dt)
+    started = time.perf_counter()
+    conflicts, check_path = _run_conflict_check(primary, simulated_flights, safety_buffer,
+                                                safety_buffer_3d, vertical_sep, dt, separation, zones)
+    elapsed = time.perf_counter() - started
+
+    stats = {
+        "check_path": check_path,
+        "drones_checked": sum(1 for m in simulated_flights if m.drone_id != primary.drone_id),
+        "time_steps": len(get_check_times(primary, dt)),
+        "conflict_count": len(conflicts),
+        "elapsed_s": elapsed
+    }
+    return ConflictReport(
+        conflicts=conflicts,
+        intervals=merge_conflict_intervals(conflicts, dt),
+        min_separation=compute_min_separation(primary, simulated_flights, dt),
+        stats=stats
+    )
+
+
+def deconfliction_query(
+    primary_mission: PrimaryDroneMission,
+    other_drone_schedules: List[DroneMission],
+    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+    vertical_sep: float = VERTICAL_SEPARATION_THRESHOLD,
+    time_res: float = TIME_STEP_RESOLUTION,
+    separation: Optional[SeparationTable] = None,
+    zones: Optional[ZoneIndex] = None,
+    stop_at_first: bool = False
+) -> Tuple[str, ConflictSet]:
+    """
+    Accepts the primary drone's mission and simulated flight schedules,
+    returns a status ("clear" or "conflict detected") and conflict details.
+    The ConflictSet can be iterated or indexed like a list of ConflictInfo dicts.
+    With a `separation` table, minima depend on the aircraft categories of each pair;
+    with a `zones` index, no-fly zone violations are reported alongside drone conflicts.
+    With `stop_at_first`, checking stops at the first confirmed conflict (likely offenders
+    are checked first, see first_conflict.py) and only that conflict is returned.
+    """
+    if stop_at_first:
+        violations = zones.violations(primary_mission) if zones is not None else ConflictSet()
+        if violations:
+            return STATUS_CONFLICT, violations[:1]
+        conflict = find_first_conflict(primary_mission, other_drone_schedules, safety_buffer_2d, safety_buffer_3d,
+                                       vertical_sep, time_res, separation=separation)
+        if conflict is None:
+            return STATUS_CLEAR, ConflictSet(drone_ids=[primary_mission.drone_id])
+        return STATUS_CONFLICT, ConflictSet.from_conflicts([conflict])
+
+    conflicts, _ = _run_conflict_check(primary_mission, other_drone_schedules, safety_buffer_2d,
+                                       safety_buffer_3d, vertical_sep, time_res, separation, zones)
+    if not conflicts:
+        return STATUS_CLEAR, conflicts
+    else:
+        return STATUS_CONFLICT, conflicts
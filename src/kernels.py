@@ -0,0 +1,289 @@
+"""
+Inner loops of the conflict checker: segment lookup, linear interpolation and
+threshold tests for one primary against many other drones over a time grid.
+
+A compiled Numba kernel is used when Numba is installed (set the environment
+variable UAV_DISABLE_NUMBA=1 to opt out); otherwise the same contract is met by a
+pure-NumPy fallback that vectorizes over time and over chunks of drones.
+"""
+import math
+import os
+import numpy as np
+from typing import List, Tuple
+
+try:
+    if os.environ.get("UAV_DISABLE_NUMBA"):
+        raise ImportError("Numba disabled by UAV_DISABLE_NUMBA")
+    import numba
+    from numba import prange
+    HAVE_NUMBA = True
+except ImportError:
+    numba = None
+    prange = range
+    HAVE_NUMBA = False
+
+KERNEL_BACKEND = "numba" if HAVE_NUMBA else "numpy"
+
+NO_CONFLICT = -1 # Conflict codes otherwise follow conflict_set.CONFLICT_TYPES
+CODE_2D_PROXIMITY = 0
+CODE_3D_PROXIMITY = 1
+CODE_VERTICAL_SEPARATION = 2
+
+# (timestamps, xs, ys, zs) of one mission's waypoints; missing altitudes are NaN
+Track = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+# (offsets, timestamps, xs, ys, zs): tracks concatenated, track i is [offsets[i], offsets[i+1])
+PackedTracks = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def pack_tracks(tracks: List[Track]) -> PackedTracks:
+    """Concatenates waypoint tracks into flat arrays with an offsets index."""
+    offsets = np.zeros(len(tracks) + 1, dtype=np.int64)
+    if not tracks:
+        empty = np.empty(0, dtype=float)
+        return offsets, empty, empty, empty, empty
+    offsets[1:] = np.cumsum([len(track[0]) for track in tracks])
+    return (offsets,) + tuple(np.concatenate([track[i] for track in tracks]) for i in range(4))
+
+
+def max_track_speeds(packed: PackedTracks) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Top (horizontal, vertical, 3D) speed of each packed track. A jump between waypoints
+    with the same timestamp counts as infinite speed; missing altitudes never move.
+    """
+    offsets, ts, xs, ys, zs = packed
+    dt = np.diff(ts)
+    dh = np.hypot(np.diff(xs), np.diff(ys))
+    dz = np.abs(np.nan_to_num(np.diff(zs)))
+    crosses_track = np.zeros(len(dt), dtype=bool)
+    crosses_track[offsets[1:-1] - 1] = True # From the last waypoint of a track to the next track
+    speeds = []
+    for distance in (dh, dz, np.hypot(dh, dz)):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speed = np.where(distance > 0, distance / dt, 0.0)
+        speed[crosses_track] = 0.0
+        speeds.append(np.maximum.reduceat(np.append(speed, 0.0), offsets[:-1]))
+    return speeds[0], speeds[1], speeds[2]
+
+
+def interpolate_track(ts: np.ndarray, wx: np.ndarray, wy: np.ndarray, wz: np.ndarray,
+                      times: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Positions of a waypoint track at `times`, with the same rules as
+    conflict_checker.get_drone_position_at_time. Returns (xs, ys, zs, active).
+    """
+    n = len(ts)
+    if n == 1:
+        # Single waypoint: the drone only exists at its own timestamp
+        active = np.abs(times - ts[0]) < 1e-6
+        return (np.full(times.shape, wx[0]), np.full(times.shape, wy[0]),
+                np.full(times.shape, wz[0]), active)
+
+    active = (times >= ts[0] - 1e-6) & (times <= ts[-1] + 1e-6)
+
+    # Segment lookup: first segment i whose end timestamp is not before t
+    seg = np.clip(np.searchsorted(ts, times - 1e-6, side='left') - 1, 0, n - 2)
+    t0, t1 = ts[seg], ts[seg + 1]
+    duration = t1 - t0
+    safe_duration = np.where(duration < 1e-6, 1.0, duration)
+    fraction = (times - t0) / safe_duration
+    # Snap onto waypoints like the scalar version: the segment start wins over its end
+    fraction = np.where(np.abs(times - t1) < 1e-6, 1.0, fraction)
+    fraction = np.where((duration < 1e-6) | (np.abs(times - t0) < 1e-6), 0.0, fraction)
+    # At (or beyond) the mission ends the drone sits on the first / last waypoint
+    at_start = times <= ts[0] + 1e-6
+    at_end = (times >= ts[-1] - 1e-6) & ~at_start
+    seg = np.where(at_start, 0, np.where(at_end, n - 2, seg))
+    fraction = np.where(at_start, 0.0, np.where(at_end, 1.0, fraction))
+
+    xs = wx[seg] + fraction * (wx[seg + 1] - wx[seg])
+    ys = wy[seg] + fraction * (wy[seg + 1] - wy[seg])
+
+    z0, z1 = wz[seg], wz[seg + 1]
+    zs = z0 + fraction * (z1 - z0)
+    # If only one end of the segment has an altitude, hold that altitude
+    zs = np.where(np.isnan(z1), z0, zs)
+    zs = np.where(np.isnan(z0), z1, zs)
+    # A drone sitting exactly on a waypoint takes that waypoint's altitude as-is
+    zs = np.where(fraction == 0.0, z0, np.where(fraction == 1.0, z1, zs))
+    return xs, ys, zs, active
+
+
+def interpolate_tracks(packed: PackedTracks, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    interpolate_track for every packed track at once. Returns (tracks x times) arrays
+    (xs, ys, zs, active).
+    """
+    offsets, ts, wx, wy, wz = packed
+    lengths = np.diff(offsets)
+    track_of = np.repeat(np.arange(len(lengths)), lengths)
+
+    # Segment lookup: per track, the number of timestamps before t - 1e-6 (as searchsorted does)
+    shifted = times - 1e-6
+    earlier = np.zeros((len(lengths), len(times) + 1), dtype=np.int64)
+    np.add.at(earlier, (track_of, np.searchsorted(shifted, ts, side='right')), 1)
+    earlier = np.cumsum(earlier[:, :-1], axis=1)
+    first, last = offsets[:-1, None], offsets[1:, None] - 1
+    seg = first + np.clip(earlier - 1, 0, np.maximum(lengths[:, None] - 2, 0))
+    nxt = np.minimum(seg + 1, last)
+
+    t = times[None, :]
+    t0, t1 = ts[seg], ts[nxt]
+    duration = t1 - t0
+    safe_duration = np.where(duration < 1e-6, 1.0, duration)
+    fraction = (t - t0) / safe_duration
+    fraction = np.where(np.abs(t - t1) < 1e-6, 1.0, fraction)
+    fraction = np.where((duration < 1e-6) | (np.abs(t - t0) < 1e-6), 0.0, fraction)
+    at_start = t <= ts[first] + 1e-6
+    at_end = (t >= ts[last] - 1e-6) & ~at_start
+    seg = np.where(at_start, first, np.where(at_end, np.maximum(last - 1, first), seg))
+    nxt = np.minimum(seg + 1, last)
+    fraction = np.where(at_start, 0.0, np.where(at_end, 1.0, fraction))
+
+    single = lengths[:, None] == 1
+    active = np.where(single, np.abs(t - ts[first]) < 1e-6,
+                      (t >= ts[first] - 1e-6) & (t <= ts[last] + 1e-6))
+    fraction = np.where(single, 0.0, fraction)
+
+    xs = wx[seg] + fraction * (wx[nxt] - wx[seg])
+    ys = wy[seg] + fraction * (wy[nxt] - wy[seg])
+    z0, z1 = wz[seg], wz[nxt]
+    zs = z0 + fraction * (z1 - z0)
+    zs = np.where(np.isnan(z1), z0, zs)
+    zs = np.where(np.isnan(z0), z1, zs)
+    zs = np.where(fraction == 0.0, z0, np.where(fraction == 1.0, z1, zs))
+    return xs, ys, zs, active
+
+
+def pair_conflict_codes(dx: np.ndarray, dy: np.ndarray, dz: np.ndarray,
+                        buf2: np.ndarray, buf3: np.ndarray, vsep: np.ndarray) -> np.ndarray:
+    """
+    Conflict codes of primary-minus-other offsets (dz is NaN unless both drones have an
+    altitude), ignoring whether the drones are active. Arguments broadcast together.
+    """
+    dist_2d = np.sqrt(dx * dx + dy * dy)
+    dist_3d = np.sqrt(dx * dx + dy * dy + dz * dz)
+    both_3d = ~np.isnan(dz)
+    codes = np.full(np.broadcast(dx, dy, dz, buf2, buf3, vsep).shape, NO_CONFLICT, dtype=np.int8)
+    with np.errstate(invalid='ignore'):
+        codes[both_3d & (dist_2d < buf2) & (np.abs(dz) < vsep)] = CODE_VERTICAL_SEPARATION
+        codes[both_3d & (dist_3d < buf3)] = CODE_3D_PROXIMITY
+    codes[~both_3d & (dist_2d < buf2)] = CODE_2D_PROXIMITY
+    return codes
+
+
+# Upper bound on (drones x times) cells per NumPy kernel chunk, to bound temporary memory
+_CHUNK_CELLS = 1 << 16
+
+
+def _conflict_codes_numpy(times, px, py, pz, p_active, offsets, ts, xs, ys, zs, buf2, buf3, vsep, codes):
+    """Pure-NumPy kernel: vectorized over time and over chunks of drones."""
+    n_drones = len(offsets) - 1
+    chunk = max(1, _CHUNK_CELLS // max(len(times), 1))
+    for lo in range(0, n_drones, chunk):
+        hi = min(lo + chunk, n_drones)
+        first, last = offsets[lo], offsets[hi]
+        ox, oy, oz, o_active = interpolate_tracks(
+            (offsets[lo:hi + 1] - first, ts[first:last], xs[first:last], ys[first:last], zs[first:last]), times)
+        block = pair_conflict_codes(px - ox, py - oy, pz - oz,
+                                    buf2[lo:hi, None], buf3[lo:hi, None], vsep[lo:hi, None])
+        block[~(p_active & o_active)] = NO_CONFLICT
+        codes[lo:hi] = block
+
+
+def _conflict_codes_loops(times, px, py, pz, p_active, offsets, ts, xs, ys, zs, buf2, buf3, vsep, codes):
+    """
+    Scalar kernel, compiled with Numba when available. `times` must be increasing, which
+    lets each drone walk its segments with a single forward-moving pointer.
+    """
+    n_times = times.shape[0]
+    for d in prange(offsets.shape[0] - 1):
+        lo = offsets[d]
+        hi = offsets[d + 1]
+        seg = lo
+        for k in range(n_times):
+            codes[d, k] = NO_CONFLICT
+            if not p_active[k]:
+                continue
+            t = times[k]
+
+            # --- Segment lookup and interpolation ---
+            if hi - lo == 1:
+                if abs(t - ts[lo]) >= 1e-6:
+                    continue
+                ox = xs[lo]
+                oy = ys[lo]
+                oz = zs[lo]
+            else:
+                if t < ts[lo] - 1e-6 or t > ts[hi - 1] + 1e-6:
+                    continue
+                if t <= ts[lo] + 1e-6:
+                    s = lo
+                    fraction = 0.0
+                elif t >= ts[hi - 1] - 1e-6:
+                    s = hi - 2
+                    fraction = 1.0
+                else:
+                    while seg < hi - 2 and ts[seg + 1] < t - 1e-6:
+                        seg += 1
+                    s = seg
+                    t0 = ts[s]
+                    t1 = ts[s + 1]
+                    if t1 - t0 < 1e-6 or abs(t - t0) < 1e-6:
+                        fraction = 0.0
+                    elif abs(t - t1) < 1e-6:
+                        fraction = 1.0
+                    else:
+                        fraction = (t - t0) / (t1 - t0)
+                ox = xs[s] + fraction * (xs[s + 1] - xs[s])
+                oy = ys[s] + fraction * (ys[s + 1] - ys[s])
+                z0 = zs[s]
+                z1 = zs[s + 1]
+                if fraction == 0.0:
+                    oz = z0
+                elif fraction == 1.0:
+                    oz = z1
+                elif np.isnan(z0):
+                    oz = z1
+                elif np.isnan(z1):
+                    oz = z0
+                else:
+                    oz = z0 + fraction * (z1 - z0)
+
+            # --- Threshold tests ---
+            dx = px[k] - ox
+            dy = py[k] - oy
+            dist_2d = math.sqrt(dx * dx + dy * dy)
+            if not np.isnan(pz[k]) and not np.isnan(oz):
+                dz = pz[k] - oz
+                if math.sqrt(dx * dx + dy * dy + dz * dz) < buf3[d]:
+                    codes[d, k] = CODE_3D_PROXIMITY
+                elif dist_2d < buf2[d] and abs(dz) < vsep[d]:
+                    codes[d, k] = CODE_VERTICAL_SEPARATION
+            elif dist_2d < buf2[d]:
+                codes[d, k] = CODE_2D_PROXIMITY
+
+
+if HAVE_NUMBA:
+    _conflict_codes_impl = numba.njit(cache=True, parallel=True)(_conflict_codes_loops)
+else:
+    _conflict_codes_impl = _conflict_codes_numpy
+
+
+def conflict_codes(times: np.ndarray,
+                   primary_positions: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+                   packed: PackedTracks,
+                   buf2: np.ndarray, buf3: np.ndarray, vsep: np.ndarray) -> np.ndarray:
+    """
+    Evaluates every packed drone against the primary at each time in one call.
+    `primary_positions` is (xs, ys, zs, active) along `times` (increasing); thresholds are
+    per-drone arrays. Returns an int8 (drones x times) array of conflict codes, NO_CONFLICT
+    where there is none.
+    """
+    offsets, ts, xs, ys, zs = packed
+    px, py, pz, p_active = (np.ascontiguousarray(a) for a in primary_positions)
+    codes = np.empty((len(offsets) - 1, len(times)), dtype=np.int8)
+    _conflict_codes_impl(np.ascontiguousarray(times, dtype=float), px, py, pz, p_active,
+                         offsets, ts, xs, ys, zs,
+                         np.asarray(buf2, dtype=float), np.asarray(buf3, dtype=float),
+                         np.asarray(vsep, dtype=float), codes)
+    return codes
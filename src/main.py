@@ -1,42 +1,16 @@
 from data_structures import PrimaryDroneMission, DroneMission, Waypoint
-from conflict_checker import check_for_conflicts, ConflictInfo, \
-                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
-                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from conflict_checker import ConflictInfo
+from conflict_set import ConflictSet
+from interface import deconfliction_query
 from simulation_data import (
     get_sample_simulated_schedules_no_conflict,
     get_sample_simulated_schedules_with_conflict,
     get_stationary_conflict_schedule
 )
 from visualization import visualize_missions_static, animate_missions
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
-def deconfliction_query(
-    primary_mission: PrimaryDroneMission,
-    other_drone_schedules: List[DroneMission],
-    safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
-    safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
-    vertical_sep: float = VERTICAL_SEPARATION_THRESHOLD,
-    time_res: float = TIME_STEP_RESOLUTION
-) -> Tuple[str, List[ConflictInfo]]:
-    """
-    Accepts the primary drone's mission and simulated flight schedules,
-    returns a status ("clear" or "conflict detected") and conflict details.
-    """
-    conflicts = check_for_conflicts(
-        primary_mission,
-        other_drone_schedules,
-        safety_buffer_2d,
-        safety_buffer_3d,
-        vertical_sep,
-        time_res
-    )
-    
-    if not conflicts:
-        return "clear", []
-    else:
-        return "conflict detected", conflicts
-
-def print_conflict_details(conflicts: List[ConflictInfo]):
+def print_conflict_details(conflicts: Union[List[ConflictInfo], ConflictSet]):
     if not conflicts:
         print("No conflicts detected.")
         return
@@ -0,0 +1,135 @@
+import hashlib
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from data_structures import DroneMission
+from conflict_checker import get_check_window, get_mission_arrays, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from conflict_set import ConflictSet
+from interface import deconfliction_query
+from separation import SeparationTable
+from airspace import AirspaceSchedule, MissionExtent, mission_extent, extents_overlap
+
+
+def mission_fingerprint(primary_mission: DroneMission,
+                        safety_buffer_2d: float,
+                        safety_buffer_3d: float,
+                        vertical_sep: float,
+                        time_res: float,
+                        separation: Optional[SeparationTable] = None) -> str:
+    """Digest of everything a deconfliction query depends on besides the background schedules."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(primary_mission.drone_id.encode())
+    for array in get_mission_arrays(primary_mission):
+        digest.update(array.tobytes())
+    digest.update(np.array(get_check_window(primary_mission) +
+                           (safety_buffer_2d, safety_buffer_3d, vertical_sep, time_res), dtype=float).tobytes())
+    if separation is not None:
+        # The table's current minima, not its identity: a changed table is a different query
+        digest.update(repr((primary_mission.category, separation.categories)).encode())
+        for matrix in separation.matrices():
+            digest.update(matrix.tobytes())
+    return digest.hexdigest()
+
+
+def _copy_result(result: Tuple[str, ConflictSet]) -> Tuple[str, ConflictSet]:
+    status, conflicts = result
+    return status, ConflictSet(conflicts.records.copy(), conflicts.drone_ids)
+
+
+class _CacheEntry:
+    def __init__(self, result: Tuple[str, ConflictSet], extent: MissionExtent, margin: float,
+                 version: int, created: float):
+        self.result = result
+        self.extent = extent # Space-time extent of the primary mission
+        self.margin = margin # Largest buffer: missions farther than this cannot conflict
+        self.version = version # Schedule version the result is valid for
+        self.created = created
+
+
+class QueryCache:
+    """
+    Memoizes deconfliction_query against an AirspaceSchedule.
+    Entries are keyed by mission_fingerprint and live in a size-bounded LRU, with an
+    optional time-to-live. When a mission is added or removed, only the entries whose
+    primary mission comes within the largest safety buffer of it, during its flight, are
+    dropped; the others stay valid for the new schedule version. With a `separation`
+    table that largest buffer is the largest minima of any pair (SeparationTable.max_minima).
+    """
+    def __init__(self,
+                 schedule: AirspaceSchedule,
+                 max_entries: int = 256,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("Cache size must be positive.")
+        self.schedule = schedule
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        schedule.subscribe(self._on_schedule_change)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Detaches the cache from its schedule."""
+        self.schedule.unsubscribe(self._on_schedule_change)
+        self._entries.clear()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def query(self,
+              primary_mission: DroneMission,
+              safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+              safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+              vertical_sep: float = VERTICAL_SEPARATION_THRESHOLD,
+              time_res: float = TIME_STEP_RESOLUTION,
+              separation: Optional[SeparationTable] = None) -> Tuple[str, ConflictSet]:
+        """
+        deconfliction_query against the current schedule, answered from the cache when
+        possible. Every call gets its own copy of the ConflictSet, so callers cannot
+        change a cached result.
+        """
+        key = mission_fingerprint(primary_mission, safety_buffer_2d, safety_buffer_3d, vertical_sep, time_res,
+                                  separation)
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expired = self.ttl is not None and now - entry.created > self.ttl
+            if not expired and entry.version == self.schedule.version:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return _copy_result(entry.result)
+            del self._entries[key]
+
+        self.stats["misses"] += 1
+        result = deconfliction_query(primary_mission, self.schedule.missions, safety_buffer_2d,
+                                     safety_buffer_3d, vertical_sep, time_res, separation=separation)
+        start, end = get_check_window(primary_mission)
+        extent = (start, end) + mission_extent(primary_mission)[2:]
+        margin = max(separation.max_minima()[:2] if separation is not None else (safety_buffer_2d, safety_buffer_3d))
+        self._entries[key] = _CacheEntry(result, extent, margin,
+                                         self.schedule.version, now)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        return _copy_result(result)
+
+    def _on_schedule_change(self, event: str, mission: DroneMission, version: int) -> None:
+        changed = mission_extent(mission)
+        for key in list(self._entries):
+            entry = self._entries[key]
+            if entry.version != version - 1:
+                del self._entries[key] # Missed an earlier change: no longer known to be valid
+            elif extents_overlap(entry.extent, changed, entry.margin):
+                del self._entries[key]
+                self.stats["invalidations"] += 1
+            else:
+                entry.version = version
@@ -0,0 +1,162 @@
+"""
+Recurring missions: the same route flown again and again on a fixed schedule (e.g. a
+delivery every 15 minutes), stored once as a template with its start times.
+
+The conflict checker does not expand the repetitions. Repetition k is at template time
+t - start_k at time t, so for every check time only the repetitions whose start lies in
+[t - duration, t] can be flying; these (time, repetition) pairs are found with one
+search over the sorted start times, and all of them are evaluated with a single
+template interpolation.
+"""
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from data_structures import Waypoint, DroneMission
+from kernels import Track, NO_CONFLICT, interpolate_track, pair_conflict_codes
+from broad_phase import TIME_TOLERANCE, expand_ranges
+
+
+class RecurringMission:
+    """
+    A mission template flown `count` times, starting at `first_start` and then every
+    `interval` seconds. Template waypoint times are taken relative to the first
+    waypoint. Repetition k is reported as drone "<drone_id>#<k>".
+    """
+    def __init__(self, template: List[Waypoint], drone_id: str, first_start: float,
+                 interval: float, count: int, category: Optional[str] = None):
+        if not template:
+            raise ValueError(f"RecurringMission for {drone_id} must have at least one waypoint.")
+        if count < 1:
+            raise ValueError("A recurring mission needs at least one repetition.")
+        if count > 1 and interval <= 0:
+            raise ValueError("The repetition interval must be positive.")
+        waypoints = sorted(template, key=lambda wp: wp.timestamp)
+        ts = np.array([wp.timestamp for wp in waypoints], dtype=float)
+        self.track: Track = (
+            ts - ts[0],
+            np.array([wp.x for wp in waypoints], dtype=float),
+            np.array([wp.y for wp in waypoints], dtype=float),
+            np.array([wp.z if wp.z is not None else np.nan for wp in waypoints], dtype=float))
+        self.drone_id = drone_id
+        self.category = category # Aircraft category, for separation.SeparationTable lookups
+        self.interval = float(interval)
+        self.start_times = float(first_start) + self.interval * np.arange(count)
+
+    @classmethod
+    def from_mission(cls, mission: DroneMission, interval: float, count: int) -> "RecurringMission":
+        """Repeats an existing mission: its own flight is the first repetition."""
+        return cls(mission.waypoints, mission.drone_id, mission.get_start_time(), interval, count, mission.category)
+
+    def __len__(self) -> int:
+        return len(self.start_times)
+
+    @property
+    def duration(self) -> float:
+        return float(self.track[0][-1])
+
+    def get_start_time(self) -> float:
+        """Start of the first repetition."""
+        return float(self.start_times[0])
+
+    def get_end_time(self) -> float:
+        """End of the last repetition."""
+        return float(self.start_times[-1]) + self.duration
+
+    def is_mission_3d(self) -> bool:
+        return bool(np.any(~np.isnan(self.track[3])))
+
+    def repetition_id(self, k: int) -> str:
+        return f"{self.drone_id}#{k}"
+
+    def repetition_track(self, k: int) -> Track:
+        """(timestamps, xs, ys, zs) of repetition k in absolute time."""
+        ts, xs, ys, zs = self.track
+        return ts + self.start_times[k], xs, ys, zs
+
+    def repetition(self, k: int) -> DroneMission:
+        """Repetition k as a standalone DroneMission."""
+        ts, xs, ys, zs = self.repetition_track(k)
+        waypoints = [Waypoint(x, y, t, None if z != z else z) # z != z tests for NaN
+                     for t, x, y, z in zip(ts.tolist(), xs.tolist(), ys.tolist(), zs.tolist())]
+        return DroneMission(waypoints, self.repetition_id(k), self.category)
+
+    def repetitions(self) -> List[DroneMission]:
+        return [self.repetition(k) for k in range(len(self))]
+
+    def __repr__(self) -> str:
+        return (f"RecurringMission(id='{self.drone_id}', waypoints_count={len(self.track[0])}, "
+                f"count={len(self)}, interval={self.interval:.2f}, "
+                f"start_t={self.get_start_time():.2f}, end_t={self.get_end_time():.2f})")
+
+
+def expand_recurring(schedules: Sequence[DroneMission]) -> List[DroneMission]:
+    """The schedules with every RecurringMission replaced, in place, by its repetitions."""
+    expanded: List[DroneMission] = []
+    for mission in schedules:
+        if isinstance(mission, RecurringMission):
+            expanded.extend(mission.repetitions())
+        else:
+            expanded.append(mission)
+    return expanded
+
+
+def repetition_positions(
+    mission: RecurringMission,
+    times: np.ndarray,
+    active: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every (repetition, time index) pair in which a repetition flies at one of the
+    `active` time indices, with its (N x 3) positions, from one search over the start
+    times and one template interpolation. Ordered by time index, then repetition.
+    """
+    ts, xs, ys, zs = mission.track
+    # Repetitions whose start lies within the template duration before each active time
+    margin = 2 * TIME_TOLERANCE # The exact activity test is left to interpolate_track
+    lo = np.searchsorted(mission.start_times, times[active] - ts[-1] - margin, side='left')
+    hi = np.searchsorted(mission.start_times, times[active] + margin, side='right')
+    owner, repetition = expand_ranges(lo, hi)
+    time_index = active[owner]
+    ox, oy, oz, flying = interpolate_track(ts, xs, ys, zs, times[time_index] - mission.start_times[repetition])
+    return repetition[flying], time_index[flying], np.column_stack((ox, oy, oz))[flying]
+
+
+def repetition_conflicts(
+    mission: RecurringMission,
+    times: np.ndarray,
+    primary_positions: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    buf2: float,
+    buf3: float,
+    vsep: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluates every repetition of a recurring mission against the primary in one pass.
+    `primary_positions` is (xs, ys, zs, active) along `times`. Returns the conflicts as
+    (repetition, time index, conflict code, other position) arrays, ordered by
+    repetition, then time.
+    """
+    px, py, pz, p_active = primary_positions
+    repetition, time_index, other = repetition_positions(mission, times, np.flatnonzero(p_active))
+    codes = pair_conflict_codes(px[time_index] - other[:, 0], py[time_index] - other[:, 1],
+                                pz[time_index] - other[:, 2], buf2, buf3, vsep)
+    hit = codes != NO_CONFLICT
+    order = np.lexsort((time_index[hit], repetition[hit]))
+    return repetition[hit][order], time_index[hit][order], codes[hit][order], other[hit][order]
+
+
+def repetition_min_separation(
+    mission: RecurringMission,
+    times: np.ndarray,
+    primary_positions: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+) -> float:
+    """
+    Smallest separation between the primary and any repetition over `times` (3D when
+    both have an altitude, horizontal otherwise); inf if they never fly together.
+    """
+    px, py, pz, p_active = primary_positions
+    _, time_index, other = repetition_positions(mission, times, np.flatnonzero(p_active))
+    if not len(time_index):
+        return np.inf
+    dz = pz[time_index] - other[:, 2]
+    dz = np.where(np.isnan(dz), 0.0, dz)
+    return float(np.sqrt((px[time_index] - other[:, 0])**2 + (py[time_index] - other[:, 1])**2 + dz**2).min())
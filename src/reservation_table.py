@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
+
+from data_structures import DroneMission
+from conflict_checker import find_conflicts, get_mission_arrays, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from conflict_set import ConflictSet
+from kernels import interpolate_track
+from recurring import RecurringMission
+from separation import SeparationTable
+
+CellKey = Tuple[int, int, int] # (x cell, y cell, time bin)
+
+# Horizontal neighbourhood searched around each of the primary's cells
+_NEIGHBOUR_OFFSETS = np.array([(dx, dy, 0) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+
+
+class SpaceTimeReservationTable:
+    """
+    Hashed space-time voxel grid of accepted missions.
+    Each mission reserves every (x cell, y cell, time bin) it passes through. Cells are at
+    least as wide as the largest safety buffer, so any drone that can conflict with the
+    primary at time t occupies one of the 3x3 cells around the primary's cell in the same
+    time bin. A query collects those occupants and verifies only them with find_conflicts.
+    Insert, remove and query cost grows with the mission's own path length and duration.
+    With a `separation` table, queries use its per-pair minima and cells are sized by
+    the largest minima of any pair (SeparationTable.max_minima).
+    """
+    def __init__(self,
+                 time_bin: float = 10.0,
+                 safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+                 safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+                 vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD,
+                 time_resolution: float = TIME_STEP_RESOLUTION,
+                 cell_size: Optional[float] = None,
+                 separation: Optional[SeparationTable] = None):
+        if separation is not None:
+            safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold = separation.max_minima()
+        min_cell_size = max(safety_buffer_2d, safety_buffer_3d)
+        if cell_size is None:
+            cell_size = min_cell_size
+        if cell_size < min_cell_size:
+            raise ValueError(f"Cell size {cell_size} is smaller than the largest safety buffer {min_cell_size}.")
+        if time_bin <= 0:
+            raise ValueError("Time bin must be positive.")
+        self.cell_size = float(cell_size)
+        self.time_bin = float(time_bin)
+        self.safety_buffer_2d = safety_buffer_2d
+        self.safety_buffer_3d = safety_buffer_3d
+        self.vertical_sep_threshold = vertical_sep_threshold
+        self.time_resolution = time_resolution
+        self.separation = separation
+
+        self._cells: Dict[CellKey, Set[str]] = {}
+        self._missions: Dict[str, DroneMission] = {} # Insertion ordered
+        self._reserved: Dict[str, List[CellKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._missions)
+
+    def __contains__(self, drone_id: str) -> bool:
+        return drone_id in self._missions
+
+    @property
+    def cell_count(self) -> int:
+        return len(self._cells)
+
+    @property
+    def missions(self) -> List[DroneMission]:
+        return list(self._missions.values())
+
+    def mission_cells(self, mission: DroneMission) -> np.ndarray:
+        """
+        Returns the unique (x cell, y cell, time bin) keys a mission passes through, as an
+        (N x 3) int array. The mission is cut at every waypoint and time-bin edge, and each
+        piece reserves the cells covered by its bounding box.
+        """
+        ts, xs, ys, zs = get_mission_arrays(mission)
+        t_first, t_last = ts[0] - 1e-6, ts[-1] + 1e-6 # Same activity tolerance as the checker
+        first_edge, last_edge = np.ceil(t_first / self.time_bin), np.floor(t_last / self.time_bin)
+        bin_edges = np.arange(first_edge, last_edge + 1) * self.time_bin
+        sample_t = np.unique(np.concatenate(([t_first, t_last], ts, bin_edges)))
+        px, py, _, _ = interpolate_track(ts, xs, ys, zs, np.clip(sample_t, ts[0], ts[-1]))
+
+        time_bins = np.floor((sample_t[:-1] + sample_t[1:]) / 2 / self.time_bin).astype(np.int64)
+        ix0 = np.floor(np.minimum(px[:-1], px[1:]) / self.cell_size).astype(np.int64)
+        ix1 = np.floor(np.maximum(px[:-1], px[1:]) / self.cell_size).astype(np.int64)
+        iy0 = np.floor(np.minimum(py[:-1], py[1:]) / self.cell_size).astype(np.int64)
+        iy1 = np.floor(np.maximum(py[:-1], py[1:]) / self.cell_size).astype(np.int64)
+
+        # Enumerate every cell of every piece's bounding box in one pass
+        ny = iy1 - iy0 + 1
+        counts = (ix1 - ix0 + 1) * ny
+        piece = np.repeat(np.arange(len(counts)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        keys = np.column_stack((ix0[piece] + local // ny[piece],
+                                iy0[piece] + local % ny[piece],
+                                time_bins[piece]))
+        return np.unique(keys, axis=0)
+
+    def insert(self, mission: DroneMission) -> None:
+        """Reserves the cells of an accepted mission. Re-inserting a drone id replaces its mission."""
+        if isinstance(mission, RecurringMission):
+            raise ValueError(f"Recurring mission {mission.drone_id} cannot be reserved: add its .repetitions() instead.")
+        if mission.drone_id in self._missions:
+            self.remove(mission.drone_id)
+        keys = [tuple(key) for key in self.mission_cells(mission).tolist()]
+        for key in keys:
+            self._cells.setdefault(key, set()).add(mission.drone_id)
+        self._missions[mission.drone_id] = mission
+        self._reserved[mission.drone_id] = keys
+
+    def remove(self, drone_id: str) -> DroneMission:
+        """Releases a mission's cells and returns the mission."""
+        if drone_id not in self._missions:
+            raise KeyError(f"No mission reserved for drone '{drone_id}'.")
+        for key in self._reserved.pop(drone_id):
+            occupants = self._cells[key]
+            occupants.discard(drone_id)
+            if not occupants:
+                del self._cells[key]
+        return self._missions.pop(drone_id)
+
+    def occupants(self, primary_mission: DroneMission) -> List[DroneMission]:
+        """Missions sharing a neighbouring cell with the primary in some time bin, in insertion order."""
+        primary_keys = self.mission_cells(primary_mission)
+        neighbour_keys = np.unique((primary_keys[:, None, :] + _NEIGHBOUR_OFFSETS[None, :, :]).reshape(-1, 3), axis=0)
+
+        found: Set[str] = set()
+        for key in neighbour_keys.tolist():
+            found.update(self._cells.get(tuple(key), ()))
+        found.discard(primary_mission.drone_id)
+        return [mission for drone_id, mission in self._missions.items() if drone_id in found]
+
+    def query(self, primary_mission: DroneMission) -> ConflictSet:
+        """Conflicts of the primary against the reserved missions, verified exactly on the occupants found."""
+        if self.separation is not None and max(self.separation.max_minima()[:2]) > self.cell_size:
+            raise ValueError("Separation minima grew beyond the cell size; rebuild the reservation table.")
+        return find_conflicts(primary_mission, self.occupants(primary_mission), self.safety_buffer_2d,
+                              self.safety_buffer_3d, self.vertical_sep_threshold, self.time_resolution,
+                              separation=self.separation)
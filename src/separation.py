@@ -0,0 +1,92 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from data_structures import DroneMission
+from conflict_checker import MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD
+
+# (safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold)
+SeparationMinima = Tuple[float, float, float]
+
+
+def _validated(safety_buffer_2d: float, safety_buffer_3d: float, vertical_sep: float) -> SeparationMinima:
+    minima = (float(safety_buffer_2d), float(safety_buffer_3d), float(vertical_sep))
+    if min(minima) < 0:
+        raise ValueError("Separation minima must not be negative.")
+    return minima
+
+
+class SeparationTable:
+    """
+    Separation minima by aircraft category (DroneMission.category).
+    Each category has its own minima; a pair of categories uses the larger of the two
+    unless the pair is given minima of its own with set_pair. Missions without a
+    category get the table defaults. Lookups go through (categories x categories)
+    threshold matrices, so a whole schedule is resolved with one fancy-indexing step.
+    """
+    def __init__(self,
+                 safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+                 safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+                 vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD):
+        self._index: Dict[Optional[str], int] = {None: 0}
+        self._minima: List[SeparationMinima] = [_validated(safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold)]
+        self._pairs: Dict[Tuple[int, int], SeparationMinima] = {}
+        self._matrices: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    @property
+    def categories(self) -> List[str]:
+        return [category for category in self._index if category is not None]
+
+    def set_category(self, category: str, safety_buffer_2d: float, safety_buffer_3d: float,
+                     vertical_sep_threshold: float) -> None:
+        """Adds a category, or replaces its minima."""
+        minima = _validated(safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold)
+        if category in self._index:
+            self._minima[self._index[category]] = minima
+        else:
+            self._index[category] = len(self._minima)
+            self._minima.append(minima)
+        self._matrices = None
+
+    def set_pair(self, category_a: Optional[str], category_b: Optional[str], safety_buffer_2d: float,
+                 safety_buffer_3d: float, vertical_sep_threshold: float) -> None:
+        """Minima for one pair of (known) categories, in either order; None is the uncategorized default."""
+        a, b = self.category_index(category_a), self.category_index(category_b)
+        self._pairs[(min(a, b), max(a, b))] = _validated(safety_buffer_2d, safety_buffer_3d, vertical_sep_threshold)
+        self._matrices = None
+
+    def category_index(self, category: Optional[str]) -> int:
+        try:
+            return self._index[category]
+        except KeyError:
+            raise ValueError(f"Unknown aircraft category '{category}'.") from None
+
+    def matrices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(buffer 2D, buffer 3D, vertical separation) matrices indexed by category index."""
+        if self._matrices is None:
+            minima = np.array(self._minima)
+            pair = np.maximum(minima[:, None, :], minima[None, :, :])
+            for (a, b), values in self._pairs.items():
+                pair[a, b] = pair[b, a] = values
+            self._matrices = (pair[..., 0], pair[..., 1], pair[..., 2])
+        return self._matrices
+
+    def pair_minima(self, category_a: Optional[str], category_b: Optional[str]) -> SeparationMinima:
+        a, b = self.category_index(category_a), self.category_index(category_b)
+        return tuple(float(matrix[a, b]) for matrix in self.matrices())
+
+    def thresholds(self, primary_category: Optional[str],
+                   categories: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-drone (buffer 2D, buffer 3D, vertical separation) arrays against a primary of the given category."""
+        p = self.category_index(primary_category)
+        idx = np.fromiter((self.category_index(c) for c in categories), dtype=np.int64, count=len(categories))
+        return tuple(matrix[p, idx] for matrix in self.matrices())
+
+    def mission_thresholds(self, primary_mission: DroneMission,
+                           other_drone_schedules: Sequence[DroneMission]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """thresholds() for the categories of the given missions."""
+        return self.thresholds(primary_mission.category, [m.category for m in other_drone_schedules])
+
+    def max_minima(self) -> SeparationMinima:
+        """Largest minima of any pair, e.g. for sizing spatial indexes."""
+        return tuple(float(matrix.max()) for matrix in self.matrices())
@@ -0,0 +1,114 @@
+"""
+Level-of-detail simplification of mission trajectories.
+
+A Douglas-Peucker pass in space-time keeps a subset of the waypoints such that, at
+every time, the simplified drone is within the tolerance of the original one: a
+dropped waypoint is measured against the position interpolated on the simplified
+segment at the waypoint's own timestamp (synchronized distance), and as both tracks
+are linear between the original waypoints this bounds the error at all times.
+
+All tracks of a packed set are simplified together, one vectorized splitting round
+per level of the recursion. Simplified geometry is for rendering and broad phases:
+callers add the reported error to their buffers and run exact checks on the originals.
+"""
+import copy
+import numpy as np
+from typing import List, Sequence, Tuple
+
+from data_structures import DroneMission
+from kernels import PackedTracks, pack_tracks
+from broad_phase import TIME_TOLERANCE
+
+
+def _synchronized_errors(ts: np.ndarray, points: np.ndarray,
+                         at: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Distance of waypoints `at` to the segment left -> right at their timestamps; missing altitudes count as equal."""
+    fraction = (ts[at] - ts[left]) / (ts[right] - ts[left])
+    predicted = points[left] + fraction[:, None] * (points[right] - points[left])
+    offset = np.nan_to_num(points[at] - predicted)
+    return np.sqrt((offset * offset).sum(axis=1))
+
+
+def simplification_mask(packed: PackedTracks, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Waypoints of every packed track to keep so that the track stays within `tolerance`
+    meters of the original at every time, as a boolean mask, and each track's actual
+    maximum error. Track ends, waypoints sharing a timestamp and waypoints where the
+    altitude appears or drops out are always kept, so activity and 2D/3D handling are
+    unchanged.
+    """
+    if tolerance < 0:
+        raise ValueError("Simplification tolerance must not be negative.")
+    offsets, ts, xs, ys, zs = packed
+    points = np.column_stack((xs, ys, zs))
+    lengths = np.diff(offsets)
+    keep = np.zeros(len(ts), dtype=bool)
+    keep[offsets[:-1][lengths > 0]] = True
+    keep[offsets[1:][lengths > 0] - 1] = True
+    missing_z = np.isnan(zs)
+    fixed = (np.diff(ts) < TIME_TOLERANCE) | (missing_z[1:] != missing_z[:-1])
+    keep[:-1] |= fixed
+    keep[1:] |= fixed
+
+    waypoint_error = np.zeros(len(ts))
+    pending = np.flatnonzero(~keep)
+    while len(pending):
+        kept = np.flatnonzero(keep)
+        span = np.searchsorted(kept, pending) # Spans never cross tracks: track ends are kept
+        error = _synchronized_errors(ts, points, pending, kept[span - 1], kept[span])
+        starts = np.flatnonzero(np.concatenate(([True], span[1:] != span[:-1])))
+        counts = np.diff(np.append(starts, len(pending)))
+        span_max = np.maximum.reduceat(error, starts)
+        # Spans within the tolerance are final; the others are split at their worst waypoint
+        too_far = span_max > tolerance
+        at_max = np.where(error == np.repeat(span_max, counts), np.arange(len(pending)), len(pending))
+        keep[pending[np.minimum.reduceat(at_max, starts)[too_far]]] = True
+        done = ~np.repeat(too_far, counts)
+        waypoint_error[pending[done]] = error[done]
+        pending = pending[~done & ~keep[pending]]
+
+    errors = np.zeros(len(lengths))
+    np.maximum.at(errors, np.repeat(np.arange(len(lengths)), lengths), waypoint_error)
+    return keep, errors
+
+
+def simplify_tracks(packed: PackedTracks, tolerance: float) -> Tuple[PackedTracks, np.ndarray]:
+    """Simplified copies of packed tracks (see simplification_mask) and each track's actual maximum error."""
+    keep, errors = simplification_mask(packed, tolerance)
+    offsets, ts, xs, ys, zs = packed
+    kept_before = np.concatenate(([0], np.cumsum(keep)))
+    return (kept_before[offsets], ts[keep], xs[keep], ys[keep], zs[keep]), errors
+
+
+def _mission_track(mission: DroneMission):
+    wps = mission.waypoints
+    return tuple(np.fromiter((getattr(wp, name) if getattr(wp, name) is not None else np.nan for wp in wps),
+                             dtype=float, count=len(wps)) for name in ("timestamp", "x", "y", "z"))
+
+
+def simplify_missions(missions: Sequence[DroneMission], tolerance: float) -> Tuple[List[DroneMission], np.ndarray]:
+    """
+    Copies of the missions keeping only the waypoints needed to stay within `tolerance`
+    meters of them at every time, and each mission's actual maximum error. Waypoints
+    are shared with the original missions.
+    """
+    packed = pack_tracks([_mission_track(m) for m in missions])
+    keep, errors = simplification_mask(packed, tolerance)
+    offsets = packed[0]
+    simplified = []
+    for mission, first, last in zip(missions, offsets[:-1], offsets[1:]):
+        copied = copy.copy(mission)
+        copied.waypoints = [mission.waypoints[i] for i in np.flatnonzero(keep[first:last]).tolist()]
+        simplified.append(copied)
+    return simplified, errors
+
+
+def simplify_mission(mission: DroneMission, tolerance: float) -> Tuple[DroneMission, float]:
+    """simplify_missions for a single mission."""
+    (simplified,), errors = simplify_missions([mission], tolerance)
+    return simplified, float(errors[0])
+
+
+def levels_of_detail(mission: DroneMission, tolerances: Sequence[float]) -> List[Tuple[DroneMission, float]]:
+    """simplify_mission at each tolerance, e.g. one level per zoom level of a map."""
+    return [simplify_mission(mission, tolerance) for tolerance in tolerances]
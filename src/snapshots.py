@@ -0,0 +1,234 @@
+import copy
+import heapq
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from data_structures import Waypoint, DroneMission
+from conflict_checker import MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD, TIME_STEP_RESOLUTION
+from altitude_index import AltitudeBandIndex
+from recurring import RecurringMission
+from interface import ConflictReport, check_mission, compute_min_separation
+
+# Number of buckets in a snapshot's mission map. An update copies one bucket and the
+# bucket table, and shares every other bucket (and its indexes) with the previous snapshot.
+SNAPSHOT_BUCKETS = 64
+
+# Bucket entry: (acceptance sequence number, frozen mission)
+_Entry = Tuple[int, DroneMission]
+
+
+class FrozenWaypoint(Waypoint):
+    """A Waypoint whose coordinates cannot be reassigned."""
+    def __init__(self, x: float, y: float, timestamp: float, z: Optional[float] = None):
+        super().__init__(x, y, timestamp, z)
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Waypoints of a snapshot mission are read-only.")
+        super().__setattr__(name, value)
+
+
+def _read_only(array):
+    array = array.copy()
+    array.flags.writeable = False
+    return array
+
+
+def freeze_mission(mission: DroneMission) -> DroneMission:
+    """
+    Copy of a mission (of the same class) holding a tuple of FrozenWaypoints, so neither
+    the waypoint sequence nor the waypoints can change under a reader. A RecurringMission
+    gets read-only copies of its template track and start times instead.
+    """
+    frozen = copy.copy(mission)
+    if isinstance(mission, RecurringMission):
+        frozen.track = tuple(_read_only(array) for array in mission.track)
+        frozen.start_times = _read_only(mission.start_times)
+        return frozen
+    frozen.waypoints = tuple(wp if isinstance(wp, FrozenWaypoint) else FrozenWaypoint(wp.x, wp.y, wp.timestamp, wp.z)
+                             for wp in mission.waypoints)
+    return frozen
+
+
+class _Bucket:
+    """
+    One bucket of a snapshot's mission map, drone_id -> entry, with its missions in
+    acceptance order and its altitude indexes built on first use. A published bucket
+    never changes, so snapshots share it and its indexes until an update replaces it.
+    """
+    def __init__(self, entries: Optional[Dict[str, _Entry]] = None):
+        self.entries: Dict[str, _Entry] = entries if entries is not None else {}
+        self._ordered: Optional[Tuple[_Entry, ...]] = None
+        self._altitude_indexes: Dict[float, AltitudeBandIndex] = {}
+
+    def ordered(self) -> Tuple[_Entry, ...]:
+        if self._ordered is None:
+            self._ordered = tuple(sorted(self.entries.values(), key=lambda entry: entry[0]))
+        return self._ordered
+
+    def altitude_index(self, band_height: float) -> AltitudeBandIndex:
+        index = self._altitude_indexes.get(band_height)
+        if index is None:
+            index = AltitudeBandIndex([mission for _, mission in self.ordered()], band_height)
+            self._altitude_indexes[band_height] = index
+        return index
+
+
+def _bucket_of(drone_id: str) -> int:
+    return zlib.crc32(drone_id.encode()) % SNAPSHOT_BUCKETS
+
+
+class AirspaceSnapshot:
+    """
+    Immutable, versioned view of the accepted missions.
+    Readers can hold on to a snapshot and query it from any thread (or pickle it to
+    another process) while writers publish newer versions. Indexes derived from the
+    missions are kept per bucket, built on first use, and shared by every snapshot
+    holding that bucket.
+    """
+    def __init__(self, version: int, buckets: Tuple[_Bucket, ...], size: int, next_sequence: int):
+        self.version = version
+        self._buckets = buckets
+        self._size = size
+        self._next_sequence = next_sequence
+        self._missions: Optional[Tuple[DroneMission, ...]] = None
+
+    @classmethod
+    def empty(cls) -> "AirspaceSnapshot":
+        return cls(0, tuple(_Bucket() for _ in range(SNAPSHOT_BUCKETS)), 0, 0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[DroneMission]:
+        return iter(self.missions)
+
+    def __contains__(self, drone_id: str) -> bool:
+        return drone_id in self._buckets[_bucket_of(drone_id)].entries
+
+    def __repr__(self) -> str:
+        return f"AirspaceSnapshot(version={self.version}, missions={self._size})"
+
+    def get(self, drone_id: str) -> Optional[DroneMission]:
+        entry = self._buckets[_bucket_of(drone_id)].entries.get(drone_id)
+        return entry[1] if entry is not None else None
+
+    @property
+    def missions(self) -> Tuple[DroneMission, ...]:
+        """The missions in acceptance order, merged from the buckets' ordered missions."""
+        if self._missions is None:
+            merged = heapq.merge(*(bucket.ordered() for bucket in self._buckets), key=lambda entry: entry[0])
+            self._missions = tuple(mission for _, mission in merged)
+        return self._missions
+
+    def altitude_candidates(self, primary: DroneMission, min_vertical_gap: float,
+                            band_height: float) -> List[DroneMission]:
+        """
+        AltitudeBandIndex.candidates over this snapshot's missions, in acceptance order.
+        Each bucket's index is built once and reused by later snapshots sharing it.
+        """
+        found = []
+        for bucket in self._buckets:
+            if bucket.entries:
+                found.extend(bucket.entries[mission.drone_id]
+                             for mission in bucket.altitude_index(band_height).candidates(primary, min_vertical_gap))
+        return [mission for _, mission in sorted(found, key=lambda entry: entry[0])]
+
+    # --- Derived versions (used by AirspaceStore) ---
+    def with_mission(self, mission: DroneMission) -> "AirspaceSnapshot":
+        """New snapshot with `mission` accepted (replacing any mission of the same drone)."""
+        b = _bucket_of(mission.drone_id)
+        entries = dict(self._buckets[b].entries)
+        size = self._size + (mission.drone_id not in entries)
+        entries[mission.drone_id] = (self._next_sequence, freeze_mission(mission))
+        buckets = self._buckets[:b] + (_Bucket(entries),) + self._buckets[b + 1:]
+        return AirspaceSnapshot(self.version + 1, buckets, size, self._next_sequence + 1)
+
+    def without_mission(self, drone_id: str) -> "AirspaceSnapshot":
+        """New snapshot with the drone's mission withdrawn."""
+        b = _bucket_of(drone_id)
+        if drone_id not in self._buckets[b].entries:
+            raise KeyError(f"No mission scheduled for drone '{drone_id}'.")
+        entries = dict(self._buckets[b].entries)
+        del entries[drone_id]
+        buckets = self._buckets[:b] + (_Bucket(entries),) + self._buckets[b + 1:]
+        return AirspaceSnapshot(self.version + 1, buckets, self._size - 1, self._next_sequence)
+
+    # --- Queries ---
+    def check(self,
+              primary: DroneMission,
+              safety_buffer: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+              dt: float = TIME_STEP_RESOLUTION,
+              safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+              vertical_sep: float = VERTICAL_SEPARATION_THRESHOLD) -> ConflictReport:
+        """
+        check_mission against this snapshot. The report's stats carry the snapshot version.
+        Only the missions the per-bucket altitude indexes cannot rule out are checked:
+        missions that stay max(safety_buffer_3d, vertical_sep) above or below the primary
+        cannot conflict with it, and count towards min_separation only when no checked
+        mission comes closer than that gap.
+        """
+        gap = max(safety_buffer_3d, vertical_sep)
+        candidates = self.altitude_candidates(primary, gap, gap)
+        report = check_mission(primary, candidates, safety_buffer, dt, safety_buffer_3d, vertical_sep)
+        if len(candidates) < self._size and (report.min_separation is None or report.min_separation > gap):
+            checked = set(map(id, candidates))
+            pruned_min = compute_min_separation(primary, [m for m in self.missions if id(m) not in checked], dt)
+            if pruned_min is not None:
+                report.min_separation = pruned_min if report.min_separation is None else \
+                                        min(pruned_min, report.min_separation)
+        report.stats["altitude_pruned"] = self._size - len(candidates)
+        report.stats["snapshot_version"] = self.version
+        return report
+
+
+class AirspaceStore:
+    """
+    Publishes AirspaceSnapshots. Writers are serialized by a lock and each change
+    publishes a new snapshot; readers call snapshot() and never lock, since publishing
+    is a single reference assignment.
+    """
+    def __init__(self, missions: Optional[List[DroneMission]] = None):
+        self._write_lock = threading.Lock()
+        snapshot = AirspaceSnapshot.empty()
+        for mission in missions or []:
+            snapshot = snapshot.with_mission(mission)
+        self._current = snapshot
+
+    def snapshot(self) -> AirspaceSnapshot:
+        """The latest published snapshot."""
+        return self._current
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    def add(self, mission: DroneMission) -> AirspaceSnapshot:
+        """Accepts a mission (a frozen copy is stored) and returns the published snapshot."""
+        with self._write_lock:
+            self._current = self._current.with_mission(mission)
+            return self._current
+
+    def remove(self, drone_id: str) -> AirspaceSnapshot:
+        with self._write_lock:
+            self._current = self._current.without_mission(drone_id)
+            return self._current
+
+    def accept_if_clear(self,
+                        mission: DroneMission,
+                        safety_buffer: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+                        dt: float = TIME_STEP_RESOLUTION,
+                        safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+                        vertical_sep: float = VERTICAL_SEPARATION_THRESHOLD) -> ConflictReport:
+        """
+        Checks a mission against the latest snapshot and accepts it if clear, atomically
+        with respect to other writers. Readers keep running meanwhile.
+        """
+        with self._write_lock:
+            report = self._current.check(mission, safety_buffer, dt, safety_buffer_3d, vertical_sep)
+            if report.is_clear:
+                self._current = self._current.with_mission(mission)
+            return report
@@ -0,0 +1,256 @@
+import csv
+import time
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from data_structures import DroneMission
+from conflict_checker import get_mission_arrays, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, \
+                             VERTICAL_SEPARATION_THRESHOLD
+from conflict_set import ConflictSet
+from kernels import NO_CONFLICT, interpolate_track, pair_conflict_codes
+
+TELEMETRY_COLUMNS = ("drone_id", "timestamp", "x", "y", "z")
+
+
+class TickReport:
+    """Result of one monitoring tick."""
+    def __init__(self,
+                 time: float,
+                 conflicts: ConflictSet,
+                 deviations: Dict[str, float],
+                 stats: Dict[str, float]):
+        self.time = time
+        self.conflicts = conflicts # Earliest projected loss of separation per drone pair
+        self.deviations = deviations # Non-conforming drones: distance from their registered plan
+        self.stats = stats
+
+    @property
+    def is_clear(self) -> bool:
+        return not self.conflicts and not self.deviations
+
+    def __repr__(self) -> str:
+        return (f"TickReport(time={self.time:.2f}, conflicts={len(self.conflicts)}, "
+                f"non_conforming={len(self.deviations)})")
+
+
+class TelemetryMonitor:
+    """
+    Tactical monitor over live position reports.
+    Each drone gets a slot in preallocated ring buffers holding its last `history` reports;
+    ingesting a report only writes into them. Every tick projects the fresh drones ahead
+    at constant velocity (from their last two reports) over `horizon` seconds, checks all
+    pairs with the strategic separation rules, and compares each drone with its registered
+    plan, if any.
+    """
+    def __init__(self,
+                 capacity: int = 512,
+                 history: int = 16,
+                 horizon: float = 10.0,
+                 projection_step: float = 1.0,
+                 stale_after: float = 5.0,
+                 conformance_tolerance: float = 20.0,
+                 safety_buffer_2d: float = MINIMUM_DISTANCE_THRESHOLD_2D,
+                 safety_buffer_3d: float = MINIMUM_DISTANCE_THRESHOLD_3D,
+                 vertical_sep_threshold: float = VERTICAL_SEPARATION_THRESHOLD):
+        if capacity <= 0 or history < 2:
+            raise ValueError("Telemetry monitor needs a positive capacity and a history of at least 2 reports.")
+        if horizon < 0 or projection_step <= 0:
+            raise ValueError("Projection horizon must be non-negative and its step positive.")
+        self.capacity = capacity
+        self.history = history
+        self.stale_after = stale_after
+        self.conformance_tolerance = conformance_tolerance
+        self.safety_buffer_2d = safety_buffer_2d
+        self.safety_buffer_3d = safety_buffer_3d
+        self.vertical_sep_threshold = vertical_sep_threshold
+        self.projection_offsets = np.arange(int(np.floor(horizon / projection_step + 1e-9)) + 1) * projection_step
+
+        # Ring buffers: report k of a slot lives at index k % history
+        self._times = np.full((capacity, history), np.nan)
+        self._positions = np.full((capacity, history, 3), np.nan)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._slot_ids: List[Optional[str]] = [None] * capacity
+        self._slots: Dict[str, int] = {}
+        self._free_slots = list(range(capacity - 1, -1, -1))
+        self._plans: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, drone_id: str) -> bool:
+        return drone_id in self._slots
+
+    # --- Ingestion ---
+    def ingest(self, drone_id: str, timestamp: float, x: float, y: float, z: Optional[float] = None) -> bool:
+        """
+        Stores one position report. Reports older than the drone's latest one are dropped
+        (returns False). Raises ValueError when a new drone arrives and every slot is taken.
+        """
+        slot = self._slots.get(drone_id)
+        if slot is None:
+            if not self._free_slots:
+                raise ValueError(f"Telemetry monitor is full ({self.capacity} drones).")
+            slot = self._free_slots.pop()
+            self._slots[drone_id] = slot
+            self._slot_ids[slot] = drone_id
+
+        count = self._count[slot]
+        if count and timestamp < self._times[slot, (count - 1) % self.history]:
+            return False
+        row = count % self.history
+        self._times[slot, row] = timestamp
+        self._positions[slot, row, 0] = x
+        self._positions[slot, row, 1] = y
+        self._positions[slot, row, 2] = np.nan if z is None else z
+        self._count[slot] = count + 1
+        return True
+
+    def remove(self, drone_id: str) -> None:
+        """Forgets a drone (e.g. after landing) and frees its slot."""
+        slot = self._slots.pop(drone_id)
+        self._slot_ids[slot] = None
+        self._count[slot] = 0
+        self._times[slot] = np.nan
+        self._free_slots.append(slot)
+        self._plans.pop(drone_id, None)
+
+    def recent_reports(self, drone_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the drone's buffered reports, oldest first, as (timestamps, (N x 3) positions)."""
+        slot = self._slots[drone_id]
+        count = self._count[slot]
+        rows = np.arange(max(0, count - self.history), count) % self.history
+        return self._times[slot, rows], self._positions[slot, rows]
+
+    # --- Conformance ---
+    def register_plan(self, mission: DroneMission) -> None:
+        """Registers the approved mission that a drone's reports are checked against."""
+        self._plans[mission.drone_id] = get_mission_arrays(mission)
+
+    def _deviations(self, slots: np.ndarray, report_times: np.ndarray, positions: np.ndarray) -> Dict[str, float]:
+        deviations = {}
+        for slot, report_time, position in zip(slots, report_times, positions):
+            drone_id = self._slot_ids[slot]
+            plan = self._plans.get(drone_id)
+            if plan is None:
+                continue
+            px, py, pz, active = interpolate_track(*plan, np.array([report_time]))
+            if not active[0]:
+                deviation = np.inf # Airborne outside its planned time window
+            else:
+                dz = position[2] - pz[0]
+                deviation = float(np.sqrt((position[0] - px[0])**2 + (position[1] - py[0])**2 +
+                                          (0.0 if np.isnan(dz) else dz**2)))
+            if deviation > self.conformance_tolerance:
+                deviations[drone_id] = deviation
+        return deviations
+
+    # --- Tactical check ---
+    def tick(self, now: Optional[float] = None) -> TickReport:
+        """
+        Runs one monitoring cycle at time `now` (default: the latest report time).
+        Drones without a report in the last `stale_after` seconds are skipped.
+        """
+        started = time.perf_counter()
+        counts = self._count
+        in_use = counts > 0
+        last_rows = (counts - 1) % self.history
+        slot_range = np.arange(self.capacity)
+        last_times = np.where(in_use, self._times[slot_range, last_rows], np.nan)
+        if now is None:
+            now = float(np.nanmax(last_times)) if in_use.any() else 0.0
+        with np.errstate(invalid='ignore'):
+            fresh = in_use & (now - last_times <= self.stale_after)
+        slots = np.flatnonzero(fresh)
+
+        rows = last_rows[slots]
+        last_pos = self._positions[slots, rows]
+        # Constant-velocity projection from the last two reports
+        prev_rows = (counts[slots] - 2) % self.history
+        dt = last_times[slots] - self._times[slots, prev_rows]
+        has_prev = (counts[slots] >= 2) & (dt > 0)
+        velocity = np.where(has_prev[:, None],
+                            (last_pos - self._positions[slots, prev_rows]) / np.where(has_prev, dt, 1.0)[:, None], 0.0)
+        velocity[:, 2] = np.nan_to_num(velocity[:, 2])
+        lead = now - last_times[slots]
+        projected = last_pos[None, :, :] + velocity[None, :, :] * (lead[None, :] + self.projection_offsets[:, None])[:, :, None]
+
+        conflicts = self._pairwise_conflicts(now, slots, projected)
+        deviations = self._deviations(slots, last_times[slots], last_pos) if self._plans else {}
+        stats = {"drones_checked": len(slots), "projection_steps": len(self.projection_offsets),
+                 "elapsed_s": time.perf_counter() - started}
+        return TickReport(now, conflicts, deviations, stats)
+
+    def _pairwise_conflicts(self, now: float, slots: np.ndarray, projected: np.ndarray) -> ConflictSet:
+        """Earliest projected conflict of every drone pair, with the strategic checker's rules."""
+        n = len(slots)
+        first, second = np.triu_indices(n, k=1)
+        # Only pairs whose projected horizontal extents come within the largest buffer
+        reach = max(self.safety_buffer_2d, self.safety_buffer_3d)
+        low, high = projected[..., :2].min(axis=0), projected[..., :2].max(axis=0)
+        near = np.all((low[first] - high[second] < reach) & (low[second] - high[first] < reach), axis=1)
+        first, second = first[near], second[near]
+        a, b = projected[:, first], projected[:, second] # (steps x pairs x 3)
+        delta = a - b
+        codes = pair_conflict_codes(delta[..., 0], delta[..., 1], delta[..., 2],
+                                    self.safety_buffer_2d, self.safety_buffer_3d, self.vertical_sep_threshold)
+
+        hit = codes != NO_CONFLICT
+        pairs = np.flatnonzero(hit.any(axis=0))
+        step = hit[:, pairs].argmax(axis=0)
+        drone_ids = [self._slot_ids[slot] for slot in slots]
+        offset = delta[step, pairs]
+        dist_2d = np.sqrt(offset[:, 0]**2 + offset[:, 1]**2)
+        return ConflictSet.from_columns(
+            drone_ids,
+            time=now + self.projection_offsets[step],
+            primary_id=first[pairs],
+            other_id=second[pairs],
+            primary_pos=a[step, pairs],
+            other_pos=b[step, pairs],
+            distance_2d=dist_2d,
+            distance_3d=np.sqrt(dist_2d**2 + offset[:, 2]**2),
+            type_code=codes[step, pairs]
+        )
+
+
+# --- Replay ---
+def load_telemetry_csv(path: str) -> List[Tuple[str, float, float, float, Optional[float]]]:
+    """
+    Reads position reports from a CSV file with columns drone_id,timestamp,x,y,z
+    (z may be empty). Returns them sorted by timestamp.
+    """
+    reports = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            z = row.get("z")
+            reports.append((row["drone_id"], float(row["timestamp"]), float(row["x"]), float(row["y"]),
+                            float(z) if z not in (None, "") else None))
+    reports.sort(key=lambda report: report[1])
+    return reports
+
+
+def save_telemetry_csv(path: str, reports: List[Tuple[str, float, float, float, Optional[float]]]) -> None:
+    """Writes position reports in the format read by load_telemetry_csv."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(TELEMETRY_COLUMNS)
+        for drone_id, timestamp, x, y, z in reports:
+            writer.writerow((drone_id, timestamp, x, y, "" if z is None else z))
+
+
+def replay_telemetry(path: str, monitor: TelemetryMonitor, tick_interval: float = 1.0) -> Iterator[TickReport]:
+    """
+    Feeds a recorded telemetry file through a monitor, ticking every `tick_interval`
+    seconds of telemetry time. Yields one TickReport per tick.
+    """
+    reports = load_telemetry_csv(path)
+    if not reports:
+        return
+    next_tick = reports[0][1]
+    for drone_id, timestamp, x, y, z in reports:
+        while timestamp > next_tick:
+            yield monitor.tick(next_tick)
+            next_tick += tick_interval
+        monitor.ingest(drone_id, timestamp, x, y, z)
+    yield monitor.tick(next_tick)
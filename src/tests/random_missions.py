@@ -0,0 +1,43 @@
+import random
+from typing import List, Tuple
+
+from data_structures import Waypoint, DroneMission
+
+# How a random mission gets its altitudes: none, one for the whole mission, one per
+# waypoint, or one for only some waypoints
+ALTITUDE_MODES = ("2d", "level", "3d", "mixed")
+
+
+def random_mission(rng: random.Random,
+                   drone_id: str,
+                   area: float = 300.0,
+                   time_span: float = 100.0,
+                   num_waypoints: Tuple[int, int] = (1, 4),
+                   altitudes: str = "any",
+                   z_range: Tuple[float, float] = (0.0, 30.0),
+                   round_times: bool = False) -> DroneMission:
+    """
+    A mission through a random number of waypoints in [num_waypoints[0], num_waypoints[1]],
+    placed at random in an `area` square at sorted random times in [0, time_span].
+    `altitudes` is one of ALTITUDE_MODES, or "any" to pick one per mission. With
+    `round_times`, some times are rounded to whole seconds so waypoints can share one.
+    """
+    if altitudes == "any":
+        altitudes = rng.choice(ALTITUDE_MODES)
+    times = sorted(rng.uniform(0, time_span) for _ in range(rng.randint(*num_waypoints)))
+    if round_times:
+        times = sorted(round(t, rng.choice([0, 2])) for t in times)
+    level = rng.uniform(*z_range)
+    waypoints = []
+    for t in times:
+        if altitudes == "2d" or (altitudes == "mixed" and rng.random() < 0.5):
+            z = None
+        else:
+            z = level if altitudes == "level" else rng.uniform(*z_range)
+        waypoints.append(Waypoint(rng.uniform(0, area), rng.uniform(0, area), t, z))
+    return DroneMission(waypoints, drone_id)
+
+
+def random_fleet(rng: random.Random, count: int, **mission_options) -> List[DroneMission]:
+    """`count` random missions with ids D0, D1, ...; options are passed to random_mission."""
+    return [random_mission(rng, f"D{i}", **mission_options) for i in range(count)]
@@ -0,0 +1,47 @@
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import check_for_conflicts
+from altitude_index import AltitudeBandIndex, filter_altitude_separated, segment_altitude_bounds
+
+
+def layer_mission(drone_id, z, t0=0.0, t1=10.0):
+    return DroneMission([Waypoint(100, 0, t0, z=z), Waypoint(0, 0, t1, z=z)], drone_id)
+
+
+@pytest.fixture
+def layered_traffic():
+    return [layer_mission(f"Layer{z}", z) for z in (10, 30, 50, 70)] + \
+           [DroneMission([Waypoint(100, 0, 0), Waypoint(0, 0, 10)], "Flat2D")]
+
+
+def test_segment_bounds_require_altitude():
+    assert segment_altitude_bounds(DroneMission([Waypoint(0, 0, 0), Waypoint(1, 0, 1, z=5)], "Mixed")) is None
+    t0, t1, zlo, zhi = segment_altitude_bounds(
+        DroneMission([Waypoint(0, 0, 0, z=5), Waypoint(1, 0, 1, z=15), Waypoint(2, 0, 2, z=10)], "Climb"))
+    assert list(zlo) == [5, 10] and list(zhi) == [15, 15]
+
+
+def test_filter_keeps_only_nearby_layers(layered_traffic):
+    primary = PrimaryDroneMission([(0, 0, 30), (100, 0, 30)], 0, 10, "P30")
+    kept = filter_altitude_separated(primary, layered_traffic, min_vertical_gap=15)
+    assert [m.drone_id for m in kept] == ["Layer30", "Flat2D"]
+
+
+def test_filter_respects_time_overlap():
+    primary = PrimaryDroneMission([(0, 0, 10), (100, 0, 10)], 0, 10, "P10")
+    climbing_later = DroneMission([Waypoint(0, 0, 0, z=80), Waypoint(0, 0, 20, z=80), Waypoint(0, 0, 30, z=10)], "Later")
+    assert filter_altitude_separated(primary, [climbing_later], min_vertical_gap=15) == []
+
+
+def test_band_index_candidates(layered_traffic):
+    index = AltitudeBandIndex(layered_traffic, band_height=15)
+    primary = PrimaryDroneMission([(0, 0, 45), (100, 0, 55)], 0, 10, "P50")
+    assert [m.drone_id for m in index.candidates(primary, 15)] == ["Layer50", "Flat2D"]
+    primary_2d = PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "P2D")
+    assert len(index.candidates(primary_2d, 15)) == len(layered_traffic)
+
+
+def test_pruning_does_not_change_conflicts(layered_traffic):
+    primary = PrimaryDroneMission([(0, 0, 25), (100, 0, 35)], 0, 10, "PClimb")
+    conflicts = check_for_conflicts(primary, layered_traffic, time_resolution=0.5)
+    assert {c['conflicting_drone_id'] for c in conflicts} == {"Layer30", "Flat2D"}
@@ -0,0 +1,51 @@
+import numpy as np
+from data_structures import Waypoint, DroneMission
+from conflict_checker import get_mission_arrays
+from kernels import pack_tracks
+from broad_phase import SegmentBoxes, sweep_and_prune, closest_approach, candidate_windows, window_time_indices
+
+
+def test_sweep_and_prune_finds_every_overlapping_pair_once():
+    rng = np.random.default_rng(0)
+    starts_a, starts_b = rng.uniform(0, 100, 40), np.round(rng.uniform(0, 100, 60))
+    ends_a, ends_b = starts_a + rng.uniform(0, 10, 40), starts_b + np.round(rng.uniform(0, 10, 60))
+    ia, ib = sweep_and_prune(starts_a, ends_a, starts_b, ends_b)
+    expected = {(i, j) for i in range(40) for j in range(60)
+                if starts_a[i] <= ends_b[j] and starts_b[j] <= ends_a[i]}
+    assert sorted(zip(ia.tolist(), ib.tolist())) == sorted(expected)
+
+
+def test_segment_boxes_of_multi_leg_and_single_waypoint_tracks():
+    survey = DroneMission([Waypoint(0, 0, 0, 10), Waypoint(100, 0, 10, 10), Waypoint(100, 50, 20)], "S")
+    hover = DroneMission([Waypoint(5, 5, 3)], "H")
+    boxes = SegmentBoxes(pack_tracks([get_mission_arrays(survey), get_mission_arrays(hover)]))
+    assert len(boxes) == 3
+    np.testing.assert_array_equal(boxes.track, [0, 0, 1])
+    np.testing.assert_array_equal(boxes.full_z, [True, False, False])
+    np.testing.assert_array_equal(boxes.moving, [True, True, False])
+    np.testing.assert_allclose(boxes.velocity[0], [10, 0, 0])
+    assert boxes.low[1, 2] == -np.inf and boxes.high[0, 0] == 100
+
+
+def test_closest_approach_of_crossing_drones():
+    u, distance = closest_approach(np.array([[-10.0, 3.0]]), np.array([[2.0, 0.0]]), np.array([20.0]))
+    assert u[0] == 5.0 and distance[0] == 3.0
+    u, distance = closest_approach(np.array([[-10.0, 3.0]]), np.array([[2.0, 0.0]]), np.array([2.0]))
+    assert u[0] == 2.0 and np.isclose(distance[0], np.sqrt(45.0))
+
+
+def test_candidate_windows_keep_only_close_segments():
+    # A long survey passes one drone closely, another far away and a third far above
+    survey = DroneMission([Waypoint(0, 0, 0, 20), Waypoint(1000, 0, 100, 20), Waypoint(1000, 1000, 200, 20)], "S")
+    near = DroneMission([Waypoint(500, -50, 40, 20), Waypoint(500, 50, 60, 20)], "N") # Crosses at t=50
+    far = DroneMission([Waypoint(500, 500, 40, 20), Waypoint(600, 500, 60, 20)], "F")
+    high = DroneMission([Waypoint(1000, 400, 120, 200), Waypoint(1000, 600, 180, 200)], "H")
+    packed = pack_tracks([get_mission_arrays(m) for m in (near, far, high)])
+    thresholds = np.full(3, 10.0), np.full(3, 15.0), np.full(3, 5.0)
+    drone, start, end = candidate_windows(get_mission_arrays(survey), packed, *thresholds)
+    assert drone.tolist() == [0]
+    assert 48 < start[0] < 50 < end[0] < 52
+
+    times = np.arange(0.0, 200.5, 0.5)
+    (d, indices), = list(window_time_indices(drone, start, end, times))
+    assert d == 0 and times[indices].min() >= start[0] and times[indices].max() <= end[0]
@@ -1,7 +1,9 @@
+import random
 import pytest
 import numpy.testing as npt
 from data_structures import Waypoint, DroneMission, PrimaryDroneMission
 from conflict_checker import get_drone_position_at_time, check_for_conflicts, calculate_distance
+from tests.random_missions import random_fleet
 
 # --- Test get_drone_position_at_time ---
 @pytest.fixture
@@ -175,4 +177,27 @@ def test_3d_conflict_vertical_separation(primary_straight_3d): # Primary at z=10
                                      safety_buffer_2d=5, safety_buffer_3d=2.0, # 3D buffer met
                                      vertical_sep_threshold=3, time_resolution=0.1)
     assert conflicts2
-    assert conflicts2[0]['type'] == "Insufficient vertical separation"
\ No newline at end of file
+    assert conflicts2[0]['type'] == "Insufficient vertical separation"
+
+def test_coarse_to_fine_matches_full_resolution():
+    rng = random.Random(2)
+    for scenario in range(12):
+        others = random_fleet(rng, 30)
+        coords = [(rng.uniform(0, 300), rng.uniform(0, 300)) + ((rng.uniform(0, 30),) if scenario % 2 else ())
+                  for _ in range(4)]
+        primary = PrimaryDroneMission(coords, 5, 80, "P")
+        full = check_for_conflicts(primary, others, time_resolution=0.5)
+        for coarse_time_step in (2.0, 7.5):
+            assert check_for_conflicts(primary, others, time_resolution=0.5,
+                                       coarse_time_step=coarse_time_step) == full
+
+
+def test_segment_broad_phase_matches_full_resolution():
+    rng = random.Random(5)
+    for scenario in range(12):
+        others = random_fleet(rng, 30, num_waypoints=(1, 5), round_times=True)
+        coords = [(rng.uniform(0, 300), rng.uniform(0, 300)) + ((rng.uniform(0, 30),) if scenario % 2 else ())
+                  for _ in range(6)]
+        primary = PrimaryDroneMission(coords, 5, 80, "P")
+        assert check_for_conflicts(primary, others, time_resolution=0.5, broad_phase=True) == \
+            check_for_conflicts(primary, others, time_resolution=0.5)
@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import check_for_conflicts, check_for_conflicts_2d
+from conflict_set import ConflictSet, CONFLICT_TYPES
+from simulation_data import get_sample_simulated_schedules_with_conflict
+
+
+@pytest.fixture
+def conflicts_3d():
+    primary = PrimaryDroneMission([(0,0,10),(100,100,15)], 0, 10, "P3D")
+    return check_for_conflicts(primary, get_sample_simulated_schedules_with_conflict(), time_resolution=0.5)
+
+
+def test_round_trip_from_conflicts(conflicts_3d):
+    assert conflicts_3d
+    cs = ConflictSet.from_conflicts(conflicts_3d)
+    assert len(cs) == len(conflicts_3d)
+    assert cs.to_list() == conflicts_3d
+    assert cs[0] == conflicts_3d[0]
+    assert cs[-1] == conflicts_3d[-1]
+
+
+def test_empty_set_is_falsy():
+    cs = ConflictSet()
+    assert not cs
+    assert len(cs) == 0
+    assert list(cs) == []
+    assert cs.group_by_drone() == {}
+
+
+def test_filter_sort_and_group(conflicts_3d):
+    cs = ConflictSet.from_conflicts(conflicts_3d)
+    groups = cs.group_by_drone()
+    assert sum(len(g) for g in groups.values()) == len(cs)
+    for drone_id, group in groups.items():
+        assert all(c['conflicting_drone_id'] == drone_id for c in group)
+        assert np.all(np.diff(group.times) >= 0)
+        assert len(cs.involving(drone_id)) == len(group)
+
+    for conflict_type in CONFLICT_TYPES:
+        assert all(c['type'] == conflict_type for c in cs.of_type(conflict_type))
+
+    by_distance = cs.sorted(by="distance_2d")
+    assert np.all(np.diff(by_distance.records["distance_2d"]) >= 0)
+    assert len(cs.between(0.0, 5.0)) == sum(1 for c in conflicts_3d if c['time'] <= 5.0)
+
+
+def test_concatenate_remaps_ids():
+    a = ConflictSet.from_conflicts([{"time": 1.0, "primary_drone_id": "P", "primary_pos": (0, 0, None),
+                                     "conflicting_drone_id": "A", "other_pos": (1, 0, None),
+                                     "distance_2d": 1.0, "distance_3d": None, "type": "2D proximity"}])
+    b = ConflictSet.from_conflicts([{"time": 2.0, "primary_drone_id": "Q", "primary_pos": (0, 0, 5),
+                                     "conflicting_drone_id": "P", "other_pos": (0, 0, 7),
+                                     "distance_2d": 0.0, "distance_3d": 2.0, "type": "3D proximity"}])
+    merged = ConflictSet.concatenate([a, b])
+    assert merged.to_list() == a.to_list() + b.to_list()
+
+
+def test_save_and_load(tmp_path, conflicts_3d):
+    cs = ConflictSet.from_conflicts(conflicts_3d)
+    path = tmp_path / "conflicts.npz"
+    cs.save(str(path))
+    loaded = ConflictSet.load(str(path))
+    assert loaded.to_list() == conflicts_3d
+
+
+def test_2d_fast_path_returns_conflict_set():
+    primary = PrimaryDroneMission([(0,50),(100,50)], 0, 10, "P2D")
+    cs = check_for_conflicts_2d(primary, get_sample_simulated_schedules_with_conflict(), time_resolution=0.5)
+    assert isinstance(cs, ConflictSet)
+    assert cs
+    assert all(c['primary_drone_id'] == "P2D" and c['distance_3d'] is None for c in cs)
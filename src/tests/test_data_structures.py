@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from data_structures import Waypoint, DroneMission, PrimaryDroneMission
 
 def test_waypoint_creation():
@@ -89,4 +90,41 @@ with pytest.raises(ValueError):
     PrimaryDroneMission([], 0, 10, "P_Empty")
 
 with pytest.raises(ValueError):
-    PrimaryDroneMission([(0,0)], 10, 0, "P_InvalidTime") # End before start
\ No newline at end of file
+    PrimaryDroneMission([(0,0)], 10, 0, "P_InvalidTime") # End before start
+
+def test_primary_drone_mission_from_array():
+    coords = np.array([[0, 0, 10], [100, 0, 10], [100, 100, 20]])
+    p_mission = PrimaryDroneMission(coords, 0.0, 10.0, "P_Array")
+    assert [wp.timestamp for wp in p_mission.waypoints] == [0.0, 5.0, 10.0]
+    assert p_mission.waypoints[2].z == 20
+    assert p_mission.is_mission_3d()
+
+    mixed = PrimaryDroneMission([(0, 0), (10, 0, 5)], 0.0, 1.0, "P_Mixed")
+    assert mixed.waypoints[0].z is None and mixed.waypoints[1].z == 5
+
+
+def test_primary_drone_mission_constant_speed():
+    coords = [(0, 0), (30, 0), (30, 10)] # Segments of 30m and 10m
+    p_mission = PrimaryDroneMission(coords, 0.0, 8.0, "P_Speed", timing="constant_speed")
+    assert [wp.timestamp for wp in p_mission.waypoints] == pytest.approx([0.0, 6.0, 8.0])
+
+    p_cruise = PrimaryDroneMission(coords, 2.0, None, "P_Cruise", timing="constant_speed", cruise_speed=5.0)
+    assert [wp.timestamp for wp in p_cruise.waypoints] == pytest.approx([2.0, 8.0, 10.0])
+    assert p_cruise.mission_overall_end_time == pytest.approx(10.0)
+
+
+def test_primary_drone_mission_speed_limits():
+    coords = [(0, 0), (30, 0), (30, 10)]
+    p_mission = PrimaryDroneMission(coords, 0.0, None, "P_Limits", timing="speed_limits",
+                                    segment_speed_limits=[10.0, 2.0])
+    assert [wp.timestamp for wp in p_mission.waypoints] == pytest.approx([0.0, 3.0, 8.0])
+
+    # Slower than the limits allow: the profile is stretched to the end time
+    p_stretched = PrimaryDroneMission(coords, 0.0, 16.0, "P_Stretch", timing="speed_limits",
+                                      segment_speed_limits=[10.0, 2.0])
+    assert [wp.timestamp for wp in p_stretched.waypoints] == pytest.approx([0.0, 6.0, 16.0])
+
+    with pytest.raises(ValueError):
+        PrimaryDroneMission(coords, 0.0, 4.0, "P_TooFast", timing="speed_limits", segment_speed_limits=[10.0, 2.0])
+    with pytest.raises(ValueError):
+        PrimaryDroneMission(coords, 0.0, 10.0, "P_BadMode", timing="warp")
@@ -0,0 +1,57 @@
+import random
+import numpy as np
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts
+from departure_slots import departure_slots, earliest_departure_delay, forbidden_delay_intervals
+from tests.random_missions import random_fleet
+
+
+@pytest.mark.parametrize("primary_3d", [False, True])
+def test_slots_match_shifted_checks(primary_3d):
+    rng = random.Random(5)
+    for _ in range(4):
+        fleet = random_fleet(rng, 25, area=200.0, time_span=150.0)
+        coords = [(rng.uniform(0, 200), rng.uniform(0, 200)) + ((rng.uniform(0, 30),) if primary_3d else ())
+                  for _ in range(3)]
+        primary = PrimaryDroneMission(coords, 10, 60, "P")
+        slots = departure_slots(primary, fleet, 0, 100)
+
+        for start, end in slots:
+            for delay in (start, (start + end) / 2, end):
+                assert not find_conflicts(primary.shifted(delay), fleet)
+        for delay in np.arange(0, 100, 2.3):
+            if any(start <= delay <= end for start, end in slots):
+                continue
+            if min((abs(delay - bound) for slot in slots for bound in slot), default=1.0) > 1e-4:
+                assert find_conflicts(primary.shifted(delay), fleet)
+
+
+def test_earliest_delay_clears_crossing_traffic():
+    primary = PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "P")
+    crossing = DroneMission([Waypoint(50, -50, 0), Waypoint(50, 50, 10)], "Crossing")
+
+    assert find_conflicts(primary, [crossing])
+    blocked = forbidden_delay_intervals(primary, [crossing], 0, 60)
+    assert list(blocked) == ["Crossing"]
+
+    delay = earliest_departure_delay(primary, [crossing], 0, 60)
+    assert delay is not None and delay > 0
+    assert not find_conflicts(primary.shifted(delay), [crossing])
+    assert find_conflicts(primary.shifted(delay - 0.01), [crossing])
+
+
+def test_no_slot_when_range_is_blocked():
+    primary = PrimaryDroneMission([(0, 0), (10, 0)], 0, 10, "P")
+    hover = DroneMission([Waypoint(5, 0, 0), Waypoint(5, 0, 500)], "Hover")
+    assert departure_slots(primary, [hover], 0, 100) == []
+    assert earliest_departure_delay(primary, [hover], 0, 100) is None
+    assert departure_slots(primary, [], 0, 100) == [(0, 100)]
+
+
+def test_shifted_primary_keeps_window():
+    primary = PrimaryDroneMission([(0, 0), (10, 0)], 5, 15, "P")
+    shifted = primary.shifted(30)
+    assert (shifted.mission_overall_start_time, shifted.mission_overall_end_time) == (35, 45)
+    assert [wp.timestamp for wp in shifted.waypoints] == [35, 45]
+    assert [wp.timestamp for wp in primary.waypoints] == [5, 15]
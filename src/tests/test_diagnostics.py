@@ -0,0 +1,51 @@
+import tracemalloc
+from data_structures import Waypoint, DroneMission
+from diagnostics import memory_report, measure_allocation, live_object_counts
+from conflict_set import CONFLICT_DTYPE
+from benchmarks.memory_benchmark import benchmark_fleet, compare_with_baseline
+
+
+def test_memory_report_counts_live_objects():
+    missions = [DroneMission([Waypoint(0, 0, 0), Waypoint(10, 0, 10)], f"D{i}") for i in range(3)]
+    before = live_object_counts()
+    more = [DroneMission([Waypoint(0, 0, 0)], "E")]
+    after = live_object_counts()
+    assert after["missions"] - before["missions"] == 1
+    assert after["waypoints"] - before["waypoints"] == 1
+
+    report = memory_report(count_objects=False)
+    assert report["objects"] is None
+    assert report["tracemalloc"] is None or tracemalloc.is_tracing()
+    assert report["rss_bytes"] is None or report["rss_bytes"] > 0
+    del missions, more
+
+
+def test_memory_report_lists_allocation_sites_while_tracing():
+    tracemalloc.start()
+    try:
+        blob = [Waypoint(i, i, i) for i in range(1000)]
+        report = memory_report(top=3)
+    finally:
+        tracemalloc.stop()
+    assert report["tracemalloc"]["traced_bytes"] > 0
+    assert len(report["tracemalloc"]["top_sites"]) == 3
+    del blob
+
+
+def test_measure_allocation_keeps_result_alive():
+    result, retained, peak = measure_allocation(lambda: [Waypoint(i, 0, i) for i in range(500)])
+    assert len(result) == 500
+    assert 0 < retained <= peak
+    assert not tracemalloc.is_tracing()
+
+
+def test_benchmark_fleet_and_baseline_comparison():
+    result = benchmark_fleet(20, num_waypoints=5, seed=1)
+    assert result["missions"] == 20
+    assert result["bytes_per_waypoint"] > 0 and result["bytes_per_mission"] > 0
+    assert result["bytes_per_conflict_set_row"] in (None, CONFLICT_DTYPE.itemsize)
+    report = {"results": [result]}
+    assert compare_with_baseline(report, report) == []
+    shrunk = dict(result, bytes_per_waypoint=result["bytes_per_waypoint"] / 2)
+    regressions = compare_with_baseline(report, {"results": [shrunk]})
+    assert len(regressions) == 1 and "bytes_per_waypoint" in regressions[0]
@@ -0,0 +1,86 @@
+import os
+import random
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts
+from distributed import DistributedDeconflictor, mission_tiles
+from tests.random_missions import random_fleet
+
+
+def test_mission_tiles_include_halo():
+    mission = DroneMission([Waypoint(95, 5, 0), Waypoint(95, 20, 10)], "Edge")
+    assert mission_tiles(mission, 100) == {(0, 0)}
+    assert mission_tiles(mission, 100, halo=10) == {(0, -1), (0, 0), (1, -1), (1, 0)}
+
+
+def test_distributed_matches_single_process():
+    fleet = random_fleet(random.Random(14), 80, area=1000.0)
+    primaries = [PrimaryDroneMission([(0, 0, 15), (1000, 1000, 15)], 0, 100, "P1"),
+                 PrimaryDroneMission([(500, 0), (500, 1000), (0, 500)], 10, 90, "P2")]
+    with DistributedDeconflictor(tile_size=150, num_workers=3) as service:
+        for mission in fleet:
+            service.add_mission(mission)
+        assert sum(stats["missions"] for stats in service.worker_stats()) >= len(fleet)
+
+        for primary in primaries:
+            expected = find_conflicts(primary, fleet).to_list()
+            assert expected
+            assert service.find_conflicts(primary).to_list() == expected
+
+        service.remove_mission(fleet[0].drone_id)
+        status, conflicts = service.deconfliction_query(primaries[0])
+        assert conflicts.to_list() == find_conflicts(primaries[0], fleet[1:]).to_list()
+        with pytest.raises(KeyError):
+            service.remove_mission(fleet[0].drone_id)
+
+
+class FailingMission(DroneMission):
+    """Cannot be received by the worker process with pid `fail_pid`."""
+    fail_pid = None
+
+    def __setstate__(self, state):
+        if os.getpid() == state["fail_pid"]:
+            raise ValueError("Simulated worker failure")
+        self.__dict__.update(state)
+
+
+def test_worker_failure_is_rolled_back():
+    fleet = random_fleet(random.Random(14), 40, area=1000.0)
+    primary = PrimaryDroneMission([(0, 0, 15), (1000, 1000, 15)], 0, 100, "P1")
+    with DistributedDeconflictor(tile_size=150, num_workers=3) as service:
+        for mission in fleet:
+            service.add_mission(mission)
+        # Crosses tiles of every worker; one of them cannot take it
+        failing = FailingMission([Waypoint(0, 500, 0), Waypoint(1000, 500, 100)], "Bad")
+        failing.fail_pid = service._processes[1].pid
+        with pytest.raises(RuntimeError, match="worker 1"):
+            service.add_mission(failing)
+        assert len(service) == len(fleet)
+        assert sum(stats["missions"] for stats in service.worker_stats()) == \
+               sum(len(service._by_worker(mission_tiles(m, 150, service.halo))) for m in fleet)
+        assert service.find_conflicts(primary).to_list() == find_conflicts(primary, fleet).to_list()
+
+
+def test_failed_replacement_keeps_the_earlier_mission():
+    fleet = random_fleet(random.Random(14), 40, area=1000.0)
+    primary = PrimaryDroneMission([(0, 0, 15), (1000, 1000, 15)], 0, 100, "P1")
+    with DistributedDeconflictor(tile_size=150, num_workers=3) as service:
+        for mission in fleet:
+            service.add_mission(mission)
+        replaced = fleet[0]
+        failing = FailingMission([Waypoint(0, 500, 0), Waypoint(1000, 500, 100)], replaced.drone_id)
+        failing.fail_pid = service._processes[1].pid
+        with pytest.raises(RuntimeError, match="worker 1"):
+            service.add_mission(failing)
+        assert service._missions[replaced.drone_id][2] is replaced
+        assert sum(stats["missions"] for stats in service.worker_stats()) == \
+               sum(len(service._by_worker(mission_tiles(m, 150, service.halo))) for m in fleet)
+        assert service.find_conflicts(primary).to_list() == find_conflicts(primary, fleet).to_list()
+
+        # A successful replacement releases the tiles only the earlier mission reached
+        moved = DroneMission([Waypoint(900, 900, 0, z=15), Waypoint(1000, 1000, 100, z=15)], replaced.drone_id)
+        service.add_mission(moved)
+        schedule = fleet[1:] + [moved]
+        assert sum(stats["missions"] for stats in service.worker_stats()) == \
+               sum(len(service._by_worker(mission_tiles(m, 150, service.halo))) for m in schedule)
+        assert service.find_conflicts(primary).to_list() == find_conflicts(primary, schedule).to_list()
@@ -0,0 +1,61 @@
+import random
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts
+from first_conflict import conflict_likelihood_order, find_first_conflict
+from interface import deconfliction_query, STATUS_CLEAR, STATUS_CONFLICT
+from tests.random_missions import random_fleet
+
+
+def line_mission(drone_id, y, t0=0, t1=100, x0=0, x1=100):
+    return DroneMission([Waypoint(x0, y, t0, 50), Waypoint(x1, y, t1, 50)], drone_id)
+
+
+@pytest.fixture
+def primary():
+    return PrimaryDroneMission([(0, 0, 50), (100, 0, 50)], 0, 100, "P")
+
+
+def test_likelihood_order_ranks_and_prunes(primary):
+    others = [
+        line_mission("Far", 500),
+        line_mission("Near", 5),
+        line_mission("Later", 0, 200, 300),
+        line_mission("Closer", 1),
+        line_mission("Brief", 1, 90, 100, 90, 100),
+        line_mission("P", 0), # Same drone as the primary
+    ]
+    order = [others[i].drone_id for i in conflict_likelihood_order(primary, others)]
+    assert order == ["Closer", "Brief", "Near"]
+
+
+def test_first_conflict_with_each_ordering(primary):
+    others = [line_mission(f"Far{i}", 100 + 10 * i) for i in range(6)] + [line_mission("Near", 5)]
+    for ordering in ("likelihood", "schedule"):
+        conflict = find_first_conflict(primary, others, ordering=ordering)
+        assert conflict["conflicting_drone_id"] == "Near" and conflict["time"] == pytest.approx(0.0)
+    assert find_first_conflict(primary, others[:-1]) is None
+    with pytest.raises(ValueError):
+        find_first_conflict(primary, others, ordering="random")
+
+
+def test_first_conflict_agrees_with_full_check():
+    rng = random.Random(7)
+    for _ in range(20):
+        others = random_fleet(rng, 30, area=500.0, time_span=300.0, num_waypoints=(2, 2), altitudes="3d",
+                              z_range=(30.0, 60.0))
+        primary = PrimaryDroneMission([(rng.uniform(0, 500), rng.uniform(0, 500), 45) for _ in range(3)], 50, 250, "P")
+        conflicts = find_conflicts(primary, others)
+        conflict = find_first_conflict(primary, others)
+        assert (conflict is not None) == bool(conflicts)
+        if conflict is not None:
+            assert conflict in list(conflicts)
+
+
+def test_deconfliction_query_stop_at_first(primary):
+    others = [line_mission("A", 5), line_mission("B", -5), line_mission("C", 500)]
+    status, conflicts = deconfliction_query(primary, others, stop_at_first=True)
+    assert status == STATUS_CONFLICT and len(conflicts) == 1
+    assert conflicts[0]["conflicting_drone_id"] in ("A", "B")
+    status, conflicts = deconfliction_query(primary, others[2:], stop_at_first=True)
+    assert status == STATUS_CLEAR and not conflicts
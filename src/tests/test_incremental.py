@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts
+from incremental import amended_time_window, recheck_amended_mission
+from recurring import RecurringMission
+
+
+@pytest.fixture
+def fleet():
+    return [
+        DroneMission([Waypoint(0, 50, 0), Waypoint(400, 50, 40)], "Eastbound"),
+        DroneMission([Waypoint(200, -50, 10, z=20), Waypoint(200, 150, 30, z=20)], "Northbound3D"),
+        DroneMission([Waypoint(300, 0, 0), Waypoint(300, 0, 40)], "Hover"),
+    ]
+
+
+def survey_coords():
+    return [(x, 50 if i % 2 == 0 else 0) for i, x in enumerate(range(0, 401, 50))]
+
+
+def test_amended_window_bounds_the_edit():
+    old = PrimaryDroneMission(survey_coords(), 0, 40, "Survey")
+    coords = survey_coords()
+    coords[4] = (200, 80) # Move one waypoint (at t=20); its neighbours are at t=15 and t=25
+    new = PrimaryDroneMission(coords, 0, 40, "Survey")
+    assert amended_time_window(old, new) == (15.0, 25.0)
+    assert amended_time_window(old, PrimaryDroneMission(survey_coords(), 0, 40, "Survey")) is None
+
+
+def test_recheck_matches_full_run(fleet):
+    old = PrimaryDroneMission(survey_coords(), 0, 40, "Survey")
+    previous = find_conflicts(old, fleet, time_resolution=0.5)
+    assert previous
+
+    for edited_index, new_coord in [(4, (200, 80)), (0, (10, 10)), (8, (390, 10))]:
+        coords = survey_coords()
+        coords[edited_index] = new_coord
+        new = PrimaryDroneMission(coords, 0, 40, "Survey")
+        rechecked = recheck_amended_mission(old, new, fleet, previous, time_resolution=0.5)
+        assert rechecked.to_list() == find_conflicts(new, fleet, time_resolution=0.5).to_list()
+
+
+def test_recheck_with_inserted_waypoint_and_new_window(fleet):
+    old = PrimaryDroneMission(survey_coords(), 0, 40, "Survey")
+    previous = find_conflicts(old, fleet, time_resolution=0.5).to_list()
+
+    inserted = DroneMission(old.waypoints[:3] + [Waypoint(120, 60, 12)] + old.waypoints[3:], "Survey")
+    rechecked = recheck_amended_mission(old, inserted, fleet, previous, time_resolution=0.5)
+    assert rechecked.to_list() == find_conflicts(inserted, fleet, time_resolution=0.5).to_list()
+
+    stretched = PrimaryDroneMission(survey_coords(), 0, 50, "Survey")
+    rechecked = recheck_amended_mission(old, stretched, fleet, previous, time_resolution=0.5)
+    assert rechecked.to_list() == find_conflicts(stretched, fleet, time_resolution=0.5).to_list()
+
+
+def test_recheck_orders_recurring_repetitions_by_template_position(fleet):
+    # Repeats Eastbound's route: ties at the same check times must keep schedule order
+    patrol = RecurringMission(fleet[0].waypoints, "Patrol", first_start=0, interval=2, count=3)
+    schedules = [fleet[0], patrol, fleet[2]]
+    old = PrimaryDroneMission(survey_coords(), 0, 40, "Survey")
+    previous = find_conflicts(old, schedules, time_resolution=0.5)
+    coords = survey_coords()
+    coords[4] = (200, 80)
+    new = PrimaryDroneMission(coords, 0, 40, "Survey")
+    expected = find_conflicts(new, schedules, time_resolution=0.5).to_list()
+    assert {c["conflicting_drone_id"] for c in expected} >= {"Eastbound", "Patrol#0"}
+    assert recheck_amended_mission(old, new, schedules, previous, time_resolution=0.5).to_list() == expected
@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import check_for_conflicts, check_for_conflicts_2d, get_check_times, \
+                             get_positions_at_times, get_drone_position_at_time
+from interface import check_mission, deconfliction_query, merge_conflict_intervals, ConflictReport
+from simulation_data import get_sample_simulated_schedules_with_conflict, \
+                            get_sample_simulated_schedules_no_conflict
+
+
+def assert_same_conflicts(expected, actual):
+    assert len(expected) == len(actual)
+    for e, a in zip(expected, actual):
+        assert e['time'] == pytest.approx(a['time'])
+        assert e['conflicting_drone_id'] == a['conflicting_drone_id']
+        assert e['type'] == a['type']
+        assert e['distance_2d'] == pytest.approx(a['distance_2d'])
+        assert e['primary_pos'][:2] == pytest.approx(a['primary_pos'][:2])
+        assert e['other_pos'][:2] == pytest.approx(a['other_pos'][:2])
+
+
+def test_check_times_cover_window():
+    primary = PrimaryDroneMission([(0,0),(100,0)], 0, 10, "P")
+    times = get_check_times(primary, 0.3)
+    assert times[0] == 0.0
+    assert times[-1] == 10.0
+    assert np.all(np.diff(times) > 0)
+
+
+def test_positions_at_times_match_scalar():
+    mission = DroneMission([Waypoint(0,0,0, z=10), Waypoint(50,20,4), Waypoint(100,0,10, z=30)], "Mixed")
+    times = np.linspace(-1, 11, 49)
+    xs, ys, zs, active = get_positions_at_times(mission, times)
+    for i, t in enumerate(times):
+        wp = get_drone_position_at_time(mission, t)
+        assert active[i] == (wp is not None)
+        if wp is not None:
+            assert (xs[i], ys[i]) == pytest.approx((wp.x, wp.y))
+            if wp.z is None:
+                assert np.isnan(zs[i])
+            else:
+                assert zs[i] == pytest.approx(wp.z)
+
+
+def test_2d_fast_path_matches_generic_check():
+    primary = PrimaryDroneMission([(0,50),(100,50)], 0, 10, "P2D")
+    others = get_sample_simulated_schedules_with_conflict()
+    expected = check_for_conflicts(primary, others, safety_buffer_2d=10, time_resolution=0.1)
+    actual = check_for_conflicts_2d(primary, others, safety_buffer_2d=10, time_resolution=0.1)
+    assert expected
+    assert_same_conflicts(expected, actual)
+
+
+def test_check_mission_report_conflict():
+    primary = PrimaryDroneMission([(0,50),(100,50)], 0, 10, "P2D")
+    report = check_mission(primary, get_sample_simulated_schedules_with_conflict(), safety_buffer=10, dt=0.1)
+    assert isinstance(report, ConflictReport)
+    assert report.status == "conflict detected"
+    assert report.stats["check_path"] == "2d-vectorized"
+    assert "DroneX_HeadOn" in report.conflicting_drone_ids
+    assert report.min_separation == pytest.approx(0.0, abs=1e-6)
+    for drone_id, start, end in report.intervals:
+        assert start <= end
+
+
+def test_check_mission_report_clear_3d():
+    primary = PrimaryDroneMission([(0,0,10),(100,100,25)], 0, 10, "P3D")
+    report = check_mission(primary, get_sample_simulated_schedules_no_conflict())
+    assert report.is_clear
+    assert report.stats["check_path"] == "generic"
+    assert report.intervals == []
+    assert report.min_separation is not None and report.min_separation > 15
+
+
+def test_deconfliction_query_status():
+    primary = PrimaryDroneMission([(0,50),(100,50)], 0, 10, "P2D")
+    status, conflicts = deconfliction_query(primary, get_sample_simulated_schedules_with_conflict())
+    assert status == "conflict detected"
+    assert conflicts
+
+
+def test_merge_conflict_intervals():
+    def conflict(t, drone_id):
+        return {"time": t, "primary_drone_id": "P", "primary_pos": (0.0, 0.0, None),
+                "conflicting_drone_id": drone_id, "other_pos": (1.0, 0.0, None),
+                "distance_2d": 1.0, "distance_3d": None, "type": "2D proximity"}
+    conflicts = [conflict(1.0, "A"), conflict(1.5, "A"), conflict(1.5, "B"), conflict(4.0, "A")]
+    assert merge_conflict_intervals(conflicts, 0.5) == [("A", 1.0, 1.5), ("B", 1.5, 1.5), ("A", 4.0, 4.0)]
@@ -0,0 +1,111 @@
+import random
+import numpy as np
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import get_check_times, get_positions_at_times, get_mission_arrays, find_conflicts, \
+                             get_drone_position_at_time, calculate_distance, \
+                             MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, VERTICAL_SEPARATION_THRESHOLD
+from kernels import pack_tracks, conflict_codes, interpolate_track, interpolate_tracks, max_track_speeds, \
+                    _conflict_codes_numpy, _conflict_codes_loops, KERNEL_BACKEND, NO_CONFLICT
+from simulation_data import get_sample_simulated_schedules_with_conflict
+from tests.random_missions import random_fleet, random_mission
+
+
+def kernel_inputs():
+    primary = PrimaryDroneMission([(0,0,10),(100,100,15),(100,0,10)], 0, 20, "P")
+    others = get_sample_simulated_schedules_with_conflict() + [
+        DroneMission([Waypoint(50,50,5, z=12)], "Point"),
+        DroneMission([Waypoint(100,0,0, z=10), Waypoint(100,0,10), Waypoint(90,10,10), Waypoint(0,0,20, z=14)], "Mixed"),
+    ]
+    times = get_check_times(primary, 0.25)
+    tracks = [get_mission_arrays(m) for m in others]
+    n = len(others)
+    thresholds = (np.full(n, 10.0), np.full(n, 15.0), np.full(n, 5.0))
+    return times, get_positions_at_times(primary, times), pack_tracks(tracks), thresholds
+
+
+def test_loop_kernel_matches_numpy_kernel():
+    times, primary_positions, packed, thresholds = kernel_inputs()
+    shape = (len(packed[0]) - 1, len(times))
+    codes_numpy = np.empty(shape, dtype=np.int8)
+    codes_loops = np.empty(shape, dtype=np.int8)
+    _conflict_codes_numpy(times, *primary_positions, *packed, *thresholds, codes_numpy)
+    _conflict_codes_loops(times, *primary_positions, *packed, *thresholds, codes_loops)
+    assert (codes_numpy != NO_CONFLICT).any()
+    np.testing.assert_array_equal(codes_numpy, codes_loops)
+
+
+def test_conflict_codes_uses_available_backend():
+    assert KERNEL_BACKEND in ("numba", "numpy")
+    times, primary_positions, packed, thresholds = kernel_inputs()
+    codes = conflict_codes(times, primary_positions, packed, *thresholds)
+    assert codes.shape == (len(packed[0]) - 1, len(times))
+    assert codes.dtype == np.int8
+
+
+def reference_conflicts(primary, others, time_resolution, buf2, buf3, vsep):
+    """Conflict keys from the scalar position and distance helpers, one check time and drone at a time."""
+    found = []
+    for t in get_check_times(primary, time_resolution).tolist():
+        primary_pos = get_drone_position_at_time(primary, t)
+        if primary_pos is None:
+            continue
+        for other in others:
+            other_pos = get_drone_position_at_time(other, t)
+            if other_pos is None:
+                continue
+            dist_2d, dist_3d = calculate_distance(primary_pos, other_pos)
+            if dist_3d is None:
+                if dist_2d < buf2:
+                    found.append((t, other.drone_id, "2D proximity"))
+            elif dist_3d < buf3:
+                found.append((t, other.drone_id, "3D proximity"))
+            elif dist_2d < buf2 and abs(primary_pos.z - other_pos.z) < vsep:
+                found.append((t, other.drone_id, "Insufficient vertical separation"))
+    return sorted(found)
+
+
+# With the default buffers a vertical separation conflict is always also a 3D one; a
+# 3D buffer below the 2D one makes the vertical rule reachable
+THRESHOLDS = [(MINIMUM_DISTANCE_THRESHOLD_2D, MINIMUM_DISTANCE_THRESHOLD_3D, VERTICAL_SEPARATION_THRESHOLD),
+              (20.0, 12.0, 8.0)]
+
+
+@pytest.mark.parametrize("thresholds", THRESHOLDS)
+@pytest.mark.parametrize("altitudes", ["2d", "3d", "mixed"])
+def test_find_conflicts_matches_scalar_reference(altitudes, thresholds):
+    rng = random.Random(altitudes)
+    seen_types = set()
+    for _ in range(20):
+        primary = random_mission(rng, "P", area=200.0, num_waypoints=(1, 5), altitudes=altitudes)
+        others = random_fleet(rng, 8, area=200.0, num_waypoints=(1, 5), altitudes=altitudes)
+        conflicts = find_conflicts(primary, others, *thresholds, time_resolution=0.5)
+        got = sorted((c["time"], c["conflicting_drone_id"], c["type"]) for c in conflicts)
+        assert got == reference_conflicts(primary, others, 0.5, *thresholds)
+        seen_types.update(key[2] for key in got)
+    assert seen_types >= ({"2D proximity"} if altitudes == "2d" else {"3D proximity"})
+    if altitudes != "2d" and thresholds[1] < thresholds[0]:
+        assert "Insufficient vertical separation" in seen_types
+
+
+def test_interpolate_tracks_matches_single_track():
+    times, _, packed, _ = kernel_inputs()
+    offsets = packed[0]
+    stacked = interpolate_tracks(packed, times)
+    for d in range(len(offsets) - 1):
+        lo, hi = offsets[d], offsets[d + 1]
+        single = interpolate_track(*(a[lo:hi] for a in packed[1:]), times)
+        for batched, expected in zip(stacked, single):
+            np.testing.assert_array_equal(batched[d], expected)
+
+
+def test_max_track_speeds():
+    tracks = [get_mission_arrays(m) for m in (
+        DroneMission([Waypoint(0,0,0, z=0), Waypoint(30,40,10, z=20), Waypoint(30,40,20, z=20)], "A"),
+        DroneMission([Waypoint(5,5,5)], "Point"),
+        DroneMission([Waypoint(0,0,0), Waypoint(10,0,0)], "Jump"),
+    )]
+    h_speed, v_speed, speed = max_track_speeds(pack_tracks(tracks))
+    np.testing.assert_allclose(h_speed, [5.0, 0.0, np.inf])
+    np.testing.assert_allclose(v_speed, [2.0, 0.0, 0.0])
+    np.testing.assert_allclose(speed, [np.hypot(5.0, 2.0), 0.0, np.inf])
@@ -0,0 +1,75 @@
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from interface import deconfliction_query
+from airspace import AirspaceSchedule
+from query_cache import QueryCache, mission_fingerprint
+
+
+def make_schedule():
+    return AirspaceSchedule([
+        DroneMission([Waypoint(50, -50, 0), Waypoint(50, 50, 10)], "Crossing"),
+        DroneMission([Waypoint(500, 500, 0), Waypoint(600, 500, 10)], "Remote"),
+    ])
+
+
+def test_repeated_query_hits_cache():
+    schedule = make_schedule()
+    cache = QueryCache(schedule)
+    primary = PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "P")
+
+    first = cache.query(primary)
+    again = cache.query(PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "P"))
+    assert again is not first and again[1].to_list() == first[1].to_list()
+    assert first[0] == deconfliction_query(primary, schedule.missions)[0] == "conflict detected"
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    # Different thresholds or time resolution are different queries
+    cache.query(primary, time_res=0.25)
+    assert cache.stats["misses"] == 2
+    assert mission_fingerprint(primary, 10, 15, 5, 0.5) != mission_fingerprint(primary, 12, 15, 5, 0.5)
+
+
+def test_only_overlapping_changes_invalidate():
+    schedule = make_schedule()
+    cache = QueryCache(schedule)
+    primary = PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "P")
+    cache.query(primary)
+
+    # Far away, or at another time: the cached result stays valid for the new version
+    schedule.add(DroneMission([Waypoint(1000, 1000, 0), Waypoint(1100, 1000, 10)], "FarAway"))
+    schedule.add(DroneMission([Waypoint(0, 0, 50), Waypoint(100, 0, 60)], "Later"))
+    schedule.remove("Remote")
+    cache.query(primary)
+    assert cache.stats["hits"] == 1 and cache.stats["invalidations"] == 0
+
+    # Removing the crossing drone changes the answer
+    schedule.remove("Crossing")
+    status, conflicts = cache.query(primary)
+    assert cache.stats["invalidations"] == 1
+    assert status == "clear" and not conflicts
+
+
+def test_lru_bound_and_ttl():
+    now = [0.0]
+    cache = QueryCache(make_schedule(), max_entries=2, ttl=5.0, clock=lambda: now[0])
+    missions = [PrimaryDroneMission([(0, y), (100, y)], 0, 10, f"P{y}") for y in (0, 200, 400)]
+    for mission in missions:
+        cache.query(mission)
+    assert len(cache) == 2 and cache.stats["evictions"] == 1
+
+    cache.query(missions[2])
+    assert cache.stats["hits"] == 1
+    now[0] = 10.0
+    cache.query(missions[2])
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 4
+
+
+def test_cached_results_are_copies():
+    cache = QueryCache(make_schedule())
+    primary = PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "P")
+    status, conflicts = cache.query(primary)
+    expected = conflicts.to_list()
+    conflicts.records["time"] = -1.0
+    conflicts.drone_ids[0] = "Changed"
+    again_status, again = cache.query(primary)
+    assert again_status == status and again.to_list() == expected
+    assert cache.stats["hits"] == 1
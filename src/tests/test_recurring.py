@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts, check_for_conflicts_2d
+from interface import check_mission, deconfliction_query, compute_min_separation, STATUS_CONFLICT
+from first_conflict import find_first_conflict
+from airspace import AirspaceSchedule
+from query_cache import QueryCache
+from snapshots import AirspaceStore
+from reservation_table import SpaceTimeReservationTable
+from recurring import RecurringMission, expand_recurring
+
+ROUTE = [Waypoint(0, 50, 0, 40), Waypoint(100, 50, 100, 40), Waypoint(100, -50, 200, 40)]
+
+
+def test_repetitions():
+    route = RecurringMission(ROUTE, "Delivery", first_start=1000, interval=900, count=4)
+    assert len(route) == 4 and route.duration == 200
+    assert route.get_start_time() == 1000 and route.get_end_time() == 1000 + 3 * 900 + 200
+    third = route.repetition(2)
+    assert third.drone_id == "Delivery#2"
+    assert [wp.timestamp for wp in third.waypoints] == [2800, 2900, 3000]
+    assert [m.drone_id for m in expand_recurring([DroneMission(ROUTE, "D"), route])] == \
+           ["D", "Delivery#0", "Delivery#1", "Delivery#2", "Delivery#3"]
+    with pytest.raises(ValueError):
+        RecurringMission(ROUTE, "R", 0, interval=0, count=2)
+    with pytest.raises(ValueError):
+        RecurringMission([], "R", 0, interval=60, count=2)
+
+
+@pytest.mark.parametrize("altitude", [None, 40.0])
+def test_conflicts_match_expanded_schedule(altitude):
+    z = () if altitude is None else (altitude,)
+    # Crosses the route's second leg from x=0 to x=200 along y=0, for 20 minutes
+    primary = PrimaryDroneMission([(0, 0) + z, (200, 0) + z], 1500, 2700, "P")
+    route = RecurringMission(ROUTE, "Delivery", first_start=0, interval=150, count=20)
+    plain = DroneMission([Waypoint(150, 0, 2350, 40), Waypoint(150, 0, 2450, 40)], "Hover")
+    schedules = [route, plain, RecurringMission.from_mission(plain, 450, 3)]
+    def keys(conflicts):
+        return [(c["time"], c["conflicting_drone_id"], c["type"]) for c in conflicts]
+
+    expected = find_conflicts(primary, expand_recurring(schedules)).to_list()
+    conflicts = find_conflicts(primary, schedules).to_list()
+    assert conflicts and keys(conflicts) == keys(expected)
+    for got, want in zip(conflicts, expected):
+        np.testing.assert_allclose(got["other_pos"], want["other_pos"], equal_nan=True)
+    assert {c["conflicting_drone_id"] for c in conflicts} == {"Delivery#13", "Hover", "Hover#0"}
+
+    if altitude is None:
+        assert keys(check_for_conflicts_2d(primary, schedules)) == keys(expected)
+    status, result = deconfliction_query(primary, schedules)
+    assert status == STATUS_CONFLICT and len(result) == len(expected)
+    assert check_mission(primary, schedules).min_separation is not None
+
+
+def test_templates_are_checked_without_expanding():
+    primary = PrimaryDroneMission([(0, 0, 40), (200, 0, 40)], 1500, 2700, "P")
+    route = RecurringMission(ROUTE, "Delivery", first_start=0, interval=150, count=20)
+    expanded = expand_recurring([route])
+    assert compute_min_separation(primary, [route]) == pytest.approx(compute_min_separation(primary, expanded))
+    for ordering in ("schedule", "likelihood"):
+        first = find_first_conflict(primary, [route], ordering=ordering)
+        assert first is not None and first["conflicting_drone_id"] == "Delivery#13"
+        assert first["time"] == find_conflicts(primary, expanded).to_list()[0]["time"]
+
+
+def test_templates_in_schedules_and_stores():
+    primary = PrimaryDroneMission([(0, 0, 40), (200, 0, 40)], 1500, 2700, "P")
+    route = RecurringMission(ROUTE, "Delivery", first_start=0, interval=150, count=20)
+
+    cache = QueryCache(AirspaceSchedule([route]))
+    assert cache.query(primary)[0] == STATUS_CONFLICT
+    cache.schedule.remove("Delivery")
+    assert cache.query(primary)[0] != STATUS_CONFLICT
+
+    store = AirspaceStore([route])
+    assert not store.snapshot().check(primary).is_clear
+    frozen = store.snapshot().get("Delivery")
+    with pytest.raises(ValueError):
+        frozen.track[1][0] = 5.0
+
+    with pytest.raises(ValueError, match="repetitions"):
+        SpaceTimeReservationTable().insert(route)
@@ -0,0 +1,42 @@
+import random
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts
+from reservation_table import SpaceTimeReservationTable
+from tests.random_missions import random_fleet
+
+
+def test_query_matches_full_check():
+    fleet = random_fleet(random.Random(7), 120, area=500.0, time_span=120.0, num_waypoints=(2, 5),
+                         z_range=(0.0, 60.0))
+    table = SpaceTimeReservationTable(time_bin=5.0)
+    for mission in fleet:
+        table.insert(mission)
+
+    for primary in (PrimaryDroneMission([(0, 0, 30), (500, 500, 30)], 0, 100, "P1"),
+                    PrimaryDroneMission([(250, 0), (250, 500), (0, 250)], 10, 90, "P2")):
+        occupants = table.occupants(primary)
+        assert len(occupants) < len(fleet)
+        assert table.query(primary).to_list() == find_conflicts(primary, fleet).to_list()
+
+
+def test_insert_and_remove_release_cells():
+    table = SpaceTimeReservationTable(time_bin=5.0)
+    mission = DroneMission([Waypoint(0, 0, 0), Waypoint(100, 0, 20)], "A")
+    table.insert(mission)
+    assert "A" in table and table.cell_count > 0
+
+    primary = PrimaryDroneMission([(100, 0), (0, 0)], 0, 20, "P")
+    assert [m.drone_id for m in table.occupants(primary)] == ["A"]
+    assert table.query(primary)
+
+    assert table.remove("A") is mission
+    assert table.cell_count == 0
+    assert not table.query(primary)
+    with pytest.raises(KeyError):
+        table.remove("A")
+
+
+def test_cell_size_must_cover_buffers():
+    with pytest.raises(ValueError):
+        SpaceTimeReservationTable(cell_size=5.0, safety_buffer_2d=10.0)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import check_for_conflicts, MINIMUM_DISTANCE_THRESHOLD_2D
+from interface import deconfliction_query, STATUS_CLEAR, STATUS_CONFLICT
+from separation import SeparationTable
+from airspace import AirspaceSchedule
+from query_cache import QueryCache
+from reservation_table import SpaceTimeReservationTable
+from distributed import DistributedDeconflictor
+from departure_slots import departure_slots
+
+
+@pytest.fixture
+def table():
+    table = SeparationTable()
+    table.set_category("micro", 4.0, 6.0, 2.0)
+    table.set_category("heavy", 30.0, 40.0, 15.0)
+    table.set_pair("micro", "micro", 2.0, 3.0, 1.0)
+    return table
+
+
+def test_pair_minima_lookup(table):
+    assert table.categories == ["micro", "heavy"]
+    assert table.pair_minima("micro", "heavy") == (30.0, 40.0, 15.0) # Larger of the two categories
+    assert table.pair_minima("heavy", "micro") == (30.0, 40.0, 15.0)
+    assert table.pair_minima("micro", "micro") == (2.0, 3.0, 1.0) # Pair override
+    assert table.pair_minima(None, "micro")[0] == MINIMUM_DISTANCE_THRESHOLD_2D
+    buf2, buf3, vsep = table.thresholds("micro", ["micro", None, "heavy"])
+    np.testing.assert_array_equal(buf2, [2.0, MINIMUM_DISTANCE_THRESHOLD_2D, 30.0])
+    assert table.max_minima() == (30.0, 40.0, 15.0)
+
+    with pytest.raises(ValueError):
+        table.thresholds("micro", ["glider"])
+    with pytest.raises(ValueError):
+        table.set_category("glider", -1.0, 5.0, 5.0)
+
+
+def test_category_is_kept_by_missions():
+    primary = PrimaryDroneMission([(0, 0), (10, 0)], 0, 10, "P", category="heavy")
+    assert primary.category == "heavy" and primary.shifted(5.0).category == "heavy"
+    assert DroneMission([Waypoint(0, 0, 0)], "D").category is None
+
+
+@pytest.mark.parametrize("altitude", [None, 50.0])
+def test_conflicts_use_per_pair_minima(table, altitude):
+    def z(offset=0.0):
+        return None if altitude is None else altitude + offset
+    primary = PrimaryDroneMission([(0, 0) + ((altitude,) if altitude else ()), (100, 0) + ((altitude,) if altitude else ())],
+                                  0, 100, "P", category="micro")
+    # Both others fly 20 m beside the primary: only the heavy one is too close
+    micro = DroneMission([Waypoint(0, 20, 0, z()), Waypoint(100, 20, 100, z())], "M", "micro")
+    heavy = DroneMission([Waypoint(0, -20, 0, z()), Waypoint(100, -20, 100, z())], "H", "heavy")
+    conflicts = check_for_conflicts(primary, [micro, heavy], separation=table)
+    assert {c["conflicting_drone_id"] for c in conflicts} == {"H"}
+    assert check_for_conflicts(primary, [micro, heavy]) == [] # Global 10 m buffer
+    assert deconfliction_query(primary, [micro, heavy], separation=table)[0] == STATUS_CONFLICT
+    assert deconfliction_query(primary, [micro], separation=table)[0] == STATUS_CLEAR
+
+    if altitude is not None:
+        # 10 m above the primary: vertically clear of a micro drone, not of a heavy one
+        above = [DroneMission([Waypoint(0, 0, 0, z(10)), Waypoint(100, 0, 100, z(10))], drone_id, category)
+                 for drone_id, category in (("AM", "micro"), ("AH", "heavy"))]
+        for kwargs in ({}, {"broad_phase": True}, {"coarse_time_step": 5.0}):
+            conflicts = check_for_conflicts(primary, above, separation=table, **kwargs)
+            assert {c["conflicting_drone_id"] for c in conflicts} == {"AH"}
+            assert {c["type"] for c in conflicts} == {"3D proximity"}
+
+
+def test_indexed_paths_use_per_pair_minima(table):
+    primary = PrimaryDroneMission([(0, 0), (100, 0)], 0, 100, "P", category="micro")
+    micro = DroneMission([Waypoint(0, 20, 0), Waypoint(100, 20, 100)], "M", "micro")
+    heavy = DroneMission([Waypoint(0, -20, 0), Waypoint(100, -20, 100)], "H", "heavy")
+    expected = check_for_conflicts(primary, [micro, heavy], separation=table)
+
+    # Cells and tile halos are sized for the largest minima of any pair
+    reservations = SpaceTimeReservationTable(separation=table)
+    assert reservations.cell_size == 40.0
+    for mission in (micro, heavy):
+        reservations.insert(mission)
+    assert reservations.query(primary).to_list() == expected
+    with DistributedDeconflictor(tile_size=60.0, separation=table) as service:
+        assert service.halo == 40.0
+        for mission in (micro, heavy):
+            service.add_mission(mission)
+        assert service.find_conflicts(primary).to_list() == expected
+
+    cache = QueryCache(AirspaceSchedule([micro, heavy]))
+    assert cache.query(primary, separation=table)[1].to_list() == expected
+    assert cache.query(primary)[0] == STATUS_CLEAR # Global minima: a different query
+    table.set_category("heavy", 50.0, 60.0, 15.0)
+    assert cache.stats["hits"] == 0 and cache.query(primary, separation=table)[0] == STATUS_CONFLICT
+    with pytest.raises(ValueError):
+        reservations.query(primary)
+
+    # Only the heavy drone, now with a 50 m buffer, blocks departures: until it leads by sqrt(50^2 - 20^2) m
+    assert departure_slots(primary, [micro, heavy], 0.0, 200.0) == [(0.0, 200.0)]
+    slots = departure_slots(primary, [micro, heavy], 0.0, 200.0, separation=table)
+    assert slots[0][0] == pytest.approx(np.sqrt(50.0**2 - 20.0**2), abs=1e-3)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts, get_mission_arrays
+from kernels import interpolate_track, pack_tracks
+from simplification import simplify_mission, simplify_tracks, levels_of_detail
+
+
+def dense_mission(drone_id="D", n=400, seed=0, z=50.0):
+    # GPS-like trace: straight legs with small noise, turning every 100 s
+    rng = np.random.default_rng(seed)
+    t = np.arange(n, dtype=float)
+    heading = np.repeat(rng.uniform(0, 2 * np.pi, n // 100 + 1), 100)[:n]
+    x = np.cumsum(3 * np.cos(heading)) + rng.normal(0, 0.2, n)
+    y = np.cumsum(3 * np.sin(heading)) + rng.normal(0, 0.2, n)
+    return DroneMission([Waypoint(x[i], y[i], t[i], None if z is None else z + rng.normal(0, 0.2))
+                         for i in range(n)], drone_id)
+
+
+def test_error_bound_holds_at_all_times():
+    mission = dense_mission()
+    for tolerance in (0.0, 0.5, 2.0, 10.0):
+        simplified, error = simplify_mission(mission, tolerance)
+        assert error <= tolerance
+        assert simplified.waypoints[0] is mission.waypoints[0] and simplified.waypoints[-1] is mission.waypoints[-1]
+        times = np.linspace(0, 399, 5000)
+        original = interpolate_track(*get_mission_arrays(mission), times)
+        coarse = interpolate_track(*get_mission_arrays(simplified), times)
+        offset = np.sqrt(sum((a - b)**2 for a, b in zip(original[:3], coarse[:3])))
+        assert offset.max() <= error + 1e-9
+    levels = levels_of_detail(mission, (1.0, 5.0, 25.0))
+    counts = [len(m.waypoints) for m, _ in levels]
+    assert counts == sorted(counts, reverse=True) and counts[-1] < 40
+
+
+def test_structure_is_kept():
+    # A straight line collapses to its ends, except where time stands still or altitude drops out
+    wps = [Waypoint(i, 0, i, 10) for i in range(10)] + [Waypoint(9, 0, 9, 10)]
+    wps += [Waypoint(i, 0, i, None if i == 15 else 10) for i in range(10, 20)]
+    simplified, error = simplify_mission(DroneMission(wps, "D"), 1.0)
+    assert [(wp.timestamp, wp.z) for wp in simplified.waypoints] == \
+           [(0, 10), (9, 10), (9, 10), (14, 10), (15, None), (16, 10), (19, 10)]
+    assert error == pytest.approx(0.0)
+
+    packed, errors = simplify_tracks(pack_tracks([get_mission_arrays(dense_mission(seed=1)),
+                                                  get_mission_arrays(DroneMission([Waypoint(0, 0, 0)], "S"))]), 2.0)
+    assert np.diff(packed[0])[1] == 1 and errors[1] == 0.0
+    with pytest.raises(ValueError):
+        simplify_mission(dense_mission(), -1.0)
+
+
+@pytest.mark.parametrize("z", [None, 50.0])
+def test_broad_phase_on_simplified_geometry(z):
+    others = [dense_mission(f"D{i}", seed=i, z=z) for i in range(1, 8)]
+    primary = PrimaryDroneMission([(0, 0) + ((z,) if z else ()), (300, 300) + ((z,) if z else ())], 0, 399, "P")
+    expected = find_conflicts(primary, others)
+    for tolerance in (1.0, 10.0):
+        conflicts = find_conflicts(primary, others, broad_phase=True, lod_tolerance=tolerance)
+        assert conflicts.to_list() == expected.to_list()
+    with pytest.raises(ValueError):
+        find_conflicts(primary, others, lod_tolerance=1.0)
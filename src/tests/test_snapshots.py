@@ -0,0 +1,119 @@
+import threading
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from interface import check_mission
+from altitude_index import AltitudeBandIndex
+from snapshots import AirspaceStore, AirspaceSnapshot, freeze_mission
+
+
+def mission(i):
+    return DroneMission([Waypoint(10.0 * i, -50, 0), Waypoint(10.0 * i, 50, 10)], f"D{i}")
+
+
+def test_updates_share_untouched_buckets():
+    store = AirspaceStore([mission(i) for i in range(200)])
+    before = store.snapshot()
+    after = store.add(mission(500))
+
+    assert (before.version, after.version) == (200, 201)
+    assert len(before) == 200 and len(after) == 201
+    assert "D500" in after and "D500" not in before
+    shared = sum(a is b for a, b in zip(before._buckets, after._buckets))
+    assert shared == len(before._buckets) - 1
+    assert [m.drone_id for m in after.missions][-1] == "D500"
+
+    removed = store.remove("D3")
+    assert "D3" not in removed and "D3" in after
+    with pytest.raises(KeyError):
+        store.remove("D3")
+
+
+def test_snapshot_missions_are_frozen_copies():
+    original = mission(1)
+    snapshot = AirspaceSnapshot.empty().with_mission(original)
+    stored = snapshot.get("D1")
+    assert stored is not original
+    assert isinstance(stored.waypoints, tuple)
+    with pytest.raises(AttributeError):
+        stored.waypoints[0].x = 99.0
+
+    original.waypoints[0].x = 99.0 # Caller's object is not shared with the snapshot
+    assert stored.waypoints[0].x == 10.0
+
+    primary = freeze_mission(PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "P"))
+    assert primary.shifted(5).mission_overall_start_time == 5
+
+
+def test_readers_see_consistent_versions_while_writing():
+    store = AirspaceStore()
+    primary = PrimaryDroneMission([(0, 0), (200, 0)], 0, 10, "P")
+    errors = []
+
+    def reader():
+        for _ in range(30):
+            snapshot = store.snapshot()
+            report = snapshot.check(primary)
+            expected = check_mission(primary, list(snapshot.missions))
+            if report.stats["snapshot_version"] != snapshot.version or \
+                    report.conflicts.to_list() != expected.conflicts.to_list():
+                errors.append(snapshot.version)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for i in range(40):
+        store.add(mission(i))
+    for thread in readers:
+        thread.join()
+
+    assert not errors
+    assert store.version == 40
+
+
+def test_accept_if_clear():
+    store = AirspaceStore([mission(5)])
+    clash = PrimaryDroneMission([(0, 0), (100, 0)], 0, 10, "Clash")
+    assert not store.accept_if_clear(clash).is_clear
+    assert "Clash" not in store.snapshot()
+    clear = PrimaryDroneMission([(0, 500), (100, 500)], 0, 10, "Clear")
+    assert store.accept_if_clear(clear).is_clear
+    assert "Clear" in store.snapshot()
+
+
+def test_altitude_indexes_are_kept_per_bucket():
+    layered = [DroneMission([Waypoint(0, 0, 0, z=10.0 * (i % 8)), Waypoint(100, 0, 10, z=10.0 * (i % 8))], f"L{i}")
+               for i in range(100)]
+    store = AirspaceStore(layered)
+    before = store.snapshot()
+    primary = PrimaryDroneMission([(0, 0, 30), (100, 0, 30)], 0, 10, "P")
+    expected = AltitudeBandIndex(layered, 10.0).candidates(primary, 15.0)
+    assert [m.drone_id for m in before.altitude_candidates(primary, 15.0, 10.0)] == [m.drone_id for m in expected]
+
+    after = store.add(DroneMission([Waypoint(0, 0, 0, z=30), Waypoint(100, 0, 10, z=30)], "New"))
+    assert [m.drone_id for m in after.altitude_candidates(primary, 15.0, 10.0)][-1] == "New"
+    rebuilt = [a for a, b in zip(before._buckets, after._buckets) if a is not b]
+    assert len(rebuilt) == 1
+    assert all(b.altitude_index(10.0) is a.altitude_index(10.0)
+               for a, b in zip(before._buckets, after._buckets) if a is b)
+
+
+@pytest.mark.parametrize("primary_z", [None, 25.0, 200.0])
+def test_check_prefilters_by_altitude_without_changing_the_report(primary_z):
+    z = () if primary_z is None else (primary_z,)
+    # Layers every 10 m crossing the primary's path, plus 2D and mixed-altitude traffic
+    fleet = [DroneMission([Waypoint(50 + i, -50, 0, z=10.0 * (i % 8)), Waypoint(50 + i, 50, 10, z=10.0 * (i % 8))], f"L{i}")
+             for i in range(40)]
+    fleet += [DroneMission([Waypoint(60, -50, 0), Waypoint(60, 50, 10)], "Flat2D"),
+              DroneMission([Waypoint(70, -50, 0, z=500.0), Waypoint(70, 50, 10)], "Mixed")]
+    primary = PrimaryDroneMission([(0, 0) + z, (100, 0) + z], 0, 10, "P")
+    report = AirspaceStore(fleet).snapshot().check(primary)
+    expected = check_mission(primary, fleet)
+    assert report.conflicts.to_list() == expected.conflicts.to_list()
+    assert report.intervals == expected.intervals
+    assert report.min_separation == pytest.approx(expected.min_separation)
+    if primary_z is not None:
+        assert report.stats["altitude_pruned"] > 0
+        # With every mission pruned, min_separation still comes from the pruned ones
+        layers = fleet[:40]
+        assert AirspaceStore(layers).snapshot().check(primary).min_separation == \
+               pytest.approx(check_mission(primary, layers).min_separation)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from data_structures import Waypoint, DroneMission
+from telemetry import TelemetryMonitor, load_telemetry_csv, save_telemetry_csv, replay_telemetry
+
+
+def test_ring_buffer_keeps_latest_reports():
+    monitor = TelemetryMonitor(capacity=2, history=3)
+    for t in range(5):
+        assert monitor.ingest("A", float(t), t * 10.0, 0.0, 20.0)
+    assert not monitor.ingest("A", 1.0, 0.0, 0.0) # Out of order
+    times, positions = monitor.recent_reports("A")
+    np.testing.assert_array_equal(times, [2.0, 3.0, 4.0])
+    np.testing.assert_array_equal(positions[:, 0], [20.0, 30.0, 40.0])
+
+    monitor.ingest("B", 0.0, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        monitor.ingest("C", 0.0, 0.0, 0.0)
+    monitor.remove("B")
+    assert monitor.ingest("C", 0.0, 0.0, 0.0)
+    assert len(monitor) == 2
+
+
+def test_tick_projects_head_on_conflict():
+    monitor = TelemetryMonitor(horizon=10.0, projection_step=0.5)
+    for t in (0.0, 1.0):
+        monitor.ingest("East", t, -100.0 + 10.0 * t, 0.0, 30.0)
+        monitor.ingest("West", t, 100.0 - 10.0 * t, 0.0, 30.0)
+        monitor.ingest("Far", t, 0.0, 500.0)
+
+    report = monitor.tick(1.0)
+    assert report.stats["drones_checked"] == 3
+    assert len(report.conflicts) == 1
+    conflict = report.conflicts[0]
+    assert {conflict["primary_drone_id"], conflict["conflicting_drone_id"]} == {"East", "West"}
+    assert conflict["type"] == "3D proximity"
+    assert conflict["time"] == pytest.approx(9.5) # Closing at 20 m/s from 180 m apart, 15 m buffer
+
+    # Stale drones are skipped
+    assert monitor.tick(20.0).stats["drones_checked"] == 0
+
+
+def test_conformance_against_registered_plan():
+    monitor = TelemetryMonitor(conformance_tolerance=5.0)
+    monitor.register_plan(DroneMission([Waypoint(0, 0, 0), Waypoint(100, 0, 10)], "Planned"))
+    monitor.ingest("Planned", 5.0, 50.0, 2.0)
+    assert monitor.tick(5.0).deviations == {}
+    monitor.ingest("Planned", 6.0, 60.0, 30.0)
+    assert monitor.tick(6.0).deviations["Planned"] == pytest.approx(30.0)
+
+
+def test_replay_from_file(tmp_path):
+    path = str(tmp_path / "telemetry.csv")
+    reports = [(drone_id, t, x0 + vx * t, 0.0, None)
+               for t in np.arange(0.0, 10.0, 0.5)
+               for drone_id, x0, vx in (("A", 0.0, 10.0), ("B", 145.0, -10.0))]
+    save_telemetry_csv(path, reports)
+    assert load_telemetry_csv(path)[:2] == reports[:2]
+
+    ticks = list(replay_telemetry(path, TelemetryMonitor(horizon=0.0), tick_interval=1.0))
+    assert [tick.time for tick in ticks] == [float(t) for t in range(11)]
+    first_conflict = next(tick for tick in ticks if tick.conflicts)
+    assert first_conflict.time == 7.0 # 25 m apart at 6 s, 5 m at 7 s
+    assert first_conflict.conflicts[0]["type"] == "2D proximity"
@@ -0,0 +1,81 @@
+import json
+import numpy as np
+import pytest
+from data_structures import Waypoint, DroneMission, PrimaryDroneMission
+from conflict_checker import find_conflicts
+from interface import deconfliction_query, STATUS_CONFLICT
+from zones import NoFlyZone, ZoneIndex, load_zones_geojson
+
+SQUARE = [(40, -10), (60, -10), (60, 10), (40, 10)]
+
+
+def straight_mission(z0=None, z1=None, drone_id="P"):
+    # From x=0 to x=100 along y=0 at 1 m/s
+    return DroneMission([Waypoint(0, 0, 0, z0), Waypoint(100, 0, 100, z1)], drone_id)
+
+
+def test_zone_validation():
+    with pytest.raises(ValueError):
+        NoFlyZone("Z", [(0, 0), (1, 1)])
+    with pytest.raises(ValueError):
+        NoFlyZone("Z", SQUARE, floor=50, ceiling=10)
+    with pytest.raises(ValueError):
+        ZoneIndex([NoFlyZone("Z", SQUARE), NoFlyZone("Z", SQUARE)])
+    closed = NoFlyZone("Z", SQUARE + [SQUARE[0]])
+    assert len(closed.vertices) == 4 and closed.bounds == (40, 60, -10, 10)
+
+
+def test_entry_and_exit_times():
+    far = NoFlyZone("Far", [(500, 500), (600, 500), (550, 600)])
+    index = ZoneIndex([NoFlyZone("Square", SQUARE), far])
+    zone, start, end, entry = index.violation_intervals(straight_mission())
+    assert zone.tolist() == [0]
+    assert start[0] == pytest.approx(40.0) and end[0] == pytest.approx(60.0)
+    np.testing.assert_allclose(entry[0, :2], [40.0, 0.0])
+
+
+def test_altitude_band():
+    index = ZoneIndex([NoFlyZone("Band", SQUARE, floor=20, ceiling=40)])
+    assert not len(index.violations(straight_mission(50, 50))) # Above the ceiling
+    # Climbing from 0 to 100 m: inside the band between x=20 and x=40, at the zone edge only
+    assert not len(index.violations(straight_mission(0, 100)))
+    # Climbing from 0 to 50 m: in the band from x=40 (z=20) to x=60 (z=30)
+    zone, start, end, _ = index.violation_intervals(straight_mission(0, 50))
+    assert start[0] == pytest.approx(40.0) and end[0] == pytest.approx(60.0)
+    # Without an altitude the drone may be at any height
+    assert len(index.violations(straight_mission())) == 1
+
+
+def test_stay_across_segments_is_one_violation():
+    index = ZoneIndex([NoFlyZone("Square", SQUARE)])
+    mission = DroneMission([Waypoint(0, 0, 0), Waypoint(50, 0, 50), Waypoint(50, 5, 55), Waypoint(100, 5, 105)], "P")
+    zone, start, end, _ = index.violation_intervals(mission)
+    assert len(zone) == 1
+    assert start[0] == pytest.approx(40.0) and end[0] == pytest.approx(65.0)
+
+
+def test_violations_are_reported_with_drone_conflicts():
+    index = ZoneIndex([NoFlyZone("Square", SQUARE)])
+    other = DroneMission([Waypoint(80, 5, 0, 30), Waypoint(80, 5, 200, 30)], "D1")
+    conflicts = find_conflicts(straight_mission(30, 30), [other], zones=index)
+    assert conflicts.conflicting_drone_ids == ["D1", "Square"]
+    violation = conflicts.of_type("No-fly zone violation")[0]
+    assert violation["time"] == pytest.approx(40.0) and violation["conflicting_drone_id"] == "Square"
+    assert np.all(np.diff(conflicts.times) >= 0)
+
+    primary_2d = PrimaryDroneMission([(0, 0), (100, 0)], 0, 100, "P")
+    status, conflicts = deconfliction_query(primary_2d, [], zones=index)
+    assert status == STATUS_CONFLICT and conflicts[0]["type"] == "No-fly zone violation"
+
+
+def test_load_zones_geojson(tmp_path):
+    path = tmp_path / "zones.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"id": "Airport", "ceiling": 120},
+         "geometry": {"type": "Polygon", "coordinates": [SQUARE + [SQUARE[0]]]}},
+        {"type": "Feature", "properties": {},
+         "geometry": {"type": "Polygon", "coordinates": [[(0, 0), (1, 0), (0, 1)]]}},
+    ]}))
+    zones = load_zones_geojson(str(path))
+    assert [z.zone_id for z in zones] == ["Airport", "zone-1"]
+    assert zones[0].ceiling == 120 and zones[0].floor is None
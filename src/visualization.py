@@ -6,7 +6,9 @@ import os
 
 from data_structures import DroneMission, Waypoint
 from conflict_checker import get_drone_position_at_time, ConflictInfo # For types
-from typing import List, Optional, Tuple
+from conflict_set import ConflictSet
+from simplification import simplify_mission, simplify_missions
+from typing import List, Optional, Tuple, Union
 
 
 OUTPUT_DIR = "outputs"
@@ -14,8 +16,14 @@ if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
 
-def plot_single_drone_path_static(ax, mission: DroneMission, color=None, label_prefix="", linestyle='-', marker='.', alpha=0.7):
-    """Plots a single drone's waypoints and segments statically."""
+def plot_single_drone_path_static(ax, mission: DroneMission, color=None, label_prefix="", linestyle='-', marker='.', alpha=0.7,
+                                  lod_tolerance: Optional[float] = None):
+    """
+    Plots a single drone's waypoints and segments statically.
+    With `lod_tolerance` (m), a simplified path within that distance of the mission is drawn.
+    """
+    if lod_tolerance is not None:
+        mission = simplify_mission(mission, lod_tolerance)[0]
     xs = [wp.x for wp in mission.waypoints]
     ys = [wp.y for wp in mission.waypoints]
     
@@ -58,11 +66,15 @@ def plot_single_drone_path_static(ax, mission: DroneMission, color=None, label_p
 def visualize_missions_static(
     primary_mission: DroneMission,
     other_schedules: List[DroneMission],
-    conflicts: Optional[List[ConflictInfo]] = None,
+    conflicts: Optional[Union[List[ConflictInfo], ConflictSet]] = None,
     title: str = "Drone Missions Overview",
-    filename_suffix: str = "static"
+    filename_suffix: str = "static",
+    lod_tolerance: Optional[float] = None
 ):
-    """Generates a static plot of all drone trajectories and highlights conflicts."""
+    """
+    Generates a static plot of all drone trajectories and highlights conflicts.
+    With `lod_tolerance` (m), paths are drawn simplified to within that distance.
+    """
     
     # Determine if the overall plot should be 3D
     # If primary is 3D, or any other mission is 3D, make it a 3D plot.
@@ -85,7 +97,8 @@ def visualize_missions_static(
     ax.set_title(title)
 
     # Plot primary mission
-    plot_single_drone_path_static(ax, primary_mission, color='red', label_prefix="Primary: ", linestyle='-', marker='o', alpha=1.0)
+    plot_single_drone_path_static(ax, primary_mission, color='red', label_prefix="Primary: ", linestyle='-', marker='o', alpha=1.0,
+                                  lod_tolerance=lod_tolerance)
 
     # Plot other drone missions
     # Generate distinct colors for other drones
@@ -94,25 +107,19 @@ def visualize_missions_static(
 
 
     for i, other_mission in enumerate(other_schedules):
-        plot_single_drone_path_static(ax, other_mission, color=colors[i] if num_others > 0 else 'blue', label_prefix=f"Other_{i+1}: ", linestyle='--', marker='.')
+        plot_single_drone_path_static(ax, other_mission, color=colors[i] if num_others > 0 else 'blue', label_prefix=f"Other_{i+1}: ", linestyle='--', marker='.',
+                                      lod_tolerance=lod_tolerance)
 
-    # Highlight conflicts
-    conflict_labels_added = set()
+    # Highlight conflicts (one scatter call, on the primary drone's conflicting positions)
     if conflicts:
-        for i, conflict in enumerate(conflicts):
-            # Use primary drone's conflicting position for the marker
-            c_pos = conflict['primary_pos']
-            cx, cy, cz = c_pos[0], c_pos[1], c_pos[2]
-            
-            label = "Conflict Point" if "Conflict Point" not in conflict_labels_added else None
-            if label: conflict_labels_added.add("Conflict Point")
-
-            if overall_is_3d:
-                # If cz is None (e.g., a 2D conflict in a potentially 3D plot), plot at z=0 or a default plane
-                plot_cz = cz if cz is not None else 0
-                ax.scatter(cx, cy, plot_cz, color='magenta', s=80, marker='*', zorder=10, label=label, edgecolors='black')
-            else:
-                ax.scatter(cx, cy, color='magenta', s=80, marker='*', zorder=10, label=label, edgecolors='black')
+        c_pos = ConflictSet.from_conflicts(conflicts).primary_positions
+        cx, cy, cz = c_pos[:, 0], c_pos[:, 1], c_pos[:, 2]
+        if overall_is_3d:
+            # If cz is missing (e.g., a 2D conflict in a potentially 3D plot), plot at z=0
+            plot_cz = np.nan_to_num(cz, nan=0.0)
+            ax.scatter(cx, cy, plot_cz, color='magenta', s=80, marker='*', zorder=10, label="Conflict Point", edgecolors='black')
+        else:
+            ax.scatter(cx, cy, color='magenta', s=80, marker='*', zorder=10, label="Conflict Point", edgecolors='black')
     
     # Consolidate legend
     handles, labels = ax.get_legend_handles_labels()
@@ -129,14 +136,21 @@ def visualize_missions_static(
 def animate_missions(
     primary_mission: DroneMission,
     other_schedules: List[DroneMission],
-    conflicts: Optional[List[ConflictInfo]] = None,
+    conflicts: Optional[Union[List[ConflictInfo], ConflictSet]] = None,
     time_resolution_anim: float = 0.2, # Animation frame time step
     total_duration_override: Optional[float] = None, # Optional: to set a specific animation duration
     title: str = "Drone Mission Animation",
-    filename_suffix: str = "animation"
+    filename_suffix: str = "animation",
+    lod_tolerance: Optional[float] = None
 ):
-    """Creates an animation of drone movements and saves it as GIF/MP4."""
-    
+    """
+    Creates an animation of drone movements and saves it as GIF/MP4.
+    With `lod_tolerance` (m), paths and drone positions come from missions simplified to
+    within that distance; conflict markers stay at their exact positions.
+    """
+    if lod_tolerance is not None:
+        primary_mission, *other_schedules = simplify_missions([primary_mission] + list(other_schedules), lod_tolerance)[0]
+
     overall_is_3d = primary_mission.is_mission_3d() or \
                     any(other_m.is_mission_3d() for other_m in other_schedules)
 
@@ -217,6 +231,11 @@ def animate_missions(
     # Generate frames based on animation time resolution
     frames = np.arange(anim_start_time, anim_end_time + time_resolution_anim, time_resolution_anim)
 
+    # Conflict columns, so each frame can look up its active conflict without building dicts
+    conflict_set = ConflictSet.from_conflicts(conflicts) if conflicts else ConflictSet()
+    conflict_times = conflict_set.times
+    conflict_positions = conflict_set.primary_positions
+
     def update(frame_time):
         time_text.set_text(f'Time: {frame_time:.2f}s')
         
@@ -236,17 +255,16 @@ def animate_missions(
         
         # Check for active conflict at this frame_time
         active_conflict_pos = None
-        if conflicts:
-            for conflict in conflicts:
-                # A conflict is "active" if the frame_time is very close to the conflict time
-                if abs(conflict['time'] - frame_time) < (time_resolution_anim / 2.0): # Within half a frame step
-                    active_conflict_pos = conflict['primary_pos'] # Show on primary drone's conflict pos
-                    break
+        if len(conflict_times):
+            # A conflict is "active" if the frame_time is within half a frame step of the conflict time
+            active = np.nonzero(np.abs(conflict_times - frame_time) < (time_resolution_anim / 2.0))[0]
+            if len(active):
+                active_conflict_pos = conflict_positions[active[0]] # Show on primary drone's conflict pos
         
-        if active_conflict_pos:
+        if active_conflict_pos is not None:
             cx, cy, cz_conflict = active_conflict_pos
             if overall_is_3d:
-                conflict_marker.set_data_3d([cx], [cy], [cz_conflict if cz_conflict is not None else 0])
+                conflict_marker.set_data_3d([cx], [cy], [cz_conflict if not np.isnan(cz_conflict) else 0])
             else:
                 conflict_marker.set_data([cx], [cy])
             conflict_marker.set_alpha(1.0)
@@ -0,0 +1,255 @@
+import json
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from data_structures import DroneMission
+from conflict_checker import get_mission_arrays
+from conflict_set import ConflictSet, TYPE_CODES
+from broad_phase import expand_ranges
+
+# Violation intervals: (zone index, entry time, exit time, entry position (N x 3)) arrays
+ViolationIntervals = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+class NoFlyZone:
+    """
+    A polygonal no-fly zone (x, y vertices in the waypoints' frame), closed to flight
+    between `floor` and `ceiling`. Without a floor or ceiling the zone extends from the
+    ground or without limit upwards.
+    """
+    def __init__(self, zone_id: str, vertices, floor: Optional[float] = None, ceiling: Optional[float] = None):
+        vertices = np.asarray(vertices, dtype=float)
+        if len(vertices) > 1 and np.array_equal(vertices[0], vertices[-1]):
+            vertices = vertices[:-1] # Drop the closing vertex of a closed ring
+        if vertices.ndim != 2 or vertices.shape[1] != 2 or len(vertices) < 3:
+            raise ValueError(f"No-fly zone '{zone_id}' needs at least 3 (x, y) vertices.")
+        if floor is not None and ceiling is not None and ceiling < floor:
+            raise ValueError(f"No-fly zone '{zone_id}' has its ceiling below its floor.")
+        self.zone_id = zone_id
+        self.vertices = vertices
+        self.floor = floor
+        self.ceiling = ceiling
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """(xmin, xmax, ymin, ymax)"""
+        (xmin, ymin), (xmax, ymax) = self.vertices.min(axis=0), self.vertices.max(axis=0)
+        return float(xmin), float(xmax), float(ymin), float(ymax)
+
+    def __repr__(self) -> str:
+        return (f"NoFlyZone(id='{self.zone_id}', vertices={len(self.vertices)}, "
+                f"floor={self.floor}, ceiling={self.ceiling})")
+
+
+def load_zones_geojson(path: str) -> List[NoFlyZone]:
+    """
+    Reads no-fly zones from a GeoJSON FeatureCollection of Polygon features (outer rings
+    only, coordinates in the waypoints' frame). Feature properties "id", "floor" and
+    "ceiling" are optional; zones without an id are numbered.
+    """
+    with open(path) as f:
+        collection = json.load(f)
+    zones = []
+    for i, feature in enumerate(collection.get("features", [])):
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") != "Polygon":
+            raise ValueError(f"Feature {i} is not a Polygon.")
+        properties = feature.get("properties") or {}
+        zones.append(NoFlyZone(str(properties.get("id", f"zone-{i}")), geometry["coordinates"][0],
+                               properties.get("floor"), properties.get("ceiling")))
+    return zones
+
+
+def _cell_key(ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+    return ix.astype(np.int64) * (1 << 32) + (iy.astype(np.int64) + (1 << 31))
+
+
+class ZoneIndex:
+    """
+    Prepared geometry for checking missions against many no-fly zones.
+    All zone edges live in flat arrays and the zones' bounding boxes are rasterized into
+    a uniform grid (a sorted array of cell keys with the zones of each cell), so the
+    candidate zones of a whole mission are found with one vectorized lookup and every
+    (segment, zone) candidate is then tested exactly against the polygon.
+    """
+    def __init__(self, zones: Sequence[NoFlyZone], cell_size: Optional[float] = None):
+        self.zones = list(zones)
+        self._positions: Dict[str, int] = {}
+        for idx, zone in enumerate(self.zones):
+            if self._positions.setdefault(zone.zone_id, idx) != idx:
+                raise ValueError(f"Duplicate no-fly zone id '{zone.zone_id}'.")
+
+        n_vertices = np.array([len(zone.vertices) for zone in self.zones], dtype=np.int64)
+        self._edge_offsets = np.concatenate(([0], np.cumsum(n_vertices)))
+        start = np.concatenate([zone.vertices for zone in self.zones]) if self.zones else np.empty((0, 2))
+        end = np.concatenate([np.roll(zone.vertices, -1, axis=0) for zone in self.zones]) if self.zones else start
+        self._edge_start, self._edge_end = start, end
+        self._floor = np.array([-np.inf if z.floor is None else z.floor for z in self.zones], dtype=float)
+        self._ceiling = np.array([np.inf if z.ceiling is None else z.ceiling for z in self.zones], dtype=float)
+        bounds = np.array([zone.bounds for zone in self.zones], dtype=float).reshape(-1, 4)
+        self._bounds = bounds
+
+        if cell_size is None:
+            extent = np.maximum(bounds[:, 1] - bounds[:, 0], bounds[:, 3] - bounds[:, 2])
+            cell_size = float(np.median(extent)) if len(extent) else 1.0
+        if cell_size <= 0:
+            cell_size = 1.0
+        self.cell_size = float(cell_size)
+
+        # Grid: zone z is listed in every cell its bounding box touches
+        ix0, ix1 = np.floor(bounds[:, 0] / self.cell_size), np.floor(bounds[:, 1] / self.cell_size)
+        iy0, iy1 = np.floor(bounds[:, 2] / self.cell_size), np.floor(bounds[:, 3] / self.cell_size)
+        nx, ny = (ix1 - ix0 + 1).astype(np.int64), (iy1 - iy0 + 1).astype(np.int64)
+        zone_of, cell = expand_ranges(np.zeros(len(nx), dtype=np.int64), nx * ny)
+        keys = _cell_key(ix0[zone_of] + cell // ny[zone_of], iy0[zone_of] + cell % ny[zone_of])
+        order = np.argsort(keys, kind='stable')
+        self._cell_keys, first = np.unique(keys[order], return_index=True)
+        self._cell_offsets = np.append(first, len(keys))
+        self._cell_zones = zone_of[order]
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def __repr__(self) -> str:
+        return f"ZoneIndex(zones={len(self.zones)}, cells={len(self._cell_keys)}, cell_size={self.cell_size:.1f})"
+
+    # --- Broad phase ---
+    def candidates(self, start: np.ndarray, end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (segment index, zone index) pairs whose bounding boxes overlap, for segments from
+        `start` to `end` ((S x 2) arrays). Long segments are cut into cell-sized pieces
+        first, so they only visit the cells along their path.
+        """
+        length = np.hypot(*(end - start).T)
+        pieces = np.maximum(np.ceil(length / self.cell_size).astype(np.int64), 1)
+        seg, piece = expand_ranges(np.zeros(len(pieces), dtype=np.int64), pieces)
+        a = start[seg] + (end - start)[seg] * (piece / pieces[seg])[:, None]
+        b = start[seg] + (end - start)[seg] * ((piece + 1) / pieces[seg])[:, None]
+        lo, hi = np.floor(np.minimum(a, b) / self.cell_size), np.floor(np.maximum(a, b) / self.cell_size)
+        nx, ny = (hi[:, 0] - lo[:, 0] + 1).astype(np.int64), (hi[:, 1] - lo[:, 1] + 1).astype(np.int64)
+        owner, cell = expand_ranges(np.zeros(len(nx), dtype=np.int64), nx * ny)
+        keys = _cell_key(lo[owner, 0] + cell // ny[owner], lo[owner, 1] + cell % ny[owner])
+
+        slot = np.clip(np.searchsorted(self._cell_keys, keys), 0, max(len(self._cell_keys) - 1, 0))
+        found = self._cell_keys[slot] == keys if len(self._cell_keys) else np.zeros(len(keys), dtype=bool)
+        owner, slot = owner[found], slot[found]
+        hit, position = expand_ranges(self._cell_offsets[slot], self._cell_offsets[slot + 1])
+        pairs = np.unique(seg[owner[hit]] * max(len(self.zones), 1) + self._cell_zones[position])
+        seg_idx, zone_idx = np.divmod(pairs, max(len(self.zones), 1))
+
+        # Keep the pairs whose bounding boxes really overlap
+        seg_lo, seg_hi = np.minimum(start, end)[seg_idx], np.maximum(start, end)[seg_idx]
+        box = self._bounds[zone_idx]
+        overlap = (seg_lo[:, 0] <= box[:, 1]) & (box[:, 0] <= seg_hi[:, 0]) & \
+                  (seg_lo[:, 1] <= box[:, 3]) & (box[:, 2] <= seg_hi[:, 1])
+        return seg_idx[overlap], zone_idx[overlap]
+
+    # --- Exact test ---
+    def _inside(self, points: np.ndarray, zone_idx: np.ndarray) -> np.ndarray:
+        """Even-odd point-in-polygon test of each point against its zone."""
+        owner, edge = expand_ranges(self._edge_offsets[zone_idx], self._edge_offsets[zone_idx + 1])
+        (x, y), e0, e1 = points[owner].T, self._edge_start[edge], self._edge_end[edge]
+        straddles = (e0[:, 1] > y) != (e1[:, 1] > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = e0[:, 0] + (y - e0[:, 1]) * (e1[:, 0] - e0[:, 0]) / (e1[:, 1] - e0[:, 1])
+        crossings = np.bincount(owner[straddles & (x < x_cross)], minlength=len(points))
+        return crossings % 2 == 1
+
+    def segment_violations(self, p0: np.ndarray, p1: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Parts of the straight segments p0 -> p1 ((S x 3) arrays, NaN for a missing
+        altitude) inside a zone's polygon and altitude band. Returns (segment index,
+        zone index, u_start, u_end) with u the fraction along the segment. A segment with
+        a missing altitude at either end is treated as being at every altitude.
+        """
+        seg, zone = self.candidates(p0[:, :2], p1[:, :2])
+        a, d = p0[seg], p1[seg] - p0[seg]
+
+        # Breakpoints along each segment: its ends, edge crossings and altitude band limits
+        owner, edge = expand_ranges(self._edge_offsets[zone], self._edge_offsets[zone + 1])
+        e0, e = self._edge_start[edge], self._edge_end[edge] - self._edge_start[edge]
+        w = e0 - a[owner, :2]
+        denom = d[owner, 0] * e[:, 1] - d[owner, 1] * e[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = (w[:, 0] * e[:, 1] - w[:, 1] * e[:, 0]) / denom
+            s = (w[:, 0] * d[owner, 1] - w[:, 1] * d[owner, 0]) / denom
+            crossing = (denom != 0) & (u > 0) & (u < 1) & (s >= 0) & (s <= 1)
+            u_floor = (self._floor[zone] - a[:, 2]) / d[:, 2]
+            u_ceiling = (self._ceiling[zone] - a[:, 2]) / d[:, 2]
+        band_u = np.concatenate((u_floor, u_ceiling))
+        band_owner = np.tile(np.arange(len(seg)), 2)
+        in_segment = (band_u > 0) & (band_u < 1)
+
+        n = len(seg)
+        points_u = np.concatenate((np.zeros(n), np.ones(n), u[crossing], band_u[in_segment]))
+        points_owner = np.concatenate((np.arange(n), np.arange(n), owner[crossing], band_owner[in_segment]))
+        order = np.lexsort((points_u, points_owner))
+        points_u, points_owner = points_u[order], points_owner[order]
+
+        # Test the middle of every piece between consecutive breakpoints
+        piece = (points_owner[1:] == points_owner[:-1]) & (points_u[1:] > points_u[:-1])
+        pair, u_start, u_end = points_owner[:-1][piece], points_u[:-1][piece], points_u[1:][piece]
+        middle = (u_start + u_end) / 2
+        mid_points = a[pair, :2] + d[pair, :2] * middle[:, None]
+        mid_z = a[pair, 2] + d[pair, 2] * middle
+        in_band = np.isnan(mid_z) | ((mid_z >= self._floor[zone[pair]]) & (mid_z <= self._ceiling[zone[pair]]))
+        violating = in_band & self._inside(mid_points, zone[pair])
+        return seg[pair[violating]], zone[pair[violating]], u_start[violating], u_end[violating]
+
+    # --- Missions ---
+    def violation_intervals(self, mission: DroneMission) -> ViolationIntervals:
+        """
+        Time intervals the mission spends inside a no-fly zone, one per zone entry, sorted
+        by entry time: (zone index, entry time, exit time, entry position (N x 3)).
+        """
+        ts, xs, ys, zs = get_mission_arrays(mission)
+        if len(ts) == 1:
+            ts, xs, ys, zs = (np.repeat(a, 2) for a in (ts, xs, ys, zs))
+        p0 = np.column_stack((xs[:-1], ys[:-1], zs[:-1]))
+        p1 = np.column_stack((xs[1:], ys[1:], zs[1:]))
+        seg, zone, u_start, u_end = self.segment_violations(p0, p1)
+
+        duration = ts[1:] - ts[:-1]
+        t_start, t_end = ts[seg] + u_start * duration[seg], ts[seg] + u_end * duration[seg]
+        entry = p0[seg] + (p1[seg] - p0[seg]) * u_start[:, None]
+        if not len(seg):
+            return zone, t_start, t_end, entry
+
+        # Pieces of consecutive segments inside the same zone are one stay
+        order = np.lexsort((u_start, seg, zone))
+        zone, seg, u_start, u_end = zone[order], seg[order], u_start[order], u_end[order]
+        t_start, t_end, entry = t_start[order], t_end[order], entry[order]
+        continues = (zone[1:] == zone[:-1]) & (
+            ((seg[1:] == seg[:-1]) & (u_start[1:] <= u_end[:-1])) |
+            ((seg[1:] == seg[:-1] + 1) & (u_end[:-1] >= 1.0) & (u_start[1:] <= 0.0)))
+        run_start = np.flatnonzero(np.concatenate(([True], ~continues)))
+        run_end = np.concatenate((run_start[1:], [len(zone)])) - 1
+        zone, t_start, t_end, entry = zone[run_start], t_start[run_start], t_end[run_end], entry[run_start]
+        order = np.argsort(t_start, kind='stable')
+        return zone[order], t_start[order], t_end[order], entry[order]
+
+    def violations(self, mission: DroneMission) -> ConflictSet:
+        """
+        No-fly zone violations of a mission as a ConflictSet: one "No-fly zone violation"
+        record per zone entry, at the entry time and position, with the zone id as the
+        conflicting id. Other position and distances do not apply and are NaN / 0.
+        """
+        zone, t_start, _, entry = self.violation_intervals(mission)
+        zone_ids = [zone.zone_id for zone in self.zones]
+        used, other_id = np.unique(zone, return_inverse=True)
+        return ConflictSet.from_columns(
+            [mission.drone_id] + [zone_ids[z] for z in used],
+            time=t_start,
+            primary_id=0,
+            other_id=other_id + 1,
+            primary_pos=entry,
+            other_pos=np.full((len(zone), 3), np.nan),
+            distance_2d=0.0,
+            distance_3d=np.nan,
+            type_code=TYPE_CODES["No-fly zone violation"]
+        )
+
+    def add_violations(self, mission: DroneMission, conflicts: ConflictSet) -> ConflictSet:
+        """Merges the mission's zone violations into its drone conflicts, in time order (drones first on ties)."""
+        merged = ConflictSet.concatenate([conflicts, self.violations(mission)])
+        return merged[np.argsort(merged.times, kind='stable')]